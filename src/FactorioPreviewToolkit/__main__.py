@@ -5,18 +5,18 @@ preview images for all configured planets using the Factorio CLI, and optionally
 uploads them to a remote service like Dropbox.
 """
 
+import multiprocessing
 import sys
 
-from src.FactorioPreviewToolkit.shared.error_popup import show_error_popup
-from src.FactorioPreviewToolkit.shared.shared_constants import constants
-from src.FactorioPreviewToolkit.shared.tee_logger import enable_tee_logging
+# Lets frozen builds run the worker processes of the PNG optimizer pool.
+multiprocessing.freeze_support()
 
 # Check CLI flags for subprocess modes early.
 # This is crucial in PyInstaller one-file builds:
 # when sys.executable is used to launch a subprocess,
 # it re-launches the full bundled EXE, which would otherwise start
 # the full controller + monitor again (causing infinite loops).
-# By checking for mode flags like --preview-generator-mode or --uploader-mode
+# By checking for mode flags like --preview-generator-mode, --uploader-mode or --worker-mode
 # and exiting early, we only start the desired module.
 if "--preview-generator-mode" in sys.argv:
     from src.FactorioPreviewToolkit.preview_generator.__main__ import main as generator_main
@@ -28,7 +28,17 @@ if "--uploader-mode" in sys.argv:
 
     uploader_main()
     sys.exit()
+if "--worker-mode" in sys.argv:
+    from src.FactorioPreviewToolkit.worker.__main__ import main as worker_main
+
+    worker_main()
+    sys.exit()
 
+# Everything below is only needed by the controller process,
+# so subprocess modes don't pay for importing it.
+from src.FactorioPreviewToolkit.shared.error_popup import show_error_popup
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.tee_logger import enable_tee_logging
 
 enable_tee_logging(constants.LOGS_DIR, keep_last_n=20)
 
@@ -1,4 +1,5 @@
 import queue
+import time
 from pathlib import Path
 from queue import Queue
 
@@ -7,11 +8,17 @@ from src.FactorioPreviewToolkit.factorio_path_provider.base import FactorioPathP
 from src.FactorioPreviewToolkit.factorio_path_provider.factory import get_factorio_path_provider
 from src.FactorioPreviewToolkit.map_string_provider.base import MapStringProvider
 from src.FactorioPreviewToolkit.map_string_provider.factory import get_map_string_provider
-from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.preview_generator.factorio_interface import (
+    remove_factorio_lock_files,
+)
+from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.structured_logger import log
 from src.FactorioPreviewToolkit.shared.structured_logger import log_section
 from src.FactorioPreviewToolkit.shared.utils import sanitize_map_string
 
+# Upper bound for a single burst, in debounce windows
+_MAX_DEBOUNCE_WINDOWS_PER_BURST = 5
+
 
 class PreviewController:
     """
@@ -35,34 +42,24 @@ class PreviewController:
         self._map_string_analysed: bool = False
 
         self._event_queue: Queue[tuple[str, str | Path]] = Queue()
+        self._dropped_event_count = 0
         self._map_processing_pipeline = MapProcessingPipeline()
 
     def _process_events(self) -> None:
         """
         Processes events from the event queue. This method listens for new map strings and Factorio paths,
         and triggers the map processing pipeline when both are available.
+        Bursts of events are coalesced, so only the last value of each event type is used.
         """
         with log_section("💤 Waiting for events..."):
             while self._running:
                 try:
-                    event_type, data = self._event_queue.get(timeout=0.5)
+                    first_event = self._event_queue.get(timeout=0.5)
                 except queue.Empty:
                     continue
 
-                match event_type:
-                    case "map_string":
-                        assert isinstance(data, str)
-                        self._latest_map_string = sanitize_map_string(data)
-                        self._map_string_analysed = False
-                        log.info(f"✅ Updated map exchange string: {self._latest_map_string}")
-
-                    case "factorio_path":
-                        assert isinstance(data, Path)
-                        self._latest_factorio_path = data
-                        log.info(f"✅ Updated Factorio path: {self._latest_factorio_path}")
-
-                    case _:
-                        raise ValueError(f"❌ Unknown event type received: {event_type!r}")
+                for event_type, data in self._collect_event_burst(first_event).items():
+                    self._apply_event(event_type, data)
 
                 if (
                     self._latest_map_string
@@ -71,6 +68,62 @@ class PreviewController:
                 ):
                     self._start_map_processing()
 
+    def _collect_event_burst(self, first_event: tuple[str, str | Path]) -> dict[str, str | Path]:
+        """
+        Collects further events until none arrived for the debounce window.
+        Returns the last value of each event type; superseded events are dropped and counted.
+        The burst is cut off after a few windows, so a constant stream of events can't stall jobs.
+        """
+        debounce_window = Config.get().event_debounce_window_in_seconds
+        event_type, data = first_event
+        latest_events = {event_type: data}
+        if debounce_window <= 0:
+            return latest_events
+
+        dropped_count = 0
+        now = time.monotonic()
+        quiet_deadline = now + debounce_window
+        burst_deadline = now + debounce_window * _MAX_DEBOUNCE_WINDOWS_PER_BURST
+        while self._running:
+            remaining = min(quiet_deadline, burst_deadline) - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                event_type, data = self._event_queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if event_type in latest_events:
+                dropped_count += 1
+            latest_events[event_type] = data
+            quiet_deadline = time.monotonic() + debounce_window
+
+        if dropped_count:
+            self._dropped_event_count += dropped_count
+            log.info(
+                f"🧹 Coalesced {dropped_count} superseded events "
+                f"({self._dropped_event_count} dropped since start)."
+            )
+        return latest_events
+
+    def _apply_event(self, event_type: str, data: str | Path) -> None:
+        """
+        Updates the latest map string or Factorio path from a single event.
+        """
+        match event_type:
+            case "map_string":
+                assert isinstance(data, str)
+                self._latest_map_string = sanitize_map_string(data)
+                self._map_string_analysed = False
+                log.info(f"✅ Updated map exchange string: {self._latest_map_string}")
+
+            case "factorio_path":
+                assert isinstance(data, Path)
+                self._latest_factorio_path = data
+                log.info(f"✅ Updated Factorio path: {self._latest_factorio_path}")
+
+            case _:
+                raise ValueError(f"❌ Unknown event type received: {event_type!r}")
+
     def _start_map_processing(self) -> None:
         """
         Starts the map processing pipeline with the latest map string and Factorio path.
@@ -90,6 +143,7 @@ class PreviewController:
             self._map_string_provider.stop()
         if self._factorio_path_provider is not None:
             self._factorio_path_provider.stop()
+        self._map_processing_pipeline.stop()
         log.info("✅ Controller stopped successfully.")
         self._running = False
 
@@ -98,12 +152,7 @@ class PreviewController:
         Starts the PreviewController to process map strings and Factorio paths asynchronously.
         """
 
-        lock_file = constants.FACTORIO_LOCK_FILEPATH
-        try:
-            lock_file.unlink(missing_ok=True)
-        except Exception as e:
-            log.info(f"Could not delete lock file {lock_file}: {e}")
-            raise
+        remove_factorio_lock_files()
 
         def on_new_map_string(map_string: str) -> None:
             self._event_queue.put(("map_string", map_string))
@@ -1,4 +1,6 @@
 import sys
+from collections.abc import Sequence
+from datetime import datetime
 from pathlib import Path
 from threading import Lock, Thread
 
@@ -6,13 +8,26 @@ from src.FactorioPreviewToolkit.controller.single_process_executor import (
     SubprocessStatus,
     SingleProcessExecutor,
 )
+from src.FactorioPreviewToolkit.controller.warm_worker import WarmWorker, WarmWorkerExecutor
+from src.FactorioPreviewToolkit.preview_generator.factorio_interface import (
+    remove_factorio_lock_files,
+)
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
 from src.FactorioPreviewToolkit.shared.sound import (
     play_failure_sound,
     play_success_sound,
     play_start_sound,
 )
-from src.FactorioPreviewToolkit.shared.structured_logger import log
-from src.FactorioPreviewToolkit.shared.utils import get_script_base
+from src.FactorioPreviewToolkit.shared.structured_logger import (
+    export_chrome_trace,
+    log,
+    set_trace_file,
+    trace_span,
+)
+
+# Number of job traces kept in the traces folder
+_MAX_JOB_TRACES = 20
 
 
 class MapProcessingPipeline:
@@ -24,11 +39,11 @@ class MapProcessingPipeline:
     """
 
     def __init__(self) -> None:
-        self.generator_executor: SingleProcessExecutor | None = None
-        self.uploader_executor: SingleProcessExecutor | None = None
+        self._executors: list[SingleProcessExecutor] = []
         self._lock = Lock()
         self._worker_thread: Thread | None = None
         self._worker_ID = 0
+        self._warm_worker = WarmWorker() if Config.get().use_warm_worker else None
 
     def run_async(self, factorio_path: Path, map_string: str) -> None:
         """
@@ -39,48 +54,94 @@ class MapProcessingPipeline:
             self._prepare_executors(factorio_path, map_string)
             self._start_worker_thread()
 
+    def stop(self) -> None:
+        """
+        Stops the running job, including every process it started, and the warm worker.
+        """
+        self._shutdown_existing_worker()
+        if self._warm_worker is not None:
+            self._warm_worker.close()
+
     def _shutdown_existing_worker(self) -> None:
         """
         Stops any existing background job and ensures thread shutdown.
         """
         self._stop()
         if self._worker_thread is not None:
-            self._worker_thread.join(timeout=1)
+            self._worker_thread.join(timeout=5)
             if self._worker_thread.is_alive():
                 log.error("❌ Worker thread did not terminate in time. Raising exception.")
                 raise TimeoutError("Worker thread did not terminate within the expected time.")
 
     def _prepare_executors(self, factorio_path: Path, map_string: str) -> None:
         """
-        Sets up the generator and uploader subprocess executors.
+        Sets up the generator and uploader subprocess executors, in the order they run.
+        In progressive mode, small previews are rendered and uploaded first, then the
+        full-resolution previews are rendered and uploaded to replace them.
+        With streamed uploads, the generator uploads each preview itself, so no uploader runs.
         """
-        script_base = get_script_base()
-
+        config = Config.get()
+        progressive_size = config.progressive_preview_size
+        if 0 < progressive_size < config.map_preview_size:
+            self._executors = [
+                self._create_generator_executor(
+                    "Preview Generator (fast pass)",
+                    factorio_path,
+                    map_string,
+                    ["--preview-size", str(progressive_size)],
+                ),
+                *self._create_uploader_executors("Uploader (fast pass)", factorio_path),
+                self._create_generator_executor(
+                    "Preview Generator", factorio_path, map_string, ["--skip-setup"]
+                ),
+                *self._create_uploader_executors("Uploader", factorio_path),
+            ]
+        else:
+            self._executors = [
+                self._create_generator_executor("Preview Generator", factorio_path, map_string),
+                *self._create_uploader_executors("Uploader", factorio_path),
+            ]
+
+    def _create_generator_executor(
+        self,
+        process_name: str,
+        factorio_path: Path,
+        map_string: str,
+        extra_args: Sequence[str] = (),
+    ) -> SingleProcessExecutor:
+        """
+        Creates the executor for a preview generator stage.
+        """
+        stage_args = [str(factorio_path), map_string, *extra_args]
+        if self._warm_worker is not None:
+            return WarmWorkerExecutor(
+                process_name, self._warm_worker, "preview_generator", stage_args
+            )
         if getattr(sys, "frozen", False):
             # Frozen: use same EXE but route via flags
-            self.generator_executor = SingleProcessExecutor(
-                "Preview Generator",
-                [sys.executable, "--preview-generator-mode", str(factorio_path), map_string],
-            )
-            self.uploader_executor = SingleProcessExecutor(
-                "Uploader",
-                [sys.executable, "--uploader-mode", str(factorio_path)],
-            )
+            args = [sys.executable, "--preview-generator-mode"]
         else:
             # Dev: use `-m` style to run modules
-            self.generator_executor = SingleProcessExecutor(
-                "Preview Generator",
-                [
-                    "-m",
-                    "src.FactorioPreviewToolkit.preview_generator",
-                    str(factorio_path),
-                    map_string,
-                ],
-            )
-            self.uploader_executor = SingleProcessExecutor(
-                "Uploader",
-                ["-m", "src.FactorioPreviewToolkit.uploader", str(factorio_path)],
-            )
+            args = ["-m", "src.FactorioPreviewToolkit.preview_generator"]
+        return SingleProcessExecutor(process_name, args + stage_args)
+
+    def _create_uploader_executors(
+        self, process_name: str, factorio_path: Path
+    ) -> list[SingleProcessExecutor]:
+        """
+        Creates the executor for an uploader stage.
+        Returns none if uploads are streamed by the generator.
+        """
+        if Config.get().stream_uploads:
+            return []
+        stage_args = [str(factorio_path)]
+        if self._warm_worker is not None:
+            return [WarmWorkerExecutor(process_name, self._warm_worker, "uploader", stage_args)]
+        if getattr(sys, "frozen", False):
+            args = [sys.executable, "--uploader-mode"]
+        else:
+            args = ["-m", "src.FactorioPreviewToolkit.uploader"]
+        return [SingleProcessExecutor(process_name, args + stage_args)]
 
     def _start_worker_thread(self) -> None:
         """
@@ -97,45 +158,83 @@ class MapProcessingPipeline:
 
     def _execute_pipeline(self) -> None:
         """
-        Executes the preview generator and uploader sequentially.
+        Executes the prepared subprocesses sequentially.
         Aborts on failure or if stopped mid-execution.
         """
         with self._lock:
-            play_start_sound()
-
-            assert self.generator_executor is not None
-            generator_status = self.generator_executor.run_subprocess()
-            if generator_status == SubprocessStatus.KILLED:
-                return
-            if generator_status != SubprocessStatus.SUCCESS:
+            trace_file = self._start_job_trace() if Config.get().trace_jobs else None
+            try:
+                with trace_span("🧪 Map processing job") as job_span:
+                    job_span["result"] = self._run_executors()
+            finally:
+                if trace_file is not None:
+                    self._finish_job_trace(trace_file)
+
+    def _run_executors(self) -> str:
+        """
+        Runs the executors one after another and plays the matching sound.
+        Returns how the job ended: 'success', 'failed' or 'killed'.
+        """
+        play_start_sound()
+
+        for executor in self._executors:
+            with trace_span(executor.get_process_name()) as stage_span:
+                status = executor.run_subprocess()
+                stage_span["status"] = status.name
+            if status == SubprocessStatus.KILLED:
+                return "killed"
+            if status != SubprocessStatus.SUCCESS:
                 play_failure_sound()
-                return
+                return "failed"
 
-            assert self.uploader_executor is not None
-            upload_status = self.uploader_executor.run_subprocess()
-            if upload_status == SubprocessStatus.KILLED:
-                return
-            if upload_status != SubprocessStatus.SUCCESS:
-                play_failure_sound()
-                return
+        play_success_sound()
+        return "success"
 
-            play_success_sound()
+    @staticmethod
+    def _start_job_trace() -> Path:
+        """
+        Starts recording the spans of this job, from this process and all its subprocesses.
+        """
+        constants.TRACES_DIR.mkdir(parents=True, exist_ok=True)
+        timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S-%f")
+        trace_file = constants.TRACES_DIR / f"job_{timestamp}.jsonl"
+        set_trace_file(trace_file)
+        return trace_file
+
+    @staticmethod
+    def _finish_job_trace(trace_file: Path) -> None:
+        """
+        Stops recording and converts the recorded spans into a Chrome trace next to them.
+        Only the newest traces are kept.
+        """
+        set_trace_file(None)
+        output_path = trace_file.with_suffix(".json")
+        try:
+            span_count = export_chrome_trace(trace_file, output_path)
+            trace_file.unlink()
+            log.info(f"📊 Job trace with {span_count} spans written to: {output_path}")
+        except OSError as e:
+            log.warning(f"⚠️ Job trace could not be written: {e}")
+
+        traces = sorted(constants.TRACES_DIR.glob("job_*.json"), key=lambda p: p.stat().st_mtime)
+        for old_trace in traces[:-_MAX_JOB_TRACES]:
+            old_trace.unlink(missing_ok=True)
 
     def _stop(self) -> None:
         """
         Stops any currently running subprocesses and waits for the worker thread to finish.
         """
-        if self.generator_executor and self.generator_executor.get_status() in [
-            SubprocessStatus.RUNNING,
-            SubprocessStatus.NOT_RUN,
-        ]:
-            self.generator_executor.stop()
-
-        if self.uploader_executor and self.uploader_executor.get_status() in [
-            SubprocessStatus.RUNNING,
-            SubprocessStatus.NOT_RUN,
-        ]:
-            self.uploader_executor.stop()
+        killed_any_process = False
+        for executor in self._executors:
+            if executor.get_status() in [SubprocessStatus.RUNNING, SubprocessStatus.NOT_RUN]:
+                killed_any_process |= executor.stop()
+
+        if killed_any_process:
+            # Killed Factorio instances can't remove their lock files anymore
+            try:
+                remove_factorio_lock_files()
+            except OSError:
+                log.warning("⚠️ Stale Factorio lock files could not be removed.")
 
         if self._worker_thread and self._worker_thread.is_alive():
             log.info("⚠️ Pipeline Aborted.")
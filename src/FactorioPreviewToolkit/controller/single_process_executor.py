@@ -1,10 +1,19 @@
 import os
+import signal
 import subprocess
 import sys
 from enum import Enum, auto
+from pathlib import Path
 from threading import Lock
+from typing import Any
 
-from src.FactorioPreviewToolkit.shared.structured_logger import log
+import psutil
+
+from src.FactorioPreviewToolkit.shared.structured_logger import (
+    TRACE_FILE_ENV_VAR,
+    get_trace_file,
+    log,
+)
 
 
 class SubprocessStatus(Enum):
@@ -19,6 +28,57 @@ class SubprocessStatus(Enum):
     RUNNING = auto()
 
 
+def get_process_group_settings() -> dict[str, Any]:
+    """
+    Returns Popen kwargs that start the subprocess in its own process group on POSIX,
+    so the subprocess and everything it launches can be killed together.
+    """
+    if sys.platform == "win32":
+        return {}
+    return {"start_new_session": True}
+
+
+def get_subprocess_environment(trace_file: Path | None = None) -> dict[str, str]:
+    """
+    Returns the environment for toolkit subprocesses, with UTF-8 output enforced.
+    With a trace file, the subprocess records its sections into it.
+    """
+    environment = {**os.environ, "PYTHONIOENCODING": "utf-8"}
+    environment.pop(TRACE_FILE_ENV_VAR, None)
+    if trace_file is not None:
+        environment[TRACE_FILE_ENV_VAR] = str(trace_file)
+    return environment
+
+
+def kill_process_tree(pid: int, timeout_in_sec: float = 3) -> None:
+    """
+    Kills a process together with all its descendants (e.g. Factorio started by the generator)
+    and waits for them to exit. On POSIX, the process group is killed as well, which also
+    catches descendants started while the tree was being walked.
+    """
+    try:
+        root = psutil.Process(pid)
+        processes = [root, *root.children(recursive=True)]
+    except psutil.NoSuchProcess:
+        processes = []
+
+    if sys.platform != "win32":
+        try:
+            os.killpg(pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+
+    _, alive = psutil.wait_procs(processes, timeout=timeout_in_sec)
+    for process in alive:
+        log.warning(f"⚠️ Process {process.pid} did not exit after being killed.")
+
+
 class SingleProcessExecutor:
     """
     Manages a single subprocess with safe lifecycle control and live output streaming.
@@ -63,7 +123,8 @@ class SingleProcessExecutor:
                 text=True,
                 encoding="utf-8",
                 errors="replace",
-                env={**os.environ, "PYTHONIOENCODING": "utf-8"},
+                env=get_subprocess_environment(get_trace_file()),
+                **get_process_group_settings(),
             )
             self._status = SubprocessStatus.RUNNING
             return True
@@ -101,22 +162,32 @@ class SingleProcessExecutor:
 
     def stop(self) -> bool:
         """
-        Terminates the subprocess if running. Returns True if a process was stopped.
+        Terminates the subprocess and all processes it started if running.
+        A subprocess that has not been started yet is marked as killed, so it never starts.
+        Returns True if a process was stopped.
         """
         with self._lock:
-            if self._active_process is None or self._status not in [
-                SubprocessStatus.RUNNING,
-                SubprocessStatus.NOT_RUN,
-            ]:
+            if self._status == SubprocessStatus.NOT_RUN:
+                self._status = SubprocessStatus.KILLED
+                log.info(f"⚠️ {self._process_name} was canceled before it started.")
+                return False
+
+            if self._active_process is None or self._status != SubprocessStatus.RUNNING:
                 log.info(f"⚠️ No active process to stop for {self._process_name}.")
                 return False
 
-            log.info(f"🛑 Stopping {self._process_name} subprocess...")
-            self._active_process.kill()
+            log.info(f"🛑 Stopping {self._process_name} subprocess tree...")
+            kill_process_tree(self._active_process.pid)
             self._status = SubprocessStatus.KILLED
-            log.info(f"✅ {self._process_name} subprocess killed.")
+            log.info(f"✅ {self._process_name} subprocess tree killed.")
             return True
 
+    def get_process_name(self) -> str:
+        """
+        Returns the display name of the subprocess.
+        """
+        return self._process_name
+
     def get_status(self) -> SubprocessStatus:
         """
         Returns the current status of the subprocess.
@@ -0,0 +1,165 @@
+import subprocess
+import sys
+from threading import Lock
+
+from src.FactorioPreviewToolkit.controller.single_process_executor import (
+    SingleProcessExecutor,
+    SubprocessStatus,
+    get_process_group_settings,
+    get_subprocess_environment,
+    kill_process_tree,
+)
+from src.FactorioPreviewToolkit.shared.structured_logger import get_trace_file, log
+from src.FactorioPreviewToolkit.worker.protocol import (
+    JOB_DONE_PREFIX,
+    JOB_SUCCEEDED,
+    READY_LINE,
+    Stage,
+    encode_job,
+)
+
+
+class WarmWorker:
+    """
+    Keeps a pre-imported, config-loaded worker process running and hands jobs to it.
+    The process is started right away and restarted after it was killed, so the next job
+    never waits for Python startup and imports.
+    """
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._process: subprocess.Popen[str] | None = None
+        with self._lock:
+            self._spawn()
+
+    @staticmethod
+    def _get_worker_args() -> list[str]:
+        """
+        Returns the arguments that start the worker, in dev and in frozen builds.
+        """
+        if getattr(sys, "frozen", False):
+            return [sys.executable, "--worker-mode"]
+        return ["-m", "src.FactorioPreviewToolkit.worker"]
+
+    def _spawn(self) -> None:
+        """
+        Starts a new worker process. Must be called with the lock held.
+        """
+        self._process = subprocess.Popen(
+            [sys.executable, "-u"] + self._get_worker_args(),
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            env=get_subprocess_environment(),
+            **get_process_group_settings(),
+        )
+        log.info(f"🔥 Warm worker started (PID {self._process.pid}).")
+
+    def run_job(self, stage: Stage, args: list[str]) -> bool | None:
+        """
+        Runs a job in the worker and streams its output to the console.
+        Returns whether the job succeeded, or None if the worker died during the job.
+        """
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._spawn()
+            process = self._process
+            assert process is not None and process.stdin and process.stdout
+            trace_file = get_trace_file()
+            try:
+                process.stdin.write(
+                    encode_job(stage, args, str(trace_file) if trace_file is not None else None)
+                )
+                process.stdin.flush()
+            except OSError:
+                return None
+
+        for line in process.stdout:
+            if line.startswith(JOB_DONE_PREFIX):
+                return line[len(JOB_DONE_PREFIX) :].strip() == JOB_SUCCEEDED
+            if line.rstrip("\n") != READY_LINE:
+                print(line, end="")
+        return None
+
+    def restart(self) -> None:
+        """
+        Kills the worker together with everything it started, e.g. Factorio,
+        and starts a fresh one for the next job.
+        """
+        with self._lock:
+            if self._process is not None:
+                kill_process_tree(self._process.pid)
+                self._process.wait()
+            self._spawn()
+
+    def close(self, timeout_in_sec: float = 5) -> None:
+        """
+        Lets the worker exit by closing its stdin. Kills it if it doesn't exit in time.
+        """
+        with self._lock:
+            if self._process is None:
+                return
+            if self._process.stdin:
+                self._process.stdin.close()
+            try:
+                self._process.wait(timeout=timeout_in_sec)
+            except subprocess.TimeoutExpired:
+                kill_process_tree(self._process.pid)
+            self._process = None
+            log.info("✅ Warm worker stopped.")
+
+
+class WarmWorkerExecutor(SingleProcessExecutor):
+    """
+    Runs a single pipeline stage as a job in the warm worker.
+    Behaves like SingleProcessExecutor: stopping it kills the stage, including Factorio.
+    """
+
+    def __init__(self, process_name: str, worker: WarmWorker, stage: Stage, args: list[str]):
+        super().__init__(process_name, args)
+        self._worker = worker
+        self._stage = stage
+
+    def run_subprocess(self) -> SubprocessStatus:
+        """
+        Sends the job to the warm worker and waits for it to finish.
+        """
+        with self._lock:
+            if self._status != SubprocessStatus.NOT_RUN:
+                return self._status
+            log.info(f"🟢 Running {self._process_name} in warm worker with args: {self._args}...")
+            self._status = SubprocessStatus.RUNNING
+
+        succeeded = self._worker.run_job(self._stage, self._args)
+
+        with self._lock:
+            if self._status == SubprocessStatus.KILLED:
+                log.info(f"⚠️ {self._process_name} was killed externally.")
+            elif succeeded:
+                self._status = SubprocessStatus.SUCCESS
+            else:
+                self._status = SubprocessStatus.FAILED
+            return self._status
+
+    def stop(self) -> bool:
+        """
+        Cancels the job. A running job is canceled by restarting the worker.
+        Returns True if a running job was stopped.
+        """
+        with self._lock:
+            if self._status == SubprocessStatus.NOT_RUN:
+                self._status = SubprocessStatus.KILLED
+                log.info(f"⚠️ {self._process_name} was canceled before it started.")
+                return False
+            if self._status != SubprocessStatus.RUNNING:
+                log.info(f"⚠️ No active job to stop for {self._process_name}.")
+                return False
+
+            log.info(f"🛑 Stopping {self._process_name} by restarting the warm worker...")
+            self._status = SubprocessStatus.KILLED
+        self._worker.restart()
+        log.info(f"✅ {self._process_name} killed.")
+        return True
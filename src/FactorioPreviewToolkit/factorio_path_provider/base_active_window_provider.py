@@ -47,7 +47,14 @@ class BaseActiveWindowProvider(FactorioPathProvider):
                     log.info(f"🎯 Detected new Factorio window.")
                     self._current_path = factorio_path
                     self._on_new_factorio_path(factorio_path)
-                self._stop_flag.wait(self._poll_interval)
+                self._wait_for_next_check()
+
+    def _wait_for_next_check(self) -> None:
+        """
+        Waits until the active window should be checked again. Waits one poll interval unless
+        a platform can report focus changes.
+        """
+        self._stop_flag.wait(self._poll_interval)
 
     @abstractmethod
     def get_factorio_executable_path(self) -> Path | None:
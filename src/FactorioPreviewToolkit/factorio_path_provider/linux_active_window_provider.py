@@ -1,4 +1,5 @@
 import collections
+import functools
 import os
 import subprocess
 from pathlib import Path
@@ -9,12 +10,23 @@ from src.FactorioPreviewToolkit.factorio_path_provider.base_active_window_provid
     BaseActiveWindowProvider,
 )
 from src.FactorioPreviewToolkit.shared.structured_logger import log
+from src.FactorioPreviewToolkit.shared.x11 import ActiveWindowWatch, is_x11_available
+
+
+@functools.lru_cache(maxsize=32)
+def _get_executable_path(pid: int, create_time: float) -> str:
+    """
+    Returns the executable of a process. The creation time is part of the cache key,
+    so a reused PID doesn't return the executable of an earlier process.
+    """
+    return str(psutil.Process(pid).exe())
 
 
 class LinuxActiveWindowProvider(BaseActiveWindowProvider):
     """
     Linux-specific implementation of ActiveWindowProvider.
-    Uses `xdotool` to find the active window and get the associated PID.
+    Keeps a connection to the X server and checks the active window whenever the window manager
+    reports a focus change. Falls back to polling with `xdotool` if that isn't possible.
     """
 
     def __init__(self, on_new_factorio_path: collections.abc.Callable[[Path], None]):
@@ -26,24 +38,82 @@ class LinuxActiveWindowProvider(BaseActiveWindowProvider):
                 "    factorio_locator_method = fixed_path\n\n"
                 "Then provide the executable path manually via fixed_path_factorio_executable."
             )
+        self._watch: ActiveWindowWatch | None = None
 
-    def get_factorio_executable_path(self) -> Path | None:
+    def stop(self) -> None:
+        """
+        Stops monitoring and wakes up the thread if it waits for a focus change.
+        """
+        super().stop()
+        watch = self._watch
+        if watch is not None:
+            watch.interrupt()
+
+    def _run(self) -> None:
+        """
+        Connects to the X server in the monitoring thread, which is the only one using it.
+        """
+        watch = self._open_active_window_watch()
+        self._watch = watch
         try:
-            # Use xdotool to get the window ID of the currently focused window
-            window_id = subprocess.check_output(["xdotool", "getwindowfocus"]).strip()
-            if not window_id:
-                return None
+            super()._run()
+        finally:
+            self._watch = None
+            if watch is not None:
+                watch.close()
 
-            # Use xdotool to get the PID of that window
-            pid = subprocess.check_output(["xdotool", "getwindowpid", window_id]).strip()
-            if not pid:
+    def _open_active_window_watch(self) -> ActiveWindowWatch | None:
+        """
+        Subscribes to focus changes. Returns None if xdotool has to be polled instead.
+        """
+        if not is_x11_available():
+            return None
+        try:
+            watch = ActiveWindowWatch()
+        except OSError as e:
+            log.info(f"⚠️ Falling back to polling the active window with xdotool: {e}")
+            return None
+        log.info("👀 Waiting for focus changes over X11.")
+        return watch
+
+    def _wait_for_next_check(self) -> None:
+        """
+        Waits for the next focus change, or one poll interval without an X11 connection.
+        """
+        if self._watch is None:
+            super()._wait_for_next_check()
+        else:
+            self._watch.wait_for_change(None)
+
+    def get_factorio_executable_path(self) -> Path | None:
+        try:
+            pid = self._get_active_window_pid()
+            if pid is None:
                 return None
 
-            process = psutil.Process(int(pid))
-            executable_path = process.exe()
+            process = psutil.Process(pid)
+            executable_path = _get_executable_path(pid, process.create_time())
             if "factorio" in executable_path.lower():
                 return Path(executable_path)
 
         except (subprocess.CalledProcessError, psutil.NoSuchProcess, psutil.AccessDenied) as e:
             log.error(f"Error getting Factorio executable path (Linux): {e}")
         return None
+
+    def _get_active_window_pid(self) -> int | None:
+        """
+        Returns the PID of the focused window's process, from the X11 connection or from xdotool.
+        """
+        if self._watch is not None:
+            return self._watch.get_active_window_pid()
+
+        # Use xdotool to get the window ID of the currently focused window
+        window_id = subprocess.check_output(["xdotool", "getwindowfocus"]).strip()
+        if not window_id:
+            return None
+
+        # Use xdotool to get the PID of that window
+        pid = subprocess.check_output(["xdotool", "getwindowpid", window_id]).strip()
+        if not pid:
+            return None
+        return int(pid)
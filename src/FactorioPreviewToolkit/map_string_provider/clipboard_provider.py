@@ -2,12 +2,11 @@
 import collections
 import threading
 
-import pyperclip
-
 from src.FactorioPreviewToolkit.map_string_provider.base import MapStringProvider
 from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
-from src.FactorioPreviewToolkit.shared.utils import is_valid_map_string
+from src.FactorioPreviewToolkit.shared.utils import MAX_MAP_STRING_LENGTH, is_valid_map_string
+from src.FactorioPreviewToolkit.shared.x11 import ClipboardWatch, is_x11_available
 
 
 class ClipboardMapStringProvider(MapStringProvider):
@@ -27,6 +26,7 @@ class ClipboardMapStringProvider(MapStringProvider):
         self._poll_interval = Config.get().map_exchange_input_poll_interval_in_seconds
         self._last_map_string = ""
         self._stop_flag = threading.Event()
+        self._watch: ClipboardWatch | None = None
         self._thread = threading.Thread(
             target=self._run,
             name="ClipboardMonitor",
@@ -47,23 +47,80 @@ class ClipboardMapStringProvider(MapStringProvider):
         """
         with log_section("🛑 Stopping Clipboard Monitor..."):
             self._stop_flag.set()
+            watch = self._watch
+            if watch is not None:
+                watch.interrupt()
             self._thread.join()
             log.info("✅ Clipboard Monitor stopped.")
 
     def _run(self) -> None:
         """
         Loop that checks the clipboard for new map exchange strings.
+        In X11 sessions it sleeps until the clipboard changes, otherwise it polls.
         """
         with log_section("📋 Monitoring clipboard for new map exchange strings..."):
-            while not self._stop_flag.is_set():
+            watch = self._open_clipboard_watch()
+            if watch is None:
+                self._poll_clipboard()
+                return
+
+            self._watch = watch
+            try:
+                self._watch_clipboard(watch)
+            finally:
+                self._watch = None
+                watch.close()
+
+    def _open_clipboard_watch(self) -> ClipboardWatch | None:
+        """
+        Connects to the X server for clipboard change events. Returns None if polling has to be
+        used instead.
+        """
+        if not is_x11_available():
+            return None
+        try:
+            return ClipboardWatch()
+        except OSError as e:
+            log.info(f"⚠️ Falling back to polling the clipboard: {e}")
+            return None
+
+    def _watch_clipboard(self, watch: ClipboardWatch) -> None:
+        """
+        Reads the clipboard once and then every time its owner changes, which happens on every copy.
+        """
+        log.info("👀 Waiting for clipboard changes over X11.")
+        changed = True
+        while not self._stop_flag.is_set():
+            if changed:
                 try:
-                    clipboard_text = pyperclip.paste().strip()
-                    if clipboard_text != self._last_map_string and is_valid_map_string(
-                        clipboard_text
-                    ):
-                        log.info("🎯 New map exchange string detected in clipboard.")
-                        self._last_map_string = clipboard_text
-                        self._on_new_map_string(clipboard_text)
+                    clipboard_text = watch.read_text(MAX_MAP_STRING_LENGTH)
+                    if clipboard_text is not None:
+                        self._check_clipboard_text(clipboard_text)
                 except Exception as e:
                     log.warning(f"⚠️ Failed to read clipboard: {e}")
-                self._stop_flag.wait(timeout=self._poll_interval)
+            changed = watch.wait_for_change(None)
+
+    def _poll_clipboard(self) -> None:
+        """
+        Reads the whole clipboard every poll interval.
+        """
+        import pyperclip
+
+        while not self._stop_flag.is_set():
+            try:
+                self._check_clipboard_text(pyperclip.paste())
+            except Exception as e:
+                log.warning(f"⚠️ Failed to read clipboard: {e}")
+            self._stop_flag.wait(timeout=self._poll_interval)
+
+    def _check_clipboard_text(self, text: str) -> None:
+        """
+        Triggers the callback if the text is a new valid map exchange string.
+        """
+        if not is_valid_map_string(text):
+            return
+        clipboard_text = text.strip()
+        if clipboard_text != self._last_map_string:
+            log.info("🎯 New map exchange string detected in clipboard.")
+            self._last_map_string = clipboard_text
+            self._on_new_map_string(clipboard_text)
@@ -5,9 +5,26 @@ import threading
 
 from src.FactorioPreviewToolkit.map_string_provider.base import MapStringProvider
 from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.inotify import (
+    IN_CLOSE_WRITE,
+    IN_CREATE,
+    IN_DELETE,
+    IN_IGNORED,
+    IN_MODIFY,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    DirectoryWatch,
+    is_inotify_available,
+)
 from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
 from src.FactorioPreviewToolkit.shared.utils import is_valid_map_string
 
+# Writes in place, atomic renames onto the file and deleting it
+_FILE_CHANGE_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_CREATE | IN_MOVED_TO | IN_DELETE | IN_MOVED_FROM
+
+# Identifies a version of the file without reading it: (inode, size, modification time)
+FileSignature = tuple[int, int, int]
+
 
 class FileMapStringProvider(MapStringProvider):
     """
@@ -23,6 +40,7 @@ class FileMapStringProvider(MapStringProvider):
         self._filepath = Config.get().file_monitor_filepath
         self._poll_interval = Config.get().map_exchange_input_poll_interval_in_seconds
         self._last_map_string = ""
+        self._last_signature: FileSignature | None = None
         self._stop_flag = threading.Event()
         self._thread = threading.Thread(
             target=self._run,
@@ -50,17 +68,69 @@ class FileMapStringProvider(MapStringProvider):
     def _run(self) -> None:
         """
         Loop that watches the file and triggers callback on new valid map string.
+        On Linux it wakes up on inotify events of the file's directory, which also catches writers
+        that replace the file by renaming. Between events, and on other systems, the file is only
+        read when its inode, size or modification time changed.
         """
         with log_section(f"📋 Watching file for map exchange strings: {self._filepath}"):
-            while not self._stop_flag.is_set():
-                try:
-                    if self._filepath.exists():
-                        text = self._filepath.read_text(encoding="utf-8").strip()
-                        if text and text != self._last_map_string and is_valid_map_string(text):
-                            log.info("📍 New map exchange string detected in file.")
-                            self._last_map_string = text
-                            self._on_new_map_string(text)
-                except Exception as e:
-                    log.warning(f"⚠️ Failed to read file '{self._filepath}': {e}")
+            watch = self._open_directory_watch()
+            try:
+                while not self._stop_flag.is_set():
+                    force_read = False
+                    if watch is not None:
+                        events = watch.read_events(self._poll_interval)
+                        force_read = any(name == self._filepath.name for _, name in events)
+                        if any(mask & IN_IGNORED for mask, _ in events):
+                            log.info("⚠️ Watched folder is gone, falling back to polling.")
+                            watch.close()
+                            watch = None
+                    self._check_file(force_read)
+                    if watch is None:
+                        self._stop_flag.wait(timeout=self._poll_interval)
+            finally:
+                if watch is not None:
+                    watch.close()
+
+    def _open_directory_watch(self) -> DirectoryWatch | None:
+        """
+        Watches the folder of the file for changes. Returns None if polling has to be used instead.
+        """
+        if not is_inotify_available():
+            return None
+        try:
+            return DirectoryWatch(self._filepath.parent, _FILE_CHANGE_MASK)
+        except OSError as e:
+            log.info(f"⚠️ Falling back to polling for file changes: {e}")
+            return None
+
+    def _get_file_signature(self) -> FileSignature | None:
+        """
+        Returns the signature of the file, or None if it doesn't exist.
+        """
+        try:
+            stat = self._filepath.stat()
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+    def _check_file(self, force_read: bool) -> None:
+        """
+        Reads the file if it changed, or always with `force_read`, and reports a new valid map string.
+        Writes within the timestamp resolution can keep the signature, so inotify events force a read.
+        """
+        try:
+            signature = self._get_file_signature()
+            if signature is None or (signature == self._last_signature and not force_read):
+                self._last_signature = signature
+                return
+            self._last_signature = signature
 
-                self._stop_flag.wait(timeout=self._poll_interval)
+            text = self._filepath.read_text(encoding="utf-8").strip()
+            if text and text != self._last_map_string and is_valid_map_string(text):
+                log.info("📍 New map exchange string detected in file.")
+                self._last_map_string = text
+                self._on_new_map_string(text)
+        except FileNotFoundError:
+            self._last_signature = None  # Deleted or renamed away between stat and read
+        except Exception as e:
+            log.warning(f"⚠️ Failed to read file '{self._filepath}': {e}")
@@ -3,6 +3,7 @@ Main entry point for generating Factorio map previews from a map exchange string
 
 Converts the exchange string to map-gen-settings,
 and runs preview generation for all configured planets.
+With stream_uploads enabled, every finished preview is handed to a streaming upload session.
 """
 
 import argparse
@@ -12,15 +13,19 @@ from typing import Sequence
 
 from pydantic import BaseModel, field_validator
 
+from src.FactorioPreviewToolkit.preview_generator.factorio_lock import log_lock_wait_statistics
 from src.FactorioPreviewToolkit.preview_generator.preview_generation import (
+    publish_planet_names,
     run_full_preview_generation,
 )
 from src.FactorioPreviewToolkit.preview_generator.preview_generation_setup import (
     run_preview_setup_pipeline,
 )
+from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.error_popup import show_error_popup
 from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
 from src.FactorioPreviewToolkit.shared.utils import is_valid_map_string
+from src.FactorioPreviewToolkit.uploader.streaming_upload import StreamingUploadSession
 
 
 class Args(BaseModel):
@@ -30,6 +35,8 @@ class Args(BaseModel):
 
     factorio_path: Path
     map_string: str
+    preview_size: int | None = None
+    skip_setup: bool = False
 
     @field_validator("factorio_path")
     def check_factorio_path(cls, v: Path) -> Path:
@@ -64,11 +71,40 @@ def parse_arguments(argv: Sequence[str] | None = None) -> Args:
     parser = argparse.ArgumentParser(description="Factorio map preview generator")
     parser.add_argument("factorio_path", type=Path)
     parser.add_argument("map_string", type=str)
+    parser.add_argument(
+        "--preview-size", type=int, default=None, help="Overrides map_preview_size from the config."
+    )
+    parser.add_argument(
+        "--skip-setup",
+        action="store_true",
+        help="Reuses the map-gen-settings and planet list of the previous run for this map string.",
+    )
 
     args = parser.parse_args(raw_args)
     return Args(**vars(args))
 
 
+def _generate_previews(factorio_path: Path, preview_size: int | None) -> None:
+    """
+    Generates the previews of all planets. With stream_uploads, each preview is uploaded as soon
+    as it is ready, and the remaining uploads are awaited before returning.
+    """
+    planet_names = publish_planet_names()
+    if not Config.get().stream_uploads:
+        run_full_preview_generation(factorio_path, planet_names, preview_size)
+        return
+
+    upload_session = StreamingUploadSession(factorio_path, planet_names)
+    try:
+        run_full_preview_generation(
+            factorio_path, planet_names, preview_size, upload_session.submit
+        )
+    except BaseException:
+        upload_session.cancel()
+        raise
+    upload_session.finish()
+
+
 def main(argv: Sequence[str] | None = None) -> None:
     """
     Runs the full preview generation pipeline from CLI arguments.
@@ -76,14 +112,16 @@ def main(argv: Sequence[str] | None = None) -> None:
     try:
         with log_section("🚀 Preview Generator started. Processing map string..."):
             arguments = parse_arguments(argv)
-            run_preview_setup_pipeline(arguments.factorio_path, arguments.map_string)
-            run_full_preview_generation(arguments.factorio_path)
+            if not arguments.skip_setup:
+                run_preview_setup_pipeline(arguments.factorio_path, arguments.map_string)
+            _generate_previews(arguments.factorio_path, arguments.preview_size)
             log.info("✅ Preview Generator completed successfully.")
     except Exception as e:
         log.exception("❌ Preview Generator failed with an exception.")
         show_error_popup("Factorio Toolkit Error", str(e))
         raise
     finally:
+        log_lock_wait_statistics()
         log.info("👋 Preview Generator exited.")
 
 
@@ -0,0 +1,85 @@
+"""
+Fingerprints of a Factorio installation and its mod set.
+
+The fingerprints are cheap to compute (file metadata and a few small files) and change
+whenever Factorio is updated or the enabled mods change. They are used as cache keys for
+results that only depend on the installation, such as rendered previews.
+"""
+
+import hashlib
+from pathlib import Path
+
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.utils import detect_os
+
+
+def _hash_parts(*parts: str) -> str:
+    """
+    Hashes the given strings into a single hex digest.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def get_executable_fingerprint(executable_path: Path) -> str:
+    """
+    Identifies a Factorio build by its executable path, size and modification time.
+    """
+    executable_path = executable_path.resolve()
+    stat = executable_path.stat()
+    return _hash_parts(str(executable_path), str(stat.st_size), str(stat.st_mtime_ns))
+
+
+def get_factorio_data_dir(executable_path: Path) -> Path:
+    """
+    Returns the read-data directory that belongs to the given Factorio executable.
+    """
+    if detect_os() == "macOS":
+        return executable_path.resolve().parent.parent / "data"
+    return executable_path.resolve().parent.parent.parent / "data"
+
+
+def get_data_dir_fingerprint(data_dir: Path) -> str:
+    """
+    Identifies the content of a Factorio data directory by the metadata of the
+    info.json of every bundled mod (base, core, space-age, ...).
+    """
+    parts: list[str] = []
+    if data_dir.exists():
+        for info_file in sorted(data_dir.glob("*/info.json")):
+            stat = info_file.stat()
+            parts.append(f"{info_file.parent.name}:{stat.st_size}:{stat.st_mtime_ns}")
+    return _hash_parts(*parts)
+
+
+def get_install_fingerprint(executable_path: Path) -> str:
+    """
+    Identifies a Factorio installation by its executable and its data directory.
+    """
+    return _hash_parts(
+        get_executable_fingerprint(executable_path),
+        get_data_dir_fingerprint(get_factorio_data_dir(executable_path)),
+    )
+
+
+def get_mod_set_fingerprint(mods_dir: Path = constants.FACTORIO_MODS_DIR) -> str:
+    """
+    Identifies the mod set by the content of mod-list.json and mod-settings.dat
+    and by the name, size and modification time of every installed mod.
+    """
+    parts: list[str] = []
+    for settings_filename in ("mod-list.json", "mod-settings.dat"):
+        settings_file = mods_dir / settings_filename
+        if settings_file.exists():
+            parts.append(hashlib.sha256(settings_file.read_bytes()).hexdigest())
+
+    if mods_dir.exists():
+        for entry in sorted(mods_dir.iterdir()):
+            if entry.suffix == ".zip" or entry.is_dir():
+                stat = entry.stat()
+                parts.append(f"{entry.name}:{stat.st_size}:{stat.st_mtime_ns}")
+
+    return _hash_parts(*parts)
@@ -1,49 +1,132 @@
+import json
 import os
 import re
 import subprocess
 import sys
 import textwrap
-import time
+import threading
 from pathlib import Path
 from typing import Any
 
+from src.FactorioPreviewToolkit.preview_generator.factorio_fingerprint import (
+    get_executable_fingerprint,
+    get_factorio_data_dir,
+)
+from src.FactorioPreviewToolkit.preview_generator.factorio_lock import (
+    clear_lock_owner,
+    record_lock_owner,
+    wait_for_factorio_lock_to_release,
+)
 from src.FactorioPreviewToolkit.shared.shared_constants import constants
 from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
 from src.FactorioPreviewToolkit.shared.utils import detect_os
 
+_VERSION_PATTERN = re.compile(r"(\d+)\.(\d+)\.(\d+)")
 
-def get_factorio_version(factorio_path: Path) -> tuple[int, int]:
+# In-memory view of the persisted version cache: executable fingerprint -> version string
+_version_cache: dict[str, str] | None = None
+_version_cache_lock = threading.Lock()
+
+
+def _load_version_cache() -> dict[str, str]:
     """
-    Detects the major and minor Factorio version from CLI output.
-    Returns (major, minor) as integers.
+    Loads the persisted Factorio version cache. Returns an empty cache if it is missing or broken.
+    """
+    try:
+        with constants.FACTORIO_VERSION_CACHE_FILEPATH.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            return {str(k): str(v) for k, v in data.items()}
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def _save_version_cache(cache: dict[str, str]) -> None:
+    """
+    Persists the Factorio version cache atomically.
+    """
+    cache_path = constants.FACTORIO_VERSION_CACHE_FILEPATH
+    temp_path = cache_path.with_suffix(".tmp")
+    with temp_path.open("w", encoding="utf-8") as f:
+        json.dump(cache, f, indent=2)
+    os.replace(temp_path, cache_path)
+
+
+def _read_version_from_info_json(factorio_path: Path) -> str | None:
+    """
+    Reads the Factorio version from data/base/info.json next to the executable.
+    """
+    info_path = get_factorio_data_dir(factorio_path) / "base" / "info.json"
+    try:
+        with info_path.open("r", encoding="utf-8") as f:
+            version = json.load(f).get("version")
+    except (OSError, ValueError, AttributeError):
+        return None
+    if isinstance(version, str) and _VERSION_PATTERN.fullmatch(version):
+        return version
+    return None
+
+
+def _probe_version_from_cli(factorio_path: Path) -> str | None:
+    """
+    Detects the Factorio version by running the executable with --version.
     """
     try:
         result = subprocess.run(
             [str(factorio_path), "--version"], capture_output=True, text=True, check=True
         )
-        match = re.search(r"Version:\s+(\d+)\.(\d+)", result.stdout)
+        match = re.search(r"Version:\s+(\d+\.\d+\.\d+)", result.stdout)
         if match:
-            return int(match.group(1)), int(match.group(2))
+            return match.group(1)
     except Exception as e:
         log.error(f"⚠️ Failed to detect Factorio version: {e}")
-    return (0, 0)  # Default fallback
+    return None
 
 
-def wait_for_factorio_lock_to_release(timeout_in_sec: int = 30) -> bool:
+def get_factorio_version_string(factorio_path: Path) -> str | None:
     """
-    Waits for the Factorio lock file to be released, up to a timeout.
+    Detects the full Factorio version (e.g. "2.0.28").
+    Prefers data/base/info.json and only runs the executable if that fails.
+    Results are cached per executable path, size and modification time, in memory and on disk,
+    so each installation is probed at most once.
     """
-    start_time = time.time()
-    lock_file = constants.FACTORIO_LOCK_FILEPATH
+    global _version_cache
+    try:
+        fingerprint = get_executable_fingerprint(factorio_path)
+    except OSError as e:
+        log.error(f"⚠️ Failed to detect Factorio version: {e}")
+        return None
 
-    while lock_file.exists():
-        log.info(f"📋 Waiting for '{lock_file}' release.")
-        if time.time() - start_time > timeout_in_sec:
-            log.error(f"❌ Timeout: Lock file still exists after {timeout_in_sec}s.")
-            raise TimeoutError(f"Lock file '{lock_file}' still exists.")
-        time.sleep(1)
+    with _version_cache_lock:
+        if _version_cache is None:
+            _version_cache = _load_version_cache()
+        if fingerprint in _version_cache:
+            return _version_cache[fingerprint]
 
-    return True
+        version = _read_version_from_info_json(factorio_path)
+        if version is None:
+            log.info("🔍 Probing Factorio version via --version...")
+            version = _probe_version_from_cli(factorio_path)
+        if version is None:
+            return None
+
+        log.info(f"✅ Detected Factorio version {version}.")
+        _version_cache[fingerprint] = version
+        _save_version_cache(_version_cache)
+        return version
+
+
+def get_factorio_version(factorio_path: Path) -> tuple[int, int]:
+    """
+    Detects the major and minor Factorio version.
+    Returns (major, minor) as integers.
+    """
+    version = get_factorio_version_string(factorio_path)
+    match = _VERSION_PATTERN.fullmatch(version) if version else None
+    if match:
+        return int(match.group(1)), int(match.group(2))
+    return (0, 0)  # Default fallback
 
 
 def remove_map_preview_planet_arg(args: list[str]) -> None:
@@ -70,11 +153,11 @@ def _build_factorio_command(executable_path: Path, args: list[str], config_path:
 
 def _build_subprocess_kwargs() -> dict[str, Any]:
     """
-    Builds default subprocess.run kwargs with logging and priority settings.
+    Builds default subprocess.Popen kwargs with output capturing and priority settings.
     """
     return {
-        "check": True,
-        "capture_output": True,
+        "stdout": subprocess.PIPE,
+        "stderr": subprocess.PIPE,
         "text": True,
         **_get_priority_settings(),
     }
@@ -82,7 +165,7 @@ def _build_subprocess_kwargs() -> dict[str, Any]:
 
 def _get_priority_settings() -> dict[str, Any]:
     """
-    Returns platform-specific CPU priority settings for subprocess.run.
+    Returns platform-specific CPU priority settings for subprocess.Popen.
     """
     if sys.platform == "win32":
         return {"creationflags": subprocess.IDLE_PRIORITY_CLASS}
@@ -91,13 +174,46 @@ def _get_priority_settings() -> dict[str, Any]:
     return {}
 
 
-def update_config_file(config_path: Path) -> None:
+def get_isolated_write_data_dir(instance_id: int) -> Path:
+    """
+    Returns the write-data directory of an isolated Factorio instance used for parallel rendering.
+    Each instance has its own directory so parallel instances never share a lock file.
+    """
+    return constants.PARALLEL_RENDER_DIR / f"instance-{instance_id}" / "data"
+
+
+def get_factorio_lock_filepaths() -> list[Path]:
+    """
+    Returns the lock file paths of the default and all isolated Factorio write-data directories.
+    """
+    lock_pattern = f"*/data/{constants.FACTORIO_LOCK_FILENAME}"
+    return [constants.FACTORIO_LOCK_FILEPATH, *constants.PARALLEL_RENDER_DIR.glob(lock_pattern)]
+
+
+def remove_factorio_lock_files() -> None:
+    """
+    Deletes the lock files of all Factorio write-data directories.
+    Must only be called while no Factorio instance started by the toolkit is running,
+    e.g. at startup or after a job was killed.
+    """
+    for lock_file in get_factorio_lock_filepaths():
+        try:
+            lock_file.unlink(missing_ok=True)
+            clear_lock_owner(lock_file.parent)
+        except OSError as e:
+            log.info(f"Could not delete lock file {lock_file}: {e}")
+            raise
+
+
+def update_config_file(
+    config_path: Path, write_data_dir: Path = constants.FACTORIO_WRITE_DATA_DIR
+) -> None:
     """
     Updates the Factorio config file if the content has to change.
     If the file doesn't exist, it will be created with the default content.
     """
     existing_content = ""
-    default_content = _generate_default_config_content()
+    default_content = _generate_default_config_content(write_data_dir)
     if config_path.exists():
         with open(config_path, "r") as config_file:
             existing_content = config_file.read()
@@ -108,7 +224,7 @@ def update_config_file(config_path: Path) -> None:
             log.info("✅ Factorio config created/updated.")
 
 
-def _generate_default_config_content() -> str:
+def _generate_default_config_content(write_data_dir: Path) -> str:
     """
     Generates the default content for the config file.
     """
@@ -121,24 +237,40 @@ def _generate_default_config_content() -> str:
         ; version=12
         [path]
         read-data={read_data}
-        write-data={constants.FACTORIO_WRITE_DATA_DIR}
+        write-data={write_data_dir}
         """
     )
 
 
-def run_factorio_command(factorio_executable_path: Path, args: list[str]) -> None:
+def run_factorio_command(
+    factorio_executable_path: Path,
+    args: list[str],
+    write_data_dir: Path = constants.FACTORIO_WRITE_DATA_DIR,
+) -> None:
     """
     Runs Factorio with the given args and config, with low-priority CPU settings.
+    A write-data directory other than the default one runs an isolated instance that
+    shares the mods of the default directory but has its own config and lock file.
     """
-    config_path = constants.FACTORIO_CONFIG_FILEPATH
-    update_config_file(config_path)
+    write_data_dir.mkdir(parents=True, exist_ok=True)
+    config_path = write_data_dir.parent / constants.FACTORIO_CONFIG_FILENAME
+    update_config_file(config_path, write_data_dir)
     log.info(f"⚙️ Using config file: {config_path}")
 
+    if write_data_dir != constants.FACTORIO_WRITE_DATA_DIR and constants.FACTORIO_MODS_DIR.exists():
+        args = args + ["--mod-directory", str(constants.FACTORIO_MODS_DIR)]
+
     try:
-        wait_for_factorio_lock_to_release()
+        wait_for_factorio_lock_to_release(write_data_dir / constants.FACTORIO_LOCK_FILENAME)
         cmd = _build_factorio_command(factorio_executable_path, args, config_path)
         kwargs = _build_subprocess_kwargs()
-        subprocess.run(cmd, **kwargs)
+        # The previous owner is gone; don't let the new lock look stale before it is recorded
+        clear_lock_owner(write_data_dir)
+        with subprocess.Popen(cmd, **kwargs) as process:
+            # Kept after exit: lets later waits detect a lock left behind by a crash as stale
+            record_lock_owner(write_data_dir, process.pid)
+            # Like subprocess.run without check: a nonzero exit code is not an error here
+            process.communicate()
 
     except FileNotFoundError:
         log.error("❌ Factorio executable not found.")
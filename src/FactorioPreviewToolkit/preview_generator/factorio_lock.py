@@ -0,0 +1,177 @@
+"""
+Waiting for Factorio's write-data lock file to be released.
+
+Factorio removes its `.lock` file when it exits. Instead of polling it once per second, the
+wait blocks on inotify events of the write-data directory on Linux and falls back to polling
+with a short, exponentially growing delay elsewhere.
+
+A Factorio instance that was killed leaves its lock file behind. The toolkit records the PID
+of every Factorio instance it starts in an owner file next to the lock, so such stale locks are
+detected and removed as soon as the owning process is gone, instead of running into the timeout.
+
+The time spent waiting is accumulated and logged at the end of a job.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import psutil
+
+from src.FactorioPreviewToolkit.shared.inotify import (
+    IN_DELETE,
+    IN_MOVED_FROM,
+    DirectoryWatch,
+    is_inotify_available,
+)
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.structured_logger import log
+
+_INITIAL_BACKOFF_IN_SEC = 0.005
+_MAX_BACKOFF_IN_SEC = 0.25
+# Process exits don't produce filesystem events, so stale locks are checked at this interval
+_STALE_CHECK_INTERVAL_IN_SEC = 0.25
+
+_total_wait_in_sec = 0.0
+_wait_count = 0
+_statistics_lock = threading.Lock()
+
+
+def _get_owner_filepath(lock_file: Path) -> Path:
+    """
+    Returns the path of the owner file that belongs to a lock file.
+    """
+    return lock_file.with_name(constants.FACTORIO_LOCK_OWNER_FILENAME)
+
+
+def record_lock_owner(write_data_dir: Path, pid: int) -> None:
+    """
+    Records the Factorio process that owns the lock of a write-data directory.
+    The creation time is stored as well, so a reused PID is not mistaken for the owner.
+    The file stays after the process exits; it is overwritten by the next launch.
+    """
+    try:
+        create_time = psutil.Process(pid).create_time()
+    except psutil.NoSuchProcess:
+        return
+    owner_file = write_data_dir / constants.FACTORIO_LOCK_OWNER_FILENAME
+    owner_file.write_text(f"{pid} {create_time}", encoding="utf-8")
+
+
+def clear_lock_owner(write_data_dir: Path) -> None:
+    """
+    Removes the owner file of a write-data directory, so its lock is not considered stale.
+    """
+    (write_data_dir / constants.FACTORIO_LOCK_OWNER_FILENAME).unlink(missing_ok=True)
+
+
+def _is_lock_stale(lock_file: Path) -> bool:
+    """
+    Returns True if the recorded owner of the lock file is no longer running.
+    Locks without an owner file are never considered stale.
+    """
+    try:
+        pid_text, create_time_text = (
+            _get_owner_filepath(lock_file).read_text(encoding="utf-8").split()
+        )
+        pid, create_time = int(pid_text), float(create_time_text)
+    except (OSError, ValueError):
+        return False
+
+    try:
+        process = psutil.Process(pid)
+        return (
+            abs(process.create_time() - create_time) > 0.01
+            or process.status() == psutil.STATUS_ZOMBIE
+        )
+    except psutil.NoSuchProcess:
+        return True
+
+
+def _remove_stale_lock(lock_file: Path) -> None:
+    """
+    Removes a stale lock file together with its owner file.
+    """
+    log.warning(f"🧹 Removing stale lock '{lock_file}', its Factorio process is gone.")
+    lock_file.unlink(missing_ok=True)
+    _get_owner_filepath(lock_file).unlink(missing_ok=True)
+
+
+def _open_directory_watch(directory: Path) -> DirectoryWatch | None:
+    """
+    Watches the directory for removed files. Returns None if polling has to be used instead.
+    """
+    if not is_inotify_available():
+        return None
+    try:
+        return DirectoryWatch(directory, IN_DELETE | IN_MOVED_FROM)
+    except OSError as e:
+        log.info(f"⚠️ Falling back to polling for lock release: {e}")
+        return None
+
+
+def _record_wait(waited_in_sec: float) -> None:
+    """
+    Adds a finished wait to the statistics of this process.
+    """
+    global _total_wait_in_sec, _wait_count
+    with _statistics_lock:
+        _total_wait_in_sec += waited_in_sec
+        _wait_count += 1
+
+
+def wait_for_factorio_lock_to_release(
+    lock_file: Path = constants.FACTORIO_LOCK_FILEPATH, timeout_in_sec: float = 30
+) -> float:
+    """
+    Waits for the Factorio lock file to be released, up to a timeout.
+    Stale locks of processes that are gone are removed right away.
+    Returns the time spent waiting in seconds.
+    """
+    start_time = time.monotonic()
+    if not lock_file.exists():
+        _record_wait(0.0)
+        return 0.0
+
+    log.info(f"📋 Waiting for '{lock_file}' release.")
+    watch = _open_directory_watch(lock_file.parent)
+    try:
+        delay = _INITIAL_BACKOFF_IN_SEC
+        # The watch is set up before this check, so a release in between is not missed
+        while lock_file.exists():
+            if _is_lock_stale(lock_file):
+                _remove_stale_lock(lock_file)
+                break
+
+            remaining = timeout_in_sec - (time.monotonic() - start_time)
+            if remaining <= 0:
+                log.error(f"❌ Timeout: Lock file still exists after {timeout_in_sec}s.")
+                raise TimeoutError(f"Lock file '{lock_file}' still exists.")
+
+            if watch is not None:
+                watch.read_events(min(remaining, _STALE_CHECK_INTERVAL_IN_SEC))
+            else:
+                time.sleep(min(remaining, delay))
+                delay = min(delay * 2, _MAX_BACKOFF_IN_SEC)
+    finally:
+        if watch is not None:
+            watch.close()
+
+    waited_in_sec = time.monotonic() - start_time
+    _record_wait(waited_in_sec)
+    log.info(f"🔓 Lock released after {waited_in_sec:.3f}s.")
+    return waited_in_sec
+
+
+def log_lock_wait_statistics() -> None:
+    """
+    Logs how long this process waited for Factorio lock files since the last report,
+    then resets the statistics, so a long-lived worker reports each job separately.
+    """
+    global _total_wait_in_sec, _wait_count
+    with _statistics_lock:
+        log.info(
+            f"⏱️ Lock wait: {_total_wait_in_sec:.3f}s in total over {_wait_count} Factorio launches."
+        )
+        _total_wait_in_sec = 0.0
+        _wait_count = 0
@@ -0,0 +1,151 @@
+"""
+Persistent, content-addressed cache of rendered planet previews.
+
+Every entry is keyed by a hash of everything that influences the rendered image:
+the map-gen-settings, the Factorio build, the mod set, the planet and the preview size.
+When the same map comes back (copied again, toggled between two strings, or after a restart),
+the cached image is reused and Factorio is not launched for that planet.
+
+Upload links are not stored here: they belong to the remote path that gets overwritten on
+every upload, not to the rendered content.
+"""
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
+from src.FactorioPreviewToolkit.shared.utils import lock_file
+
+# Held while entries are added or evicted, by every process sharing the cache directory
+_LOCK_FILENAME = "cache.lock"
+
+
+class PreviewCache:
+    """
+    Size-bounded store of rendered preview PNGs with least-recently-used eviction.
+    The modification time of an entry is refreshed on every hit and serves as its LRU timestamp.
+    Several processes may share the cache directory, e.g. a canceled job that is still rendering
+    and the job that replaced it.
+    """
+
+    def __init__(self, cache_dir: Path, max_size_in_bytes: int):
+        self._cache_dir = cache_dir
+        self._max_size_in_bytes = max_size_in_bytes
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def build_key(
+        map_gen_settings_path: Path,
+        executable_fingerprint: str,
+        mod_set_fingerprint: str,
+        planet: str,
+        preview_size: int,
+    ) -> str:
+        """
+        Builds the cache key for a single planet preview.
+        The map-gen-settings are normalized first, so formatting differences don't matter.
+        """
+        with map_gen_settings_path.open("r", encoding="utf-8") as f:
+            map_gen_settings = json.dumps(json.load(f), sort_keys=True, separators=(",", ":"))
+
+        digest = hashlib.sha256()
+        for part in (
+            map_gen_settings,
+            executable_fingerprint,
+            mod_set_fingerprint,
+            planet,
+            str(preview_size),
+        ):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> Path:
+        """
+        Returns the file path of the cache entry for the given key.
+        """
+        return self._cache_dir / f"{key}.png"
+
+    def fetch(self, key: str, destination: Path) -> bool:
+        """
+        Copies the cached preview to the destination. Returns False on a cache miss.
+        The destination is replaced atomically, so readers never see partial images.
+        """
+        entry = self._entry_path(key)
+        temp_destination = destination.with_suffix(".tmp")
+        try:
+            shutil.copyfile(entry, temp_destination)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        # Another process may have evicted the entry right after it was copied
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry)
+        os.replace(temp_destination, destination)
+        self.hits += 1
+        return True
+
+    def store(self, key: str, source: Path) -> None:
+        """
+        Adds a rendered preview to the cache and evicts old entries if the size limit is exceeded.
+        The entry is written to a temporary file first, so readers never see partial images.
+        Safe to call from several render threads and processes at once.
+        """
+        entry = self._entry_path(key)
+        with lock_file(self._cache_dir / _LOCK_FILENAME):
+            temp_entry = entry.with_suffix(".tmp")
+            shutil.copyfile(source, temp_entry)
+            os.replace(temp_entry, entry)
+            self._evict()
+
+    def _evict(self) -> None:
+        """
+        Removes the least recently used entries until the cache fits into its size limit.
+        Must be called with the cache lock held.
+        """
+        entries = []
+        total_size = 0
+        for entry in self._cache_dir.glob("*.png"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, entry))
+            total_size += stat.st_size
+
+        entries.sort()
+        for _, size, entry in entries:
+            if total_size <= self._max_size_in_bytes:
+                break
+            entry.unlink(missing_ok=True)
+            total_size -= size
+            log.info(f"🗑️ Evicted cached preview: {entry.name}")
+
+    def log_statistics(self) -> None:
+        """
+        Logs the hit and miss counters of this cache.
+        """
+        log.info(f"📊 Preview cache: {self.hits} hits, {self.misses} misses.")
+
+
+def restore_cached_previews(
+    cache: PreviewCache, keys: dict[str, str], planet_names: list[str], output_dir: Path
+) -> list[str]:
+    """
+    Restores all cached planet previews into the output directory.
+    Returns the planets that still have to be rendered.
+    """
+    with log_section("🗃️ Looking up cached previews..."):
+        planets_to_render = []
+        for planet in planet_names:
+            if cache.fetch(keys[planet], output_dir / f"{planet}.png"):
+                log.info(f"✅ Reusing cached preview for {planet}.")
+            else:
+                planets_to_render.append(planet)
+        return planets_to_render
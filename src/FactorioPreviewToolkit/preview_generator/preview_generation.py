@@ -1,11 +1,31 @@
 import json
+import os
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
 from pathlib import Path
+from queue import Queue
 
-from src.FactorioPreviewToolkit.preview_generator.factorio_interface import run_factorio_command
+from src.FactorioPreviewToolkit.preview_generator.factorio_fingerprint import (
+    get_executable_fingerprint,
+    get_mod_set_fingerprint,
+)
+from src.FactorioPreviewToolkit.preview_generator.factorio_interface import (
+    get_isolated_write_data_dir,
+    run_factorio_command,
+)
+from src.FactorioPreviewToolkit.preview_generator.preview_cache import (
+    PreviewCache,
+    restore_cached_previews,
+)
 from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.shared_constants import constants
-from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
+from src.FactorioPreviewToolkit.shared.structured_logger import (
+    get_logging_indent_level,
+    log,
+    log_section,
+    set_logging_indent,
+)
 
 
 def _log_seed_from_map_gen_settings(settings_path: Path) -> int:
@@ -45,6 +65,15 @@ def _load_supported_planets(path: Path) -> list[str]:
         return planets
 
 
+def publish_planet_names() -> list[str]:
+    """
+    Loads the planets found by the setup step and writes the planet list for the viewers.
+    """
+    planet_names = _load_supported_planets(constants.PLANET_NAMES_GENERATION_FILEPATH)
+    write_planet_names_list_to_output(planet_names)
+    return planet_names
+
+
 def write_planet_names_list_to_output(planets: list[str]) -> None:
     """
     Writes the list of supported planets in both JSON and JS format to the preview output directory.
@@ -72,51 +101,199 @@ def write_planet_names_list_to_output(planets: list[str]) -> None:
 
 
 def generate_all_planet_previews(
-    factorio_base_path: Path, settings_path: Path, preview_width: int, planet_names: list[str]
+    factorio_base_path: Path,
+    settings_path: Path,
+    preview_width: int,
+    planet_names: list[str],
+    instance_count: int = 1,
+    on_preview_ready: Callable[[str], None] | None = None,
 ) -> None:
     """
     Generates preview images for all supported planets.
+    Renders with up to `instance_count` Factorio instances in parallel.
+    `on_preview_ready` is called with the planet name as soon as its image is in the output folder.
     """
+    instance_count = min(instance_count, len(planet_names))
+    if instance_count > 1:
+        _generate_planet_previews_in_parallel(
+            factorio_base_path,
+            settings_path,
+            preview_width,
+            planet_names,
+            instance_count,
+            on_preview_ready,
+        )
+        return
+
     for planet in planet_names:
-        with log_section(f"🪐 Generating preview for {planet}..."):
+        _generate_preview_image_section(factorio_base_path, planet, settings_path, preview_width)
+        if on_preview_ready is not None:
+            on_preview_ready(planet)
+
+
+def _generate_planet_previews_in_parallel(
+    factorio_base_path: Path,
+    settings_path: Path,
+    preview_width: int,
+    planet_names: list[str],
+    instance_count: int,
+    on_preview_ready: Callable[[str], None] | None,
+) -> None:
+    """
+    Generates planet previews with several isolated Factorio instances running at once.
+    Each instance owns a write-data directory, which is handed out to one render at a time.
+    """
+    with log_section(
+        f"⚡ Generating {len(planet_names)} previews with {instance_count} Factorio instances..."
+    ):
+        free_write_data_dirs: Queue[Path] = Queue()
+        for instance_id in range(instance_count):
+            free_write_data_dirs.put(get_isolated_write_data_dir(instance_id))
+
+        indent_level = get_logging_indent_level()
+
+        def render(planet: str) -> None:
+            set_logging_indent(indent_level)
+            write_data_dir = free_write_data_dirs.get()
             try:
-                _generate_preview_image(factorio_base_path, planet, settings_path, preview_width)
-            except Exception:
-                log.error(f"❌ Failed to generate preview for {planet}")
-                raise
+                _generate_preview_image_section(
+                    factorio_base_path, planet, settings_path, preview_width, write_data_dir
+                )
+            finally:
+                free_write_data_dirs.put(write_data_dir)
+            if on_preview_ready is not None:
+                on_preview_ready(planet)
+
+        executor = ThreadPoolExecutor(max_workers=instance_count, thread_name_prefix="Renderer")
+        try:
+            futures = [executor.submit(render, planet) for planet in planet_names]
+            for future in as_completed(futures):
+                future.result()
+        finally:
+            # Skip renders that have not started yet if one of them failed
+            executor.shutdown(wait=True, cancel_futures=True)
+
+        log.info("✅ All parallel renders finished.")
+
+
+def _generate_preview_image_section(
+    factorio_base_path: Path,
+    planet: str,
+    settings_path: Path,
+    preview_width: int,
+    write_data_dir: Path = constants.FACTORIO_WRITE_DATA_DIR,
+) -> None:
+    """
+    Generates a single planet preview inside its own log section.
+    """
+    with log_section(f"🪐 Generating preview for {planet}...", planet=planet):
+        try:
+            _generate_preview_image(
+                factorio_base_path, planet, settings_path, preview_width, write_data_dir
+            )
+        except Exception:
+            log.error(f"❌ Failed to generate preview for {planet}")
+            raise
 
 
 def _generate_preview_image(
-    factorio_base_path: Path, planet: str, settings_path: Path, preview_width: int
+    factorio_base_path: Path,
+    planet: str,
+    settings_path: Path,
+    preview_width: int,
+    write_data_dir: Path = constants.FACTORIO_WRITE_DATA_DIR,
 ) -> None:
     """
     Generates a single map preview image for the given planet using the Factorio CLI.
+    The image is rendered next to the write-data directory and then moved into the
+    preview output folder, so an existing preview is replaced atomically.
     """
     output = constants.PREVIEWS_OUTPUT_DIR / f"{planet}.png"
+    render_path = write_data_dir.parent / output.name
 
     args = [
-        f"--generate-map-preview={output}",
+        f"--generate-map-preview={render_path}",
         f"--map-gen-settings={settings_path}",
         f"--map-preview-size={preview_width}",
         f"--map-preview-planet={planet}",
     ]
 
-    run_factorio_command(factorio_base_path, args)
+    run_factorio_command(factorio_base_path, args, write_data_dir)
+    os.replace(render_path, output)
     log.info(f"✅ Preview generated at {output}")
 
 
-def run_full_preview_generation(factorio_base_path: Path) -> None:
+def _build_preview_cache_keys(
+    factorio_base_path: Path, settings_path: Path, preview_width: int, planet_names: list[str]
+) -> dict[str, str]:
+    """
+    Builds the preview cache key of every planet for the current map and Factorio installation.
+    """
+    executable_fingerprint = get_executable_fingerprint(factorio_base_path)
+    mod_set_fingerprint = get_mod_set_fingerprint()
+    return {
+        planet: PreviewCache.build_key(
+            settings_path, executable_fingerprint, mod_set_fingerprint, planet, preview_width
+        )
+        for planet in planet_names
+    }
+
+
+def run_full_preview_generation(
+    factorio_base_path: Path,
+    planet_names: list[str],
+    preview_width: int | None = None,
+    on_preview_ready: Callable[[str], None] | None = None,
+) -> None:
     """
-    Main entry point: prepares inputs and triggers map preview generation for all supported planets.
+    Main entry point: generates map previews for the given planets, usually those returned by
+    publish_planet_names(). Previews found in the preview cache are reused instead of being
+    rendered again. The preview size defaults to map_preview_size, a smaller one is used for
+    progressive previews. `on_preview_ready` is called with the planet name as soon as its image
+    is in the output folder, including previews restored from the cache.
     """
     with log_section("🌍 Starting map preview generation..."):
         settings_path = Path(constants.MAP_GEN_SETTINGS_FILEPATH)
         _log_seed_from_map_gen_settings(settings_path)
 
-        planet_names = _load_supported_planets(constants.PLANET_NAMES_GENERATION_FILEPATH)
-        write_planet_names_list_to_output(planet_names)
+        config = Config.get()
+        if preview_width is None:
+            preview_width = config.map_preview_size
+        log.info(f"📐 Preview size: {preview_width}px")
+        planets_to_render = planet_names
+        cache = None
+        cache_keys: dict[str, str] = {}
+
+        def on_preview_in_output(planet: str) -> None:
+            # Cache the rendered image before an upload optimizes it in place
+            if cache is not None and planet in planets_to_render:
+                cache.store(cache_keys[planet], constants.PREVIEWS_OUTPUT_DIR / f"{planet}.png")
+            if on_preview_ready is not None:
+                on_preview_ready(planet)
+
+        if config.preview_cache_max_size_in_mb > 0:
+            cache = PreviewCache(
+                constants.PREVIEW_CACHE_DIR, config.preview_cache_max_size_in_mb * 1024 * 1024
+            )
+            cache_keys = _build_preview_cache_keys(
+                factorio_base_path, settings_path, preview_width, planet_names
+            )
+            planets_to_render = restore_cached_previews(
+                cache, cache_keys, planet_names, constants.PREVIEWS_OUTPUT_DIR
+            )
+            for planet in planet_names:
+                if planet not in planets_to_render:
+                    on_preview_in_output(planet)
 
-        preview_width = Config.get().map_preview_size
-        generate_all_planet_previews(factorio_base_path, settings_path, preview_width, planet_names)
+        generate_all_planet_previews(
+            factorio_base_path,
+            settings_path,
+            preview_width,
+            planets_to_render,
+            config.preview_render_instances,
+            on_preview_in_output,
+        )
 
+        if cache is not None:
+            cache.log_statistics()
         log.info("✅ All planet previews generated successfully.")
@@ -10,10 +10,14 @@ It then runs Factorio in benchmark mode to trigger the script and collect result
 """
 
 import json
+import shutil
 import textwrap
 import zipfile
 from pathlib import Path
 
+from src.FactorioPreviewToolkit.preview_generator.factorio_fingerprint import (
+    get_install_fingerprint,
+)
 from src.FactorioPreviewToolkit.preview_generator.factorio_interface import run_factorio_command
 from src.FactorioPreviewToolkit.shared.shared_constants import constants
 from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
@@ -67,35 +71,87 @@ def _build_control_lua(
     ).strip()
 
 
-def _create_dummy_save(factorio_path: Path) -> None:
+def _create_dummy_save_template(factorio_path: Path, template_dir: Path) -> None:
     """
-    Creates a dummy save used to execute Lua code to extract preview-relevant data.
-    Cleans up any leftover .zip from previous crashes.
+    Creates a pristine dummy save for the given Factorio installation and extracts it
+    into the template directory. The save is built in a temporary directory first,
+    so a crash never leaves a half-written template behind.
     """
-    with log_section("🛠️ Creating dummy save..."):
-        save_folder = constants.DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH
-        save_zip = save_folder.with_suffix(".zip")
-
-        if save_zip.exists():
-            save_zip.unlink()
-            log.info(f"🗑️ Removed leftover dummy save zip: {save_zip}")
-
-        log.info(f"📦 Creating dummy save at: {save_folder}")
+    with log_section("🛠️ Creating dummy save template..."):
+        partial_dir = template_dir.with_suffix(".partial")
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        partial_dir.mkdir(parents=True)
+
+        save_name = constants.DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH.name
+        save_zip = partial_dir / f"{save_name}.zip"
+        log.info(f"📦 Creating dummy save at: {save_zip}")
         run_factorio_command(factorio_path, ["--create", str(save_zip)])
 
         log.info("📂 Extracting dummy save zip.")
         with zipfile.ZipFile(save_zip, "r") as zip_ref:
-            zip_ref.extractall(save_folder.parent)
+            zip_ref.extractall(partial_dir)
         save_zip.unlink()
-        log.info("✅ Dummy save created.")
+
+        shutil.rmtree(template_dir, ignore_errors=True)
+        partial_dir.rename(template_dir)
+        log.info(f"✅ Dummy save template created at: {template_dir}")
+
+
+def _prune_dummy_save_templates(keep_last_n: int = 3) -> None:
+    """
+    Deletes the least recently used dummy save templates, e.g. of outdated Factorio builds.
+    """
+    templates = sorted(
+        (
+            path
+            for path in constants.DUMMY_SAVE_TEMPLATES_DIR.iterdir()
+            if path.is_dir() and path.suffix != ".partial"
+        ),
+        key=lambda path: path.stat().st_mtime,
+    )
+    for outdated_template in templates[:-keep_last_n]:
+        shutil.rmtree(outdated_template, ignore_errors=True)
+        log.info(f"🗑️ Removed outdated dummy save template: {outdated_template.name}")
+
+
+def _prepare_dummy_save(factorio_path: Path) -> Path:
+    """
+    Provides the dummy save used to execute Lua code to extract preview-relevant data.
+    The pristine save only depends on the Factorio installation, so it is created once per
+    installation and reused. Returns the template folder that holds the pristine save.
+    """
+    with log_section("🛠️ Preparing dummy save..."):
+        fingerprint = get_install_fingerprint(factorio_path)
+        template_root = constants.DUMMY_SAVE_TEMPLATES_DIR / fingerprint
+        save_name = constants.DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH.name
+        template_save = template_root / save_name
+
+        if (template_save / constants.CONTROL_LUA_FILENAME).exists():
+            log.info(f"♻️ Reusing dummy save template: {fingerprint}")
+            template_root.touch()
+        else:
+            _create_dummy_save_template(factorio_path, template_root)
+            _prune_dummy_save_templates()
+
+        save_folder = constants.DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH
+        marker = constants.DUMMY_SAVE_TEMPLATE_MARKER_FILEPATH
+        if not save_folder.exists() or not marker.exists() or marker.read_text() != fingerprint:
+            log.info(f"📂 Copying dummy save template to: {save_folder}")
+            shutil.rmtree(save_folder, ignore_errors=True)
+            shutil.copytree(template_save, save_folder)
+            marker.write_text(fingerprint)
+
+        log.info("✅ Dummy save ready.")
+        return template_save
 
 
-def _inject_preview_setup_script(exchange_string: str) -> None:
+def _inject_preview_setup_script(exchange_string: str, template_save: Path) -> None:
     """
-    Overwrites control.lua with the Lua script that runs preview setup on tick 0.
+    Writes a fresh control.lua: the pristine one from the template plus the Lua script
+    that runs preview setup on tick 0.
     """
     with log_section("🛠️ Injecting preview setup script into control.lua..."):
-        control_lua = constants.CONTROL_LUA_FILEPATH
+        pristine_control_lua = template_save / constants.CONTROL_LUA_FILENAME
 
         # Build and write the script directly
         injected_script = _build_control_lua(
@@ -104,8 +160,11 @@ def _inject_preview_setup_script(exchange_string: str) -> None:
             constants.PLANET_NAMES_REMOTE_FILENAME,
         )
 
-        control_lua.write_text(
-            control_lua.read_text(encoding="utf-8").strip() + "\n\n" + injected_script + "\n",
+        constants.CONTROL_LUA_FILEPATH.write_text(
+            pristine_control_lua.read_text(encoding="utf-8").strip()
+            + "\n\n"
+            + injected_script
+            + "\n",
             encoding="utf-8",
         )
 
@@ -156,8 +215,8 @@ def run_preview_setup_pipeline(factorio_path: Path, map_string: str) -> None:
     Full pipeline: prepares dummy save, injects Lua setup script, runs Factorio, and extracts result.
     """
     with log_section("🔄 Running preview setup pipeline..."):
-        _create_dummy_save(factorio_path)
-        _inject_preview_setup_script(map_string)
+        template_save = _prepare_dummy_save(factorio_path)
+        _inject_preview_setup_script(map_string, template_save)
         _run_preview_setup_save(factorio_path)
         _extract_map_gen_settings_from_json()
         log.info("✅ Preview setup complete.")
@@ -14,6 +14,9 @@ from src.FactorioPreviewToolkit.shared.utils import (
     get_supported_architecture,
 )
 
+# Upload methods that upload through rclone and need its executable and remote settings
+RCLONE_UPLOAD_METHODS = ("rclone", "rclone_daemon")
+
 
 def _is_rclone_remote_configured(remote_name: str, rclone_path: Path) -> bool:
     """
@@ -51,9 +54,15 @@ class Settings(BaseModel):
     map_exchange_input_method: Literal["clipboard_monitor", "file_monitor"]
     file_monitor_filepath: Path = Path("not-used")
     map_exchange_input_poll_interval_in_seconds: float = 0.5
+    event_debounce_window_in_seconds: float = 0
 
     # === Preview Generation ===
     map_preview_size: int
+    preview_render_instances: int = 1
+    preview_cache_max_size_in_mb: int = 0
+    progressive_preview_size: int = 0
+    use_warm_worker: bool = False
+    trace_jobs: bool = False
 
     # === Sound Settings ===
     sound_start_filepath: Path
@@ -64,10 +73,17 @@ class Settings(BaseModel):
     failure_sound_volume: float
 
     # === Upload Settings ===
-    upload_method: Literal["rclone", "local_sync", "skip"]
+    upload_method: Literal["rclone", "rclone_daemon", "local_sync", "skip"]
+    stream_uploads: bool = False
+    upload_max_concurrency: int = 1
+    png_optimize_processes: int = 1
+    png_palette: Literal["adaptive", "terrain"] = "adaptive"
+    preview_tile_size: int = 0
+    skip_unchanged_uploads: bool = False
     rclone_remote_service: str = ""
     rclone_remote_upload_dir: Path = Path("not-used")
     rclone_executable: Path = Path("not-used")
+    cache_share_links: bool = False
     local_sync_target_dir: Path = Path("not-used")
 
     class Config:
@@ -152,7 +168,7 @@ class Settings(BaseModel):
         """
         Verifies rclone remote setup after all fields are available.
         """
-        if values.upload_method != "rclone":
+        if values.upload_method not in RCLONE_UPLOAD_METHODS:
             return values
 
         remote_service = values.rclone_remote_service.strip()
@@ -169,7 +185,8 @@ class Settings(BaseModel):
                     log.info(f"🕒 Waiting for Dropbox setup to complete (retry {attempt}/5)...")
                     _run_dropbox_auto_setup(values.rclone_executable)
                     time.sleep(1)
-        else:
+        elif not remote_service.startswith(":"):
+            # Remotes starting with ':' are defined on the fly, e.g. ':local:', and need no config
             if not _is_rclone_remote_configured(remote_service, values.rclone_executable):
                 raise ValueError(
                     f"❌ The rclone remote '{remote_service}' is not configured.\n"
@@ -189,6 +206,46 @@ class Settings(BaseModel):
             raise ValueError(f"'map_preview_size' must be a positive integer. You entered: {v}")
         return v
 
+    @field_validator("preview_render_instances", "upload_max_concurrency")
+    def must_be_at_least_one(cls, v: int, info: FieldValidationInfo) -> int:
+        """
+        Ensures at least one Factorio instance or upload runs at a time.
+        """
+        if v < 1:
+            raise ValueError(f"'{info.field_name}' must be at least 1. You entered: {v}")
+        return v
+
+    @field_validator(
+        "preview_cache_max_size_in_mb", "progressive_preview_size", "png_optimize_processes"
+    )
+    def must_not_be_negative(cls, v: int, info: FieldValidationInfo) -> int:
+        """
+        Ensures counts and size limits are zero (disabled or automatic) or positive.
+        """
+        if v < 0:
+            raise ValueError(f"'{info.field_name}' must not be negative. You entered: {v}")
+        return v
+
+    @field_validator("preview_tile_size")
+    def tile_size_must_be_zero_or_at_least_64(cls, v: int) -> int:
+        """
+        Ensures tiles are disabled (0) or large enough to keep the number of tiles reasonable.
+        """
+        if v != 0 and v < 64:
+            raise ValueError(f"'preview_tile_size' must be 0 or at least 64. You entered: {v}")
+        return v
+
+    @field_validator("event_debounce_window_in_seconds")
+    def debounce_window_must_not_be_negative(cls, v: float) -> float:
+        """
+        Ensures the debounce window is zero (disabled) or positive.
+        """
+        if v < 0:
+            raise ValueError(
+                f"'event_debounce_window_in_seconds' must not be negative. You entered: {v}"
+            )
+        return v
+
     @field_validator("start_sound_volume", "success_sound_volume", "failure_sound_volume")
     def volumes_between_0_and_1(cls, v: float, info: FieldValidationInfo) -> float:
         """
@@ -221,7 +278,7 @@ class Settings(BaseModel):
         """
         Ensures rclone executable exists if rclone upload method is selected.
         """
-        if info.data.get("upload_method") == "rclone":
+        if info.data.get("upload_method") in RCLONE_UPLOAD_METHODS:
             if not v.exists():
                 raise ValueError(
                     f"The rclone executable was not found at the expected location:\n  {v}\n"
@@ -237,7 +294,7 @@ class Settings(BaseModel):
         Ensures remote upload dir is a syntactically valid path when using rclone.
         Does NOT check if the path exists (since it's a remote target).
         """
-        if info.data.get("upload_method") == "rclone":
+        if info.data.get("upload_method") in RCLONE_UPLOAD_METHODS:
             try:
                 _ = str(v)  # forces path parsing
             except Exception:
@@ -249,7 +306,7 @@ class Settings(BaseModel):
         """
         Ensures the rclone remote service name is set if rclone is used.
         """
-        if info.data.get("upload_method") == "rclone" and not v.strip():
+        if info.data.get("upload_method") in RCLONE_UPLOAD_METHODS and not v.strip():
             raise ValueError("'rclone_remote_service' must be set when using rclone upload.")
         return v
 
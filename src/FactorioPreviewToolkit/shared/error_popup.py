@@ -1,13 +1,13 @@
-import tkinter as tk
-from tkinter import scrolledtext
-
-import pyperclip
-
-
 def show_error_popup(title: str, message: str) -> None:
     """
     Opens a simple Tkinter popup window displaying an error message with a copy-to-clipboard button.
+    Tkinter and pyperclip are imported on first use, so processes that never show an error
+    don't pay for loading them.
     """
+    import tkinter as tk
+    from tkinter import scrolledtext
+
+    import pyperclip
 
     def copy_to_clipboard() -> None:
         """
@@ -0,0 +1,142 @@
+"""
+Minimal ctypes binding for Linux inotify.
+
+Lets threads block until something changes in a directory instead of polling it.
+Only available on Linux; callers check `is_inotify_available()` and fall back to polling.
+"""
+
+import ctypes
+import errno
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from types import TracebackType
+
+# Event masks from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = os.O_CLOEXEC
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_BUFFER_SIZE = 64 * 1024
+
+_libc: ctypes.CDLL | None = None
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    """
+    Loads libc once and declares the inotify signatures. Returns None if inotify is unavailable.
+    """
+    global _libc
+    if _libc is None and sys.platform.startswith("linux"):
+        try:
+            # The interpreter is linked against libc; find_library would spawn a subprocess
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_init1.restype = ctypes.c_int
+            libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+            libc.inotify_add_watch.restype = ctypes.c_int
+        except (OSError, AttributeError):
+            return None
+        _libc = libc
+    return _libc
+
+
+def is_inotify_available() -> bool:
+    """
+    Returns True if inotify can be used on this system.
+    """
+    return _load_libc() is not None
+
+
+class DirectoryWatch:
+    """
+    Watches a single directory for the given event mask.
+    Use as a context manager; the inotify file descriptor is closed on exit.
+    """
+
+    def __init__(self, directory: Path, mask: int):
+        libc = _load_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available on this system.")
+
+        self._fd: int = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if self._fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, os.strerror(error))
+
+        watch = libc.inotify_add_watch(self._fd, os.fsencode(directory), mask | IN_ONLYDIR)
+        if watch < 0:
+            error = ctypes.get_errno()
+            os.close(self._fd)
+            raise OSError(error, f"Can't watch {directory}: {os.strerror(error)}")
+
+    def __enter__(self) -> "DirectoryWatch":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the inotify file descriptor. Safe to call more than once.
+        """
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def fileno(self) -> int:
+        """
+        Returns the inotify file descriptor, e.g. to wait on it together with other descriptors.
+        """
+        return self._fd
+
+    def read_events(self, timeout_in_sec: float | None) -> list[tuple[int, str]]:
+        """
+        Blocks until events arrive or the timeout expires.
+        Returns (mask, file name) pairs; an empty list means the timeout expired.
+        """
+        deadline = None if timeout_in_sec is None else time.monotonic() + timeout_in_sec
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            readable, _, _ = select.select([self._fd], [], [], remaining)
+            if not readable:
+                return []
+            try:
+                data = os.read(self._fd, _READ_BUFFER_SIZE)
+            except BlockingIOError:
+                continue
+            return _parse_events(data)
+
+
+def _parse_events(data: bytes) -> list[tuple[int, str]]:
+    """
+    Splits a buffer read from an inotify descriptor into (mask, file name) pairs.
+    """
+    events = []
+    offset = 0
+    while offset + _EVENT_HEADER.size <= len(data):
+        _, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+        offset += _EVENT_HEADER.size
+        raw_name = data[offset : offset + name_length].rstrip(b"\0")
+        offset += name_length
+        events.append((mask, os.fsdecode(raw_name)))
+    return events
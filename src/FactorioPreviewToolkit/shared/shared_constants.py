@@ -13,21 +13,36 @@ class _Constants:
 
     # === Logging & Assets ===
     LOGS_DIR = BASE_PROJECT_DIR / "logs"
+    TRACES_DIR = LOGS_DIR / "traces"
     BASE_ASSETS_DIR = BASE_PROJECT_DIR / "assets"
 
     # === Output Folder for Generated Previews ===
     PREVIEWS_OUTPUT_DIR = BASE_PROJECT_DIR / "previews"
     PREVIEW_LINKS_FILEPATH = PREVIEWS_OUTPUT_DIR / "remote_viewer_config.txt"
+    PREVIEW_TILES_DIR = PREVIEWS_OUTPUT_DIR / "tiles"
 
     # === Temporary / Working Directories ===
     BASE_TEMP_DIR = BASE_PROJECT_DIR / "temp_files"
     FACTORIO_WRITE_DATA_DIR = BASE_TEMP_DIR / "data"
     SCRIPT_OUTPUT_DIR = FACTORIO_WRITE_DATA_DIR / "script-output"
     MAP_GEN_SETTINGS_FILEPATH = BASE_TEMP_DIR / "map-gen-settings.json"
+    RCLONE_DAEMON_LOG_FILEPATH = BASE_TEMP_DIR / "rclone_daemon.log"
+
+    # === Persistent Caches ===
+    PREVIEW_CACHE_DIR = BASE_TEMP_DIR / "preview_cache"
+    FACTORIO_VERSION_CACHE_FILEPATH = BASE_TEMP_DIR / "factorio_version_cache.json"
+    SHARE_LINK_CACHE_FILEPATH = BASE_TEMP_DIR / "share_link_cache.json"
+    UPLOAD_MANIFEST_FILEPATH = BASE_TEMP_DIR / "upload_manifest.json"
+    TERRAIN_PALETTE_DIR = BASE_TEMP_DIR / "terrain_palettes"
 
     # === Dummy Save for Settings Generation ===
     DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH = BASE_TEMP_DIR / "dummy-save-to-create-map-gen-settings"
-    CONTROL_LUA_FILEPATH = DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH / "control.lua"
+    CONTROL_LUA_FILENAME = "control.lua"
+    CONTROL_LUA_FILEPATH = DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH / CONTROL_LUA_FILENAME
+    DUMMY_SAVE_TEMPLATES_DIR = BASE_TEMP_DIR / "dummy_save_templates"
+    DUMMY_SAVE_TEMPLATE_MARKER_FILEPATH = DUMMY_SAVE_TO_EXECUTE_LUA_CODE_PATH.with_suffix(
+        ".template"
+    )
 
     # === File Naming & Generated Outputs ===
     COMBINED_MAP_GEN_SETTINGS_FILENAME = "combined-map-gen-settings.json"
@@ -37,8 +52,19 @@ class _Constants:
     PLANET_NAMES_GENERATION_FILEPATH = SCRIPT_OUTPUT_DIR / PLANET_NAMES_REMOTE_FILENAME
     PLANET_NAMES_REMOTE_VIEWER_FILEPATH = PREVIEWS_OUTPUT_DIR / PLANET_NAMES_REMOTE_FILENAME
     PLANET_NAMES_LOCAL_VIEWER_FILEPATH = PREVIEWS_OUTPUT_DIR / PLANET_NAMES_LOCAL_FILENAME
-    FACTORIO_CONFIG_FILEPATH = BASE_TEMP_DIR / "factorio_config.ini"
-    FACTORIO_LOCK_FILEPATH = FACTORIO_WRITE_DATA_DIR / ".lock"
+    TILE_MANIFEST_REMOTE_FILENAME = "remote_tile_manifest.json"
+    TILE_MANIFEST_LOCAL_FILENAME = "local_tile_manifest.js"
+    TILE_MANIFEST_REMOTE_VIEWER_FILEPATH = PREVIEWS_OUTPUT_DIR / TILE_MANIFEST_REMOTE_FILENAME
+    TILE_MANIFEST_LOCAL_VIEWER_FILEPATH = PREVIEWS_OUTPUT_DIR / TILE_MANIFEST_LOCAL_FILENAME
+    FACTORIO_CONFIG_FILENAME = "factorio_config.ini"
+    FACTORIO_CONFIG_FILEPATH = BASE_TEMP_DIR / FACTORIO_CONFIG_FILENAME
+    FACTORIO_LOCK_FILENAME = ".lock"
+    FACTORIO_LOCK_FILEPATH = FACTORIO_WRITE_DATA_DIR / FACTORIO_LOCK_FILENAME
+    FACTORIO_LOCK_OWNER_FILENAME = ".lock.owner"
+    FACTORIO_MODS_DIR = FACTORIO_WRITE_DATA_DIR / "mods"
+
+    # === Isolated Factorio Instances for Parallel Rendering ===
+    PARALLEL_RENDER_DIR = BASE_TEMP_DIR / "parallel_render"
 
     # === Ensure required directories exist ===
     BASE_TEMP_DIR.mkdir(parents=True, exist_ok=True)
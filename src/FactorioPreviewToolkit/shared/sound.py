@@ -1,20 +1,29 @@
 import contextlib
+import functools
 import os
 from pathlib import Path
+from types import ModuleType
 
+from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.structured_logger import log
 
-# Suppress stdout and stderr while importing and initializing pygame
-with (
-    open(os.devnull, "w") as devnull,
-    contextlib.redirect_stdout(devnull),
-    contextlib.redirect_stderr(devnull),
-):
-    import pygame
 
-    pygame.mixer.init()
+@functools.cache
+def _get_pygame() -> ModuleType:
+    """
+    Imports pygame and initializes its mixer on first use.
+    Only the process that plays sounds pays for the audio initialization.
+    """
+    # Suppress stdout and stderr while importing and initializing pygame
+    with (
+        open(os.devnull, "w") as devnull,
+        contextlib.redirect_stdout(devnull),
+        contextlib.redirect_stderr(devnull),
+    ):
+        import pygame
 
-from src.FactorioPreviewToolkit.shared.config import Config
+        pygame.mixer.init()
+    return pygame
 
 
 def _play_sound(path: Path, volume: float = 0.5) -> None:
@@ -23,6 +32,7 @@ def _play_sound(path: Path, volume: float = 0.5) -> None:
     Blocks until playback is done.
     """
     try:
+        pygame = _get_pygame()
         pygame.mixer.music.load(str(path))
         pygame.mixer.music.set_volume(volume)
         pygame.mixer.music.play()
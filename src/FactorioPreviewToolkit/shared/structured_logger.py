@@ -1,10 +1,17 @@
+import json
 import logging
+import os
 import sys
 import threading
+import time
 from collections.abc import Iterator
 from contextlib import contextmanager
 from io import TextIOWrapper
-from typing import TextIO
+from pathlib import Path
+from typing import Any, TextIO
+
+# Environment variable that hands the trace file of the current job to subprocesses
+TRACE_FILE_ENV_VAR = "FACTORIO_PREVIEW_TOOLKIT_TRACE_FILE"
 
 
 class NestingState(threading.local):
@@ -27,20 +34,161 @@ def get_logging_indent() -> str:
     return "   " * _nesting.level
 
 
+class _TraceState:
+    """
+    Trace file spans of this process are appended to, and the threads already named in it.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.path: Path | None = None
+        self.named_threads: set[int] = set()
+
+
+_trace = _TraceState()
+
+
+def set_trace_file(path: Path | None) -> None:
+    """
+    Starts recording spans of this process into the given trace file, or stops with None.
+    Several processes can record into the same file at once.
+    """
+    with _trace.lock:
+        _trace.path = path
+        _trace.named_threads.clear()
+
+
+def get_trace_file() -> Path | None:
+    """
+    Returns the trace file spans are currently recorded into, if any.
+    """
+    return _trace.path
+
+
+def _append_trace_events(path: Path, events: list[dict[str, Any]]) -> None:
+    """
+    Appends events as JSON lines. Each line is written with a single call in append mode,
+    so lines of different processes don't interleave.
+    """
+    data = "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+    try:
+        with path.open("a", encoding="utf-8") as f:
+            f.write(data)
+    except OSError:
+        pass  # Tracing must never break the traced work
+
+
+def _record_span(
+    path: Path, name: str, start_in_us: int, end_in_us: int, attributes: dict[str, Any]
+) -> None:
+    """
+    Appends a finished span to the trace file, preceded by the thread name on first use.
+    Drops the span if the trace ended or changed while it was open.
+    """
+    pid, tid = os.getpid(), threading.get_native_id()
+    events: list[dict[str, Any]] = []
+    with _trace.lock:
+        if _trace.path != path:
+            return
+        if tid not in _trace.named_threads:
+            _trace.named_threads.add(tid)
+            thread_name = threading.current_thread().name
+            events.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": pid,
+                    "tid": tid,
+                    "args": {"name": thread_name},
+                }
+            )
+    events.append(
+        {
+            "name": name,
+            "ph": "X",
+            "ts": start_in_us,
+            "dur": end_in_us - start_in_us,
+            "pid": pid,
+            "tid": tid,
+            "args": {key: str(value) for key, value in attributes.items()},
+        }
+    )
+    _append_trace_events(path, events)
+
+
 @contextmanager
-def log_section(title: str) -> Iterator[None]:
+def trace_span(name: str, **attributes: Any) -> Iterator[dict[str, Any]]:
+    """
+    Records the duration of the block as a span with the process, thread and attributes,
+    if a trace file is set. Spans are recorded as Chrome trace 'complete' events.
+    Yields the attributes, so results known only at the end can be added.
+    """
+    path = _trace.path
+    if path is None:
+        yield attributes
+        return
+
+    start_in_us = time.time_ns() // 1000
+    try:
+        yield attributes
+    finally:
+        _record_span(path, name, start_in_us, time.time_ns() // 1000, attributes)
+
+
+def export_chrome_trace(trace_file: Path, output_path: Path) -> int:
+    """
+    Converts the recorded spans of a trace file into a Chrome trace JSON file, which opens in
+    Perfetto or chrome://tracing. Each process is named after its earliest span.
+    Returns the number of spans.
+    """
+    events: list[dict[str, Any]] = []
+    with trace_file.open("r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue  # Line of a process that was killed while writing
+
+    spans = sorted((event for event in events if event.get("ph") == "X"), key=lambda e: e["ts"])
+    process_names: dict[int, str] = {}
+    for span in spans:
+        process_names.setdefault(span["pid"], f"{span['name']} (PID {span['pid']})")
+    events.extend(
+        {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": name}}
+        for pid, name in process_names.items()
+    )
+
+    temp_path = output_path.with_suffix(".tmp")
+    with temp_path.open("w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+    os.replace(temp_path, output_path)
+    return len(spans)
+
+
+@contextmanager
+def log_section(title: str, **attributes: Any) -> Iterator[None]:
     """
     Context manager for logging a section with increased indentation.
     Restores indentation level after the block ends.
+    The section is recorded as a trace span with the given attributes while tracing.
     """
     log.info(title)
     _nesting.level += 1
     try:
-        yield
+        with trace_span(title, **attributes):
+            yield
     finally:
         _nesting.level = max(0, _nesting.level - 1)
 
 
+def get_logging_indent_level() -> int:
+    """
+    Returns the current thread's indentation level.
+    Useful to carry the indentation over into worker threads.
+    """
+    return _nesting.level
+
+
 def set_logging_indent(level: int) -> None:
     """
     Sets the current thread's indentation level manually.
@@ -112,3 +260,7 @@ def setup_logger() -> logging.Logger:
 
 
 log = setup_logger()
+
+# Subprocesses of a traced job record into the job's trace file
+if os.environ.get(TRACE_FILE_ENV_VAR):
+    set_trace_file(Path(os.environ[TRACE_FILE_ENV_VAR]))
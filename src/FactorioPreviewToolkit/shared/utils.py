@@ -1,14 +1,28 @@
 import platform
 import re
 import sys
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Literal
 
+# Map exchange strings stay far below this, even with many mods
+MAX_MAP_STRING_LENGTH = 256 * 1024
+
+# Delay between attempts to take a file lock on Windows
+_LOCK_RETRY_DELAY_IN_SEC = 0.05
+
 
 def is_valid_map_string(s: str) -> bool:
     """
     Checks if the string matches the map exchange format: >>>eN...<<<
+    Text that is too long or doesn't start and end like a map string is rejected without the regex.
     """
+    if len(s) > MAX_MAP_STRING_LENGTH:
+        return False
+    if not s[:64].lstrip().startswith(">>>eN") or not s[-64:].rstrip().endswith("<<<"):
+        return False
     return bool(re.match(r"^>>>eN[\sA-Za-z0-9+/=]+<<<$", s.strip()))
 
 
@@ -78,3 +92,35 @@ def get_supported_architecture() -> Literal["intel_amd64", "arm64", "unsupported
     if arch_raw in ("arm64", "aarch64"):
         return "arm64"
     return "unsupported"
+
+
+@contextmanager
+def lock_file(lock_path: Path) -> Iterator[None]:
+    """
+    Holds an exclusive lock on the given lock file until the block ends, against other threads
+    and processes. The lock belongs to an open file, so the system releases it when a process dies.
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    with lock_path.open("a+b") as lock_handle:
+        if sys.platform == "win32":
+            import msvcrt
+
+            while True:
+                try:
+                    msvcrt.locking(lock_handle.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(_LOCK_RETRY_DELAY_IN_SEC)
+            try:
+                yield
+            finally:
+                lock_handle.seek(0)
+                msvcrt.locking(lock_handle.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(lock_handle.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_handle.fileno(), fcntl.LOCK_UN)
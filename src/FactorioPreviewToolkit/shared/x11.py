@@ -0,0 +1,548 @@
+"""
+Minimal ctypes binding for Xlib and the XFixes extension.
+
+Lets threads block on X11 events over one persistent connection instead of polling with helper
+processes. Only available in X11 sessions; callers check `is_x11_available()` and fall back to
+polling. Each connection must only be used by one thread, except for `interrupt()`.
+"""
+
+import ctypes
+import errno
+import os
+import select
+import sys
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any
+
+# Event types and masks from <X11/X.h>
+PROPERTY_NOTIFY = 28
+SELECTION_NOTIFY = 31
+PROPERTY_CHANGE_MASK = 1 << 22
+
+# From <X11/extensions/xfixeswire.h>
+_XFIXES_SELECTION_NOTIFY = 0
+_XFIXES_SET_SELECTION_OWNER_NOTIFY_MASK = 1 << 0
+
+_NONE = 0
+_PROP_MODE_REPLACE = 0
+_CURRENT_TIME = 0
+_ANY_PROPERTY_TYPE = 0
+_SUCCESS = 0
+
+# Size of one format 32 property item, which Xlib stores as a C long
+_LONG_SIZE = ctypes.sizeof(ctypes.c_long)
+
+# Time a selection owner gets to hand over its content
+_SELECTION_TIMEOUT_IN_SEC = 1.0
+
+
+class _XSelectionEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("serial", ctypes.c_ulong),
+        ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("requestor", ctypes.c_ulong),
+        ("selection", ctypes.c_ulong),
+        ("target", ctypes.c_ulong),
+        ("property", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+    ]
+
+
+class _XPropertyEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("serial", ctypes.c_ulong),
+        ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("window", ctypes.c_ulong),
+        ("atom", ctypes.c_ulong),
+        ("time", ctypes.c_ulong),
+        ("state", ctypes.c_int),
+    ]
+
+
+class _XFixesSelectionNotifyEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("serial", ctypes.c_ulong),
+        ("send_event", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("window", ctypes.c_ulong),
+        ("subtype", ctypes.c_int),
+        ("owner", ctypes.c_ulong),
+        ("selection", ctypes.c_ulong),
+        ("timestamp", ctypes.c_ulong),
+        ("selection_timestamp", ctypes.c_ulong),
+    ]
+
+
+class _XEvent(ctypes.Union):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("xselection", _XSelectionEvent),
+        ("xproperty", _XPropertyEvent),
+        ("xfixesselection", _XFixesSelectionNotifyEvent),
+        ("pad", ctypes.c_long * 24),
+    ]
+
+
+class _XErrorEvent(ctypes.Structure):
+    _fields_ = [
+        ("type", ctypes.c_int),
+        ("display", ctypes.c_void_p),
+        ("resourceid", ctypes.c_ulong),
+        ("serial", ctypes.c_ulong),
+        ("error_code", ctypes.c_ubyte),
+        ("request_code", ctypes.c_ubyte),
+        ("minor_code", ctypes.c_ubyte),
+    ]
+
+
+_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.POINTER(_XErrorEvent))
+
+
+def _ignore_x_error(display: int | None, error: Any) -> int:
+    """
+    Keeps Xlib from exiting the process on protocol errors, e.g. for windows that were just
+    closed. The failed request returns an error status instead.
+    """
+    return 0
+
+
+# Must stay referenced while Xlib may call it
+_ignore_x_error_callback = _ERROR_HANDLER(_ignore_x_error)
+
+# The error handler is process-wide; serializes swapping it between threads
+_error_handler_lock = threading.Lock()
+
+
+_xlib: ctypes.CDLL | None = None
+_xfixes: ctypes.CDLL | None = None
+
+
+def _declare(function: Any, argtypes: list[Any], restype: Any) -> None:
+    """
+    Declares the C signature of a library function.
+    """
+    function.argtypes = argtypes
+    function.restype = restype
+
+
+def _load_xlib() -> ctypes.CDLL | None:
+    """
+    Loads libX11 once, declares the used signatures and enables thread support.
+    Returns None if Xlib is unavailable.
+    """
+    global _xlib
+    if _xlib is None and sys.platform.startswith("linux"):
+        try:
+            # Loading by soname; find_library would spawn a subprocess
+            xlib = ctypes.CDLL("libX11.so.6")
+        except OSError:
+            return None
+        display, window, atom = ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong
+        _declare(xlib.XInitThreads, [], ctypes.c_int)
+        _declare(xlib.XOpenDisplay, [ctypes.c_char_p], ctypes.c_void_p)
+        _declare(xlib.XCloseDisplay, [display], ctypes.c_int)
+        _declare(xlib.XConnectionNumber, [display], ctypes.c_int)
+        _declare(xlib.XDefaultRootWindow, [display], window)
+        _declare(xlib.XInternAtom, [display, ctypes.c_char_p, ctypes.c_int], atom)
+        _declare(
+            xlib.XCreateSimpleWindow,
+            [display, window, ctypes.c_int, ctypes.c_int]
+            + [ctypes.c_uint, ctypes.c_uint, ctypes.c_uint, ctypes.c_ulong, ctypes.c_ulong],
+            window,
+        )
+        _declare(xlib.XDestroyWindow, [display, window], ctypes.c_int)
+        _declare(xlib.XSelectInput, [display, window, ctypes.c_long], ctypes.c_int)
+        _declare(xlib.XPending, [display], ctypes.c_int)
+        _declare(xlib.XNextEvent, [display, ctypes.POINTER(_XEvent)], ctypes.c_int)
+        _declare(xlib.XFlush, [display], ctypes.c_int)
+        _declare(xlib.XSync, [display, ctypes.c_int], ctypes.c_int)
+        _declare(
+            xlib.XConvertSelection,
+            [display, atom, atom, atom, window, ctypes.c_ulong],
+            ctypes.c_int,
+        )
+        _declare(xlib.XDeleteProperty, [display, window, atom], ctypes.c_int)
+        _declare(
+            xlib.XChangeProperty,
+            [display, window, atom, atom, ctypes.c_int, ctypes.c_int]
+            + [ctypes.POINTER(ctypes.c_ulong), ctypes.c_int],
+            ctypes.c_int,
+        )
+        _declare(
+            xlib.XGetWindowProperty,
+            [display, window, atom, ctypes.c_long, ctypes.c_long, ctypes.c_int, atom]
+            + [ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int)]
+            + [ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong)]
+            + [ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte))],
+            ctypes.c_int,
+        )
+        _declare(xlib.XFree, [ctypes.c_void_p], ctypes.c_int)
+        _declare(xlib.XSetErrorHandler, [_ERROR_HANDLER], _ERROR_HANDLER)
+        # Connections are used from several threads, e.g. next to Tk; must precede XOpenDisplay
+        xlib.XInitThreads()
+        _xlib = xlib
+    return _xlib
+
+
+def _load_xfixes() -> ctypes.CDLL | None:
+    """
+    Loads libXfixes once and declares the used signatures. Returns None if it is unavailable.
+    """
+    global _xfixes
+    if _xfixes is None and _load_xlib() is not None:
+        try:
+            xfixes = ctypes.CDLL("libXfixes.so.3")
+        except OSError:
+            return None
+        _declare(
+            xfixes.XFixesQueryExtension,
+            [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)],
+            ctypes.c_int,
+        )
+        _declare(
+            xfixes.XFixesSelectSelectionInput,
+            [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_ulong],
+            None,
+        )
+        _xfixes = xfixes
+    return _xfixes
+
+
+def is_x11_available() -> bool:
+    """
+    Returns True if this is an X11 session and Xlib can be loaded.
+    Wayland sessions are excluded, since XWayland only relays part of the events of Wayland apps.
+    """
+    if not os.environ.get("DISPLAY") or os.environ.get("XDG_SESSION_TYPE") == "wayland":
+        return False
+    return _load_xlib() is not None
+
+
+class X11Connection:
+    """
+    A connection to the X server of $DISPLAY.
+    Use as a context manager; the connection is closed on exit.
+    """
+
+    def __init__(self) -> None:
+        xlib = _load_xlib()
+        if xlib is None:
+            raise OSError(errno.ENOSYS, "Xlib is not available on this system.")
+        self._xlib = xlib
+        self._display: int | None = xlib.XOpenDisplay(None)
+        if not self._display:
+            raise OSError(errno.ECONNREFUSED, f"Can't open X display {os.environ.get('DISPLAY')}.")
+        self.root: int = xlib.XDefaultRootWindow(self._display)
+        # Lets other threads wake up a thread that waits for events
+        self._wake_read_fd, self._wake_write_fd = os.pipe()
+        self._wake_lock = threading.Lock()
+
+    def __enter__(self) -> "X11Connection":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Closes the connection. Safe to call more than once.
+        """
+        if self._display:
+            self._xlib.XCloseDisplay(self._display)
+            with self._wake_lock:
+                self._display = None
+                os.close(self._wake_read_fd)
+                os.close(self._wake_write_fd)
+
+    def interrupt(self) -> None:
+        """
+        Wakes up the thread waiting in next_event() and makes all later waits return right away,
+        so the thread can't miss it while busy. Meant for stopping. Safe to call from any thread.
+        """
+        # The lock keeps the descriptor from being closed, and maybe reused, while writing
+        with self._wake_lock:
+            if self._display:
+                os.write(self._wake_write_fd, b"\0")
+
+    @contextmanager
+    def _ignoring_errors(self) -> Iterator[None]:
+        """
+        Installs an error handler that doesn't exit for the enclosed requests, then restores the
+        previous one, which e.g. Tk relies on. Errors of the enclosed requests are delivered
+        before restoring it.
+        """
+        with _error_handler_lock:
+            previous_handler = self._xlib.XSetErrorHandler(_ignore_x_error_callback)
+            try:
+                yield
+            finally:
+                self._xlib.XSync(self._display, 0)
+                self._xlib.XSetErrorHandler(previous_handler)
+
+    def intern_atom(self, name: str) -> int:
+        """
+        Returns the atom of a name, creating it if needed.
+        """
+        atom: int = self._xlib.XInternAtom(self._display, name.encode("ascii"), 0)
+        return atom
+
+    def next_event(self, timeout_in_sec: float | None) -> _XEvent | None:
+        """
+        Blocks until an event arrives, the timeout expires or interrupt() is called.
+        Returns None if no event arrived.
+        """
+        deadline = None if timeout_in_sec is None else time.monotonic() + timeout_in_sec
+        # XPending flushes the output buffer and reads what the server already sent
+        while not self._xlib.XPending(self._display):
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            fd = self._xlib.XConnectionNumber(self._display)
+            readable, _, _ = select.select([fd, self._wake_read_fd], [], [], remaining)
+            if not readable or self._wake_read_fd in readable:
+                return None
+        event = _XEvent()
+        self._xlib.XNextEvent(self._display, ctypes.byref(event))
+        return event
+
+    def create_window(self) -> int:
+        """
+        Creates a hidden 1x1 window, e.g. to receive selection contents.
+        """
+        window: int = self._xlib.XCreateSimpleWindow(self._display, self.root, 0, 0, 1, 1, 0, 0, 0)
+        return window
+
+    def destroy_window(self, window: int) -> None:
+        """
+        Destroys a window created with create_window().
+        """
+        self._xlib.XDestroyWindow(self._display, window)
+        self._xlib.XFlush(self._display)
+
+    def set_window_property(
+        self, window: int, property_atom: int, type_name: str, value: int
+    ) -> None:
+        """
+        Sets a window property to a single 32-bit value of the given type, e.g. CARDINAL.
+        """
+        data = ctypes.c_ulong(value)
+        self._xlib.XChangeProperty(
+            self._display,
+            window,
+            property_atom,
+            self.intern_atom(type_name),
+            32,
+            _PROP_MODE_REPLACE,
+            data,
+            1,
+        )
+        self._xlib.XFlush(self._display)
+
+    def get_window_property(
+        self, window: int, property_atom: int, max_bytes: int, delete: bool = False
+    ) -> tuple[int, int, bytes] | None:
+        """
+        Returns (type atom, format, data) of a window property, or None if it doesn't exist,
+        the window is gone or the property is larger than max_bytes.
+        Format 32 data is a sequence of C longs.
+        """
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        item_count = ctypes.c_ulong()
+        bytes_after = ctypes.c_ulong()
+        data = ctypes.POINTER(ctypes.c_ubyte)()
+        # Foreign windows may be closed at any time
+        with self._ignoring_errors():
+            status = self._xlib.XGetWindowProperty(
+                self._display,
+                window,
+                property_atom,
+                0,
+                # Length in 32-bit units; one more to find out if the property is larger
+                max_bytes // 4 + 1,
+                int(delete),
+                _ANY_PROPERTY_TYPE,
+                ctypes.byref(actual_type),
+                ctypes.byref(actual_format),
+                ctypes.byref(item_count),
+                ctypes.byref(bytes_after),
+                ctypes.byref(data),
+            )
+        if status != _SUCCESS:
+            return None
+        try:
+            if actual_type.value == _NONE or bytes_after.value:
+                return None
+            item_size = {8: 1, 16: ctypes.sizeof(ctypes.c_short), 32: ctypes.sizeof(ctypes.c_long)}
+            size = item_count.value * item_size.get(actual_format.value, 1)
+            if actual_format.value == 8 and size > max_bytes:
+                return None
+            return actual_type.value, actual_format.value, ctypes.string_at(data, size)
+        finally:
+            if data:
+                self._xlib.XFree(data)
+
+
+class ClipboardWatch(X11Connection):
+    """
+    Watches the CLIPBOARD selection for owner changes, which happen on every copy, and reads
+    its text on request. Uses the XFixes extension and a hidden window to receive the content.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        try:
+            xfixes = _load_xfixes()
+            event_base = ctypes.c_int()
+            error_base = ctypes.c_int()
+            if xfixes is None or not xfixes.XFixesQueryExtension(
+                self._display, ctypes.byref(event_base), ctypes.byref(error_base)
+            ):
+                raise OSError(errno.ENOSYS, "The X server doesn't support XFixes.")
+            self._owner_change_event = event_base.value + _XFIXES_SELECTION_NOTIFY
+
+            self._clipboard = self.intern_atom("CLIPBOARD")
+            self._utf8_string = self.intern_atom("UTF8_STRING")
+            self._string = self.intern_atom("STRING")
+            self._incr = self.intern_atom("INCR")
+            self._property = self.intern_atom("FACTORIO_PREVIEW_TOOLKIT_CLIPBOARD")
+            self._window = self.create_window()
+            xfixes.XFixesSelectSelectionInput(
+                self._display,
+                self._window,
+                self._clipboard,
+                _XFIXES_SET_SELECTION_OWNER_NOTIFY_MASK,
+            )
+            self._xlib.XFlush(self._display)
+        except BaseException:
+            self.close()
+            raise
+        self._has_pending_change = False
+
+    def wait_for_change(self, timeout_in_sec: float | None) -> bool:
+        """
+        Blocks until the clipboard changes, the timeout expires or interrupt() is called.
+        Returns True if it changed.
+        """
+        if self._has_pending_change:
+            self._has_pending_change = False
+            return True
+        deadline = None if timeout_in_sec is None else time.monotonic() + timeout_in_sec
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            event = self.next_event(remaining)
+            if event is None:
+                return False
+            if event.type == self._owner_change_event:
+                return True
+
+    def read_text(self, max_bytes: int) -> str | None:
+        """
+        Asks the clipboard owner for its content as text. Returns None if the clipboard is empty,
+        holds no text, is larger than max_bytes or its owner doesn't answer in time.
+        """
+        for target in (self._utf8_string, self._string):
+            self._xlib.XConvertSelection(
+                self._display, self._clipboard, target, self._property, self._window, _CURRENT_TIME
+            )
+            answer = self._wait_for_selection_notify()
+            if answer is None:
+                return None
+            if not answer:
+                continue  # The owner can't convert to this target, try the next one
+            result = self.get_window_property(self._window, self._property, max_bytes, True)
+            # Too large results stay in the property
+            self._xlib.XDeleteProperty(self._display, self._window, self._property)
+            # Text too large for one request is sent in INCR chunks and never a map string
+            if result is None or result[0] == self._incr:
+                return None
+            return result[2].decode("utf-8" if target == self._utf8_string else "latin-1")
+        return None
+
+    def _wait_for_selection_notify(self) -> bool | None:
+        """
+        Waits for the owner's answer to a conversion request. Returns True if the content was
+        stored in the property, False if the owner refused and None if it didn't answer in time.
+        Owner changes that arrive meanwhile are kept for the next wait_for_change().
+        """
+        deadline = time.monotonic() + _SELECTION_TIMEOUT_IN_SEC
+        while (remaining := deadline - time.monotonic()) > 0:
+            event = self.next_event(remaining)
+            if event is None:
+                return None
+            if event.type == self._owner_change_event:
+                self._has_pending_change = True
+            elif event.type == SELECTION_NOTIFY:
+                return bool(event.xselection.property != _NONE)
+        return None
+
+    def close(self) -> None:
+        """
+        Destroys the hidden window and closes the connection. Safe to call more than once.
+        """
+        if self._display and getattr(self, "_window", 0):
+            self.destroy_window(self._window)
+            self._window = 0
+        super().close()
+
+
+class ActiveWindowWatch(X11Connection):
+    """
+    Watches the _NET_ACTIVE_WINDOW property of the root window, which window managers update on
+    every focus change, and looks up the process owning the active window.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.active_window_atom = self.intern_atom("_NET_ACTIVE_WINDOW")
+        self._pid_atom = self.intern_atom("_NET_WM_PID")
+        if self.get_window_property(self.root, self.active_window_atom, _LONG_SIZE) is None:
+            self.close()
+            raise OSError(errno.ENOTSUP, "The window manager doesn't report the active window.")
+        self._xlib.XSelectInput(self._display, self.root, PROPERTY_CHANGE_MASK)
+        self._xlib.XFlush(self._display)
+
+    def wait_for_change(self, timeout_in_sec: float | None) -> bool:
+        """
+        Blocks until the active window changes, the timeout expires or interrupt() is called.
+        Returns True if it changed.
+        """
+        deadline = None if timeout_in_sec is None else time.monotonic() + timeout_in_sec
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            event = self.next_event(remaining)
+            if event is None:
+                return False
+            if event.type == PROPERTY_NOTIFY and event.xproperty.atom == self.active_window_atom:
+                return True
+
+    def get_active_window_pid(self) -> int | None:
+        """
+        Returns the PID of the active window's process, or None if no window is active or the
+        window doesn't report its PID.
+        """
+        window = self._get_cardinal_property(self.root, self.active_window_atom)
+        if not window:
+            return None
+        return self._get_cardinal_property(window, self._pid_atom)
+
+    def _get_cardinal_property(self, window: int, property_atom: int) -> int | None:
+        """
+        Returns the first 32-bit value of a window property, or None if it is missing.
+        """
+        result = self.get_window_property(window, property_atom, _LONG_SIZE)
+        if result is None or result[1] != 32 or len(result[2]) < _LONG_SIZE:
+            return None
+        return ctypes.c_ulong.from_buffer_copy(result[2][:_LONG_SIZE]).value
@@ -1,17 +1,44 @@
+import argparse
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.error_popup import show_error_popup
 from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
 from src.FactorioPreviewToolkit.uploader.factory import get_uploader
+from src.FactorioPreviewToolkit.uploader.terrain_palette import record_preview_palette_key
+
+
+def parse_factorio_path(argv: Sequence[str] | None = None) -> Path:
+    """
+    Returns the path of the Factorio executable that rendered the previews, from the CLI arguments.
+    """
+    raw_args = list(argv if argv is not None else sys.argv[1:])
+    if "--uploader-mode" in raw_args:
+        raw_args = raw_args[raw_args.index("--uploader-mode") + 1 :]
+
+    parser = argparse.ArgumentParser(description="Factorio map preview uploader")
+    parser.add_argument("factorio_path", type=Path)
+    factorio_path: Path = parser.parse_args(raw_args).factorio_path
+    return factorio_path.resolve()
 
 
-def main() -> None:
+def main(argv: Sequence[str] | None = None) -> None:
     """
     Entry point for running the uploader standalone. Selects the uploader and starts the upload.
     Handles errors and ensures clean logging exit.
     """
     try:
         with log_section("🚀 Uploader started."):
+            factorio_path = parse_factorio_path(argv)
+            if Config.get().png_palette == "terrain":
+                record_preview_palette_key(factorio_path)
             uploader = get_uploader()
-            uploader.upload_all()
+            try:
+                uploader.upload_all()
+            finally:
+                uploader.close()
             log.info("✅ Uploader finished successfully.")
     except Exception as e:
         log.exception("❌ Uploader failed with an exception.")
@@ -1,41 +1,83 @@
 import json
+import os
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from datetime import datetime, timezone
 from pathlib import Path
+from threading import BoundedSemaphore, Lock, Semaphore
 from typing import cast
 
-from PIL import PngImagePlugin, Image
-from PIL.Image import ADAPTIVE
-
+from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.shared_constants import constants
-from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
+from src.FactorioPreviewToolkit.shared.structured_logger import (
+    get_logging_indent_level,
+    log,
+    log_section,
+    set_logging_indent,
+)
+from src.FactorioPreviewToolkit.uploader.png_chunks import set_png_text
+from src.FactorioPreviewToolkit.uploader.png_optimizer import (
+    get_png_optimize_process_count,
+    optimize_png_for_upload,
+    shutdown_png_optimizer,
+)
+from src.FactorioPreviewToolkit.uploader.tile_pyramid import (
+    build_tile_pyramid,
+    clear_tiles,
+    load_tile_pyramid,
+    record_tile_manifest_entry,
+)
+from src.FactorioPreviewToolkit.uploader.upload_manifest import (
+    build_assets_version,
+    get_published_asset,
+    hash_file,
+    record_published_asset,
+)
+
+# Keyword of the PNG text chunk holding the upload timestamp
+_UPLOAD_TIMESTAMP_PNG_KEYWORD = "Upload Time"
+
+# Remote folder holding one tile folder per planet, relative to the upload folder
+_TILES_REMOTE_DIRNAME = "tiles"
 
 
-def _write_viewer_config_js(planet_image_links: dict[str, str], planet_names_link: str) -> None:
+def write_viewer_config_js(
+    planet_image_links: dict[str, str],
+    planet_names_link: str,
+    tile_manifest_link: str | None = None,
+) -> None:
     """
     Writes a JavaScript file that defines the viewerConfig object.
-    This includes preview image URLs and a reference to the planet names JS file.
+    This includes preview image URLs, a reference to the planet names JS file and,
+    if previews are tiled, a reference to the tile manifest.
+    The file is written to a temporary path first and then replaced atomically.
     """
     from src.FactorioPreviewToolkit.shared.shared_constants import constants
 
     output_path = constants.PREVIEW_LINKS_FILEPATH
+    temp_path = output_path.with_suffix(".tmp")
     with log_section("📝 Writing viewerConfig.js..."):
         try:
-            with output_path.open("w", encoding="utf-8") as f:
+            with temp_path.open("w", encoding="utf-8") as f:
                 f.write("const viewerConfig = {\n")
                 f.write("  planetPreviewSources: {\n")
                 for planet, url in planet_image_links.items():
                     f.write(f'    {planet}: "{url}",\n')
                 f.write("  },\n")
+                if tile_manifest_link is not None:
+                    f.write(f'  tileManifestSource: "{tile_manifest_link}",\n')
                 f.write(f'  planetNamesSource: "{planet_names_link}"\n')
                 f.write("};\n")
+            os.replace(temp_path, output_path)
             log.info(f"✅ viewerConfig.js written to: {output_path}")
         except Exception:
             log.error(f"❌ Failed to write viewerConfig.js to: {output_path}")
             raise
 
 
-def _load_planet_names() -> list[str]:
+def load_planet_names() -> list[str]:
     """
     Loads the list of planet names from the JSON file generated during preview setup.
     """
@@ -65,83 +107,320 @@ def _inject_upload_timestamp_into_planet_names_file() -> None:
         f.truncate()
 
 
-def _add_upload_timestamp_to_png(path: Path) -> None:
+def _inject_assets_version_into_planet_names_file() -> None:
+    """
+    Replaces the upload timestamp in the planet names JSON file with a 'version' field that
+    only changes when a planet preview was uploaded with new content.
+    """
+    path = constants.PLANET_NAMES_REMOTE_VIEWER_FILEPATH
+    with path.open("r+", encoding="utf-8") as f:
+        data = json.load(f)
+        data.pop("time", None)
+        data["version"] = build_assets_version(
+            [f"{planet}.png" for planet in data.get("planets", [])]
+        )
+        f.seek(0)
+        json.dump(data, f, indent=2)
+        f.truncate()
+
+
+def _find_unchanged_upload(remote_filename: str, content_hash: str) -> str | None:
     """
-    Adds or updates a timestamp in the metadata of a PNG file.
+    Returns the link of the published file if it already has the given content, otherwise None.
     """
-    image = Image.open(path)
-    metadata = PngImagePlugin.PngInfo()
-    metadata.add_text("", datetime.now(timezone.utc).isoformat())
+    published = get_published_asset(remote_filename)
+    if published is None or published[0] != content_hash:
+        return None
+    return published[1]
 
-    image.save(path, "PNG", pnginfo=metadata)
+
+def _add_upload_timestamp_to_png(path: Path) -> None:
+    """
+    Adds or updates a timestamp in the metadata of a PNG file, without re-encoding the image.
+    """
+    set_png_text(path, _UPLOAD_TIMESTAMP_PNG_KEYWORD, datetime.now(timezone.utc).isoformat())
 
 
-def _optimize_png(path: Path) -> None:
+class FolderUploadMixin(ABC):
     """
-    Re-encodes a PNG image with maximum lossless compression.
+    Mixin for uploaders that can upload a whole folder and share it through one link, which
+    tiled previews need. Mixed into a BaseUploader subclass before BaseUploader.
     """
-    with Image.open(path) as img:
-        if img.mode != "P":
-            img = img.convert("P", palette=ADAPTIVE, colors=256)
-        img.save(path, optimize=True, compress_level=9)
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._folder_links_lock = Lock()
+        self._folder_links: dict[str, str] = {}
+
+    def upload_planet_tiles(
+        self,
+        planet: str,
+        source_hash: str | None,
+        upload_slots: Semaphore | None,
+        is_optimized: bool = True,
+    ) -> None:
+        """
+        Slices the optimized preview of a planet into tiles, syncs its tile folder in one
+        transfer and records the tiles in the remote tile manifest. Tiles built earlier from a
+        preview with the same `source_hash` are reused. If the preview isn't optimized yet, it is
+        optimized before slicing, so tiles always share the palette of the optimized preview.
+        """
+        tile_size = Config.get().preview_tile_size
+        with log_section(f"🧩 Uploading {planet} tiles...", planet=planet):
+            image_path = constants.PREVIEWS_OUTPUT_DIR / f"{planet}.png"
+            pyramid = None
+            if source_hash is not None:
+                pyramid = load_tile_pyramid(planet, tile_size, source_hash)
+            if pyramid is None:
+                if not is_optimized:
+                    optimize_png_for_upload(image_path)
+                pyramid = build_tile_pyramid(planet, image_path, tile_size, source_hash)
+
+            remote_dirname = f"{_TILES_REMOTE_DIRNAME}/{planet}"
+            folder_hash = f"{source_hash}-{tile_size}"
+            # The trailing slash keeps folder entries apart from file entries in the manifest
+            manifest_key = f"{remote_dirname}/"
+            if (
+                Config.get().skip_unchanged_uploads
+                and source_hash is not None
+                and _find_unchanged_upload(manifest_key, folder_hash) is not None
+            ):
+                log.info(f"⏭️ {planet} tiles unchanged, upload skipped.")
+            else:
+                with upload_slots or nullcontext():
+                    self.sync_folder(pyramid.get_directory(), remote_dirname)
+                if Config.get().skip_unchanged_uploads and source_hash is not None:
+                    record_published_asset(manifest_key, folder_hash, "")
+                log.info(f"✅ {planet} tiles in {len(pyramid.levels)} levels uploaded.")
+
+            record_tile_manifest_entry(
+                constants.TILE_MANIFEST_REMOTE_VIEWER_FILEPATH,
+                self.get_folder_link(_TILES_REMOTE_DIRNAME),
+                planet,
+                pyramid.build_manifest_entry(),
+            )
+
+    def get_folder_link(self, remote_dirname: str) -> str:
+        """
+        Returns a public URL of an uploaded folder, under which its files are served by their
+        relative paths. The link is created once per uploader.
+        """
+        with self._folder_links_lock:
+            link = self._folder_links.get(remote_dirname)
+            if link is None:
+                link = self._create_folder_link(remote_dirname).rstrip("/")
+                self._folder_links[remote_dirname] = link
+            return link
+
+    @abstractmethod
+    def sync_folder(self, local_dir: Path, remote_dirname: str) -> None:
+        """
+        Makes a remote folder match a local folder in one transfer, uploading only changed files.
+        The pyramid info file of tile folders is left out.
+        """
+        ...
+
+    @abstractmethod
+    def _create_folder_link(self, remote_dirname: str) -> str:
+        """
+        Creates a public URL of an uploaded folder.
+        """
+        ...
 
 
 class BaseUploader(ABC):
     """
     Abstract uploader class. Uploads the planet names file and all planet preview images.
-    Subclasses must implement upload_single().
+    Subclasses must implement upload_single(). Previews are only tiled by subclasses that also
+    mix in FolderUploadMixin.
     """
 
+    def _get_tile_uploader(self) -> FolderUploadMixin | None:
+        """
+        Returns this uploader if previews are tiled in this upload, otherwise None.
+        """
+        if Config.get().preview_tile_size and isinstance(self, FolderUploadMixin):
+            return self
+        return None
+
+    def prepare_tiles(self) -> bool:
+        """
+        Returns whether previews are tiled in this upload. Otherwise, removes old tiles so the
+        viewers load the single previews instead.
+        """
+        if self._get_tile_uploader() is not None:
+            return True
+        if Config.get().preview_tile_size:
+            log.warning(
+                "⚠️ Tiles need an upload method that can share folders; previews are not tiled."
+            )
+        clear_tiles()
+        return False
+
     def upload_all(self) -> None:
         """
         Uploads the planet names file and all preview images listed in it.
         Saves resulting download links to a JavaScript config file.
         """
         with log_section("🚀 Uploading preview assets..."):
-            planet_names = _load_planet_names()
-            planet_names_link = self._upload_planet_names_file()
-            planet_image_links = self._upload_planet_images(planet_names)
-            _write_viewer_config_js(planet_image_links, planet_names_link)
+            config = Config.get()
+            planet_names = load_planet_names()
+            is_tiled = self.prepare_tiles()
+            if config.skip_unchanged_uploads:
+                # The version in the planet names file depends on the uploaded images
+                planet_image_links = self.upload_planet_images(
+                    planet_names, config.upload_max_concurrency
+                )
+                planet_names_link = self.upload_planet_names_file()
+            else:
+                planet_names_link = self.upload_planet_names_file()
+                planet_image_links = self.upload_planet_images(
+                    planet_names, config.upload_max_concurrency
+                )
+            tile_manifest_link = None
+            if is_tiled:
+                tile_manifest_link = self.upload_tile_manifest_file()
+            write_viewer_config_js(planet_image_links, planet_names_link, tile_manifest_link)
             log.info("✅ All assets uploaded successfully.")
 
-    def _upload_planet_names_file(self) -> str:
+    def upload_planet_names_file(self) -> str:
         """
         Uploads the planet names JS file and returns its public URL.
         """
         with log_section("📤 Uploading planet names file..."):
             try:
-                # Add a timestamp to ensure the file appears changed to Dropbox,
-                # even if its actual content hasn't changed. This helps preserve
-                # a stable shareable link when using rclone.
-                _inject_upload_timestamp_into_planet_names_file()
-                url = self.upload_single(
-                    constants.PLANET_NAMES_REMOTE_VIEWER_FILEPATH,
-                    constants.PLANET_NAMES_REMOTE_FILENAME,
-                )
+                path = constants.PLANET_NAMES_REMOTE_VIEWER_FILEPATH
+                remote_filename = constants.PLANET_NAMES_REMOTE_FILENAME
+                if not Config.get().skip_unchanged_uploads:
+                    # Add a timestamp to ensure the file appears changed to Dropbox,
+                    # even if its actual content hasn't changed. This helps preserve
+                    # a stable shareable link when using rclone.
+                    _inject_upload_timestamp_into_planet_names_file()
+                    url = self.upload_single(path, remote_filename)
+                    log.info("✅ Planet names uploaded.")
+                    return url
+
+                _inject_assets_version_into_planet_names_file()
+                content_hash = hash_file(path)
+                unchanged_url = _find_unchanged_upload(remote_filename, content_hash)
+                if unchanged_url is not None:
+                    log.info("⏭️ Planet names unchanged, upload skipped.")
+                    return unchanged_url
+                url = self.upload_single(path, remote_filename)
+                record_published_asset(remote_filename, content_hash, url)
                 log.info("✅ Planet names uploaded.")
                 return url
             except Exception:
                 log.error("❌ Failed to upload planet names.")
                 raise
 
-    def _upload_planet_images(self, planet_names: list[str]) -> dict[str, str]:
+    def upload_tile_manifest_file(self) -> str:
         """
-        Uploads all preview images and returns a dict of download links.
+        Uploads the tile manifest, which lists the tiles of all planets, and returns its URL.
         """
-        links: dict[str, str] = {}
-        for planet in planet_names:
-            with log_section(f"🌍 Uploading {planet} preview..."):
-                image_path = constants.PREVIEWS_OUTPUT_DIR / f"{planet}.png"
-                try:
-                    _optimize_png(image_path)
+        with log_section("📤 Uploading tile manifest..."):
+            try:
+                path = constants.TILE_MANIFEST_REMOTE_VIEWER_FILEPATH
+                remote_filename = constants.TILE_MANIFEST_REMOTE_FILENAME
+                if not Config.get().skip_unchanged_uploads:
+                    url = self.upload_single(path, remote_filename)
+                    log.info("✅ Tile manifest uploaded.")
+                    return url
+
+                content_hash = hash_file(path)
+                unchanged_url = _find_unchanged_upload(remote_filename, content_hash)
+                if unchanged_url is not None:
+                    log.info("⏭️ Tile manifest unchanged, upload skipped.")
+                    return unchanged_url
+                url = self.upload_single(path, remote_filename)
+                record_published_asset(remote_filename, content_hash, url)
+                log.info("✅ Tile manifest uploaded.")
+                return url
+            except Exception:
+                log.error("❌ Failed to upload tile manifest.")
+                raise
+
+    def upload_planet_image(self, planet: str, upload_slots: Semaphore | None = None) -> str:
+        """
+        Optimizes and uploads the preview image of a single planet and returns its public URL.
+        With preview_tile_size set, the tiles of the preview are uploaded as well.
+        If `upload_slots` is given, the upload itself waits for a free slot; optimizing doesn't.
+        """
+        with log_section(f"🌍 Uploading {planet} preview...", planet=planet):
+            image_path = constants.PREVIEWS_OUTPUT_DIR / f"{planet}.png"
+            start_time = time.perf_counter()
+            remote_filename = f"{planet}.png"
+            tile_uploader = self._get_tile_uploader()
+            try:
+                if not Config.get().skip_unchanged_uploads:
+                    optimize_png_for_upload(image_path)
                     _add_upload_timestamp_to_png(image_path)
-                    url = self.upload_single(image_path, f"{planet}.png")
-                    links[planet] = url
-                    log.info(f"✅ {planet} uploaded.")
-                except Exception:
-                    log.error(f"❌ Failed to upload {planet}.png")
+                    with upload_slots or nullcontext():
+                        url = self.upload_single(image_path, remote_filename)
+                    if tile_uploader is not None:
+                        tile_uploader.upload_planet_tiles(planet, None, upload_slots)
+                    log.info(f"✅ {planet} uploaded in {time.perf_counter() - start_time:.2f}s.")
+                    return url
+
+                # Hash the rendered image; optimizing it always gives the same bytes
+                content_hash = hash_file(image_path)
+                unchanged_url = _find_unchanged_upload(remote_filename, content_hash)
+                if unchanged_url is not None:
+                    log.info(f"⏭️ {planet} unchanged, upload skipped.")
+                    if tile_uploader is not None:
+                        tile_uploader.upload_planet_tiles(
+                            planet, content_hash, upload_slots, is_optimized=False
+                        )
+                    return unchanged_url
+                optimize_png_for_upload(image_path)
+                with upload_slots or nullcontext():
+                    url = self.upload_single(image_path, remote_filename)
+                record_published_asset(remote_filename, content_hash, url)
+                if tile_uploader is not None:
+                    tile_uploader.upload_planet_tiles(planet, content_hash, upload_slots)
+                log.info(f"✅ {planet} uploaded in {time.perf_counter() - start_time:.2f}s.")
+                return url
+            except Exception:
+                log.error(f"❌ Failed to upload {planet}.png")
+                raise
+
+    def upload_planet_images(self, planet_names: list[str], max_concurrency: int) -> dict[str, str]:
+        """
+        Uploads all preview images with up to `max_concurrency` uploads in flight.
+        Enough threads are used to keep every PNG optimizer process busy as well.
+        Returns the download links in the order of `planet_names`.
+        """
+        with log_section(
+            f"📦 Uploading {len(planet_names)} previews, up to {max_concurrency} at a time..."
+        ):
+            start_time = time.perf_counter()
+            indent_level = get_logging_indent_level()
+            upload_slots = BoundedSemaphore(max_concurrency)
+
+            def upload(planet: str) -> str:
+                set_logging_indent(indent_level)
+                return self.upload_planet_image(planet, upload_slots)
+
+            with ThreadPoolExecutor(
+                max_workers=max(max_concurrency, get_png_optimize_process_count()),
+                thread_name_prefix="Upload",
+            ) as executor:
+                futures = {planet: executor.submit(upload, planet) for planet in planet_names}
+                try:
+                    links = {planet: future.result() for planet, future in futures.items()}
+                except BaseException:
+                    # Don't start queued uploads after one of them failed
+                    executor.shutdown(wait=True, cancel_futures=True)
                     raise
-        return links
+
+            log.info(f"⏱️ All previews uploaded in {time.perf_counter() - start_time:.2f}s.")
+            return links
+
+    def close(self) -> None:
+        """
+        Releases resources the uploader keeps between uploads, like the PNG optimizer processes.
+        """
+        shutdown_png_optimizer()
 
     @abstractmethod
     def upload_single(self, local_path: Path, remote_filename: str) -> str:
@@ -1,6 +1,7 @@
 from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.uploader.base_uploader import BaseUploader
 from src.FactorioPreviewToolkit.uploader.local_sync_uploader import LocalSyncUploader
+from src.FactorioPreviewToolkit.uploader.rclone_daemon_uploader import RcloneDaemonUploader
 from src.FactorioPreviewToolkit.uploader.rclone_uploader import RcloneUploader
 from src.FactorioPreviewToolkit.uploader.skip_uploader import SkipUploader
 
@@ -13,6 +14,8 @@ def get_uploader() -> BaseUploader:
     match Config.get().upload_method:
         case "rclone":
             return RcloneUploader()
+        case "rclone_daemon":
+            return RcloneDaemonUploader()
         case "local_sync":
             return LocalSyncUploader()
         case "skip":
@@ -19,8 +19,13 @@ class LocalSyncUploader(BaseUploader):
         target_folder = Config.get().local_sync_target_dir
         destination_path = target_folder / remote_filename
 
-        with log_section(f"📤 Copying {local_path.name} to local sync folder: {target_folder}"):
+        with log_section(
+            f"📤 Copying {local_path.name} to local sync folder: {target_folder}",
+            file=remote_filename,
+            size_in_bytes=local_path.stat().st_size,
+        ):
             try:
+                destination_path.parent.mkdir(parents=True, exist_ok=True)
                 shutil.copy2(local_path, destination_path)
                 log.info(f"✅ File copied to: {destination_path}")
             except Exception as e:
@@ -0,0 +1,96 @@
+"""
+Edits text metadata of PNG files at chunk level, without decoding the image.
+
+A PNG file is a signature followed by chunks of (length, type, data, CRC). Text metadata lives in
+tEXt, zTXt and iTXt chunks. Setting a text rewrites the file chunk by chunk: image chunks are
+copied as they are, text chunks with the same keyword are dropped, and the new text chunk is
+written right before IEND with a freshly computed CRC.
+"""
+
+import os
+import struct
+import zlib
+from pathlib import Path
+from typing import BinaryIO
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+_CHUNK_HEADER = struct.Struct(">I4s")
+_CRC = struct.Struct(">I")
+_TEXT_CHUNK_TYPES = (b"tEXt", b"zTXt", b"iTXt")
+_MAX_KEYWORD_LENGTH = 79
+
+# Block size for streaming large chunks like IDAT
+_COPY_BLOCK_SIZE = 1024 * 1024
+
+
+def _build_chunk(chunk_type: bytes, data: bytes) -> bytes:
+    """
+    Serializes a chunk, including its length and CRC.
+    """
+    crc = zlib.crc32(data, zlib.crc32(chunk_type))
+    return _CHUNK_HEADER.pack(len(data), chunk_type) + data + _CRC.pack(crc)
+
+
+def build_text_chunk(keyword: str, text: str) -> bytes:
+    """
+    Builds a tEXt chunk, or an uncompressed iTXt chunk if the text isn't Latin-1.
+    """
+    if not 1 <= len(keyword) <= _MAX_KEYWORD_LENGTH:
+        raise ValueError(f"PNG text keywords must have 1-{_MAX_KEYWORD_LENGTH} characters.")
+    encoded_keyword = keyword.encode("latin-1")
+    try:
+        return _build_chunk(b"tEXt", encoded_keyword + b"\0" + text.encode("latin-1"))
+    except UnicodeEncodeError:
+        # Not compressed, no language tag, no translated keyword
+        header = encoded_keyword + b"\0\0\0\0\0"
+        return _build_chunk(b"iTXt", header + text.encode("utf-8"))
+
+
+def _read_exactly(f: BinaryIO, size: int) -> bytes:
+    """
+    Reads exactly `size` bytes or raises if the file ends early.
+    """
+    data = f.read(size)
+    if len(data) != size:
+        raise ValueError("Truncated PNG file.")
+    return data
+
+
+def set_png_text(path: Path, keyword: str, text: str) -> None:
+    """
+    Sets a text entry in a PNG file, replacing existing entries with the same keyword.
+    The pixel data is copied as it is and the file is replaced atomically.
+    """
+    new_chunk = build_text_chunk(keyword, text)
+    encoded_keyword = keyword.encode("latin-1")
+    temp_path = path.with_suffix(".tmp")
+
+    with path.open("rb") as source, temp_path.open("wb") as target:
+        if _read_exactly(source, len(PNG_SIGNATURE)) != PNG_SIGNATURE:
+            raise ValueError(f"Not a PNG file: {path}")
+        target.write(PNG_SIGNATURE)
+
+        while True:
+            header = _read_exactly(source, _CHUNK_HEADER.size)
+            length, chunk_type = _CHUNK_HEADER.unpack(header)
+
+            if chunk_type == b"IEND":
+                target.write(new_chunk)
+                target.write(header + _read_exactly(source, length + _CRC.size))
+                break
+
+            if chunk_type in _TEXT_CHUNK_TYPES:
+                chunk = _read_exactly(source, length + _CRC.size)
+                if chunk[: chunk.find(b"\0")] != encoded_keyword:
+                    target.write(header + chunk)
+                continue
+
+            target.write(header)
+            remaining = length + _CRC.size
+            while remaining > 0:
+                block = _read_exactly(source, min(remaining, _COPY_BLOCK_SIZE))
+                target.write(block)
+                remaining -= len(block)
+
+    os.replace(temp_path, path)
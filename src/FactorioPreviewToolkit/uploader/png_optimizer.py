@@ -0,0 +1,150 @@
+"""
+Lossless PNG optimization of previews before upload, optionally in a pool of worker processes.
+
+Quantizing and compressing a large preview takes seconds of pure CPU time and holds the GIL, so
+upload threads can't optimize several previews at once. With png_optimize_processes != 1 the
+work runs in separate processes instead. Every job reserves the memory its image needs from a
+budget, so large previews wait for a free share instead of exhausting RAM.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from threading import Condition, Lock
+
+import psutil
+
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.structured_logger import log, trace_span
+from src.FactorioPreviewToolkit.uploader.terrain_palette import (
+    load_preview_palette_key,
+    quantize_with_terrain_palette,
+)
+
+# Peak memory per pixel while optimizing: decoded RGB image, packed colors or quantization
+# buffers, palette indices, palette image and encoder buffers
+_OPTIMIZE_BYTES_PER_PIXEL = 16
+
+# Share of the available memory the optimizer processes may use together
+_MEMORY_BUDGET_SHARE = 0.5
+
+
+def optimize_png(path: Path, palette_key: str | None = None) -> None:
+    """
+    Re-encodes a PNG image with maximum lossless compression.
+    With a palette key, the colors are mapped onto that fixed terrain palette, otherwise an
+    adaptive palette is computed for the image.
+    """
+    if palette_key is not None:
+        quantize_with_terrain_palette(path, palette_key)
+        return
+
+    from PIL import Image
+
+    with Image.open(path) as img:
+        if img.mode != "P":
+            img = img.convert("P", palette=Image.Palette.ADAPTIVE, colors=256)
+        img.save(path, optimize=True, compress_level=9)
+
+
+def _estimate_optimize_memory_in_bytes(path: Path) -> int:
+    """
+    Estimates the peak memory needed to optimize the image. Only reads the PNG header.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        size: tuple[int, int] = img.size
+    return size[0] * size[1] * _OPTIMIZE_BYTES_PER_PIXEL
+
+
+def get_png_optimize_process_count() -> int:
+    """
+    Returns the number of optimizer processes from the config. 0 means one per CPU core.
+    """
+    processes = Config.get().png_optimize_processes
+    return processes if processes > 0 else os.cpu_count() or 1
+
+
+class PngOptimizerPool:
+    """
+    Optimizes PNGs in worker processes. optimize() blocks the calling thread until its image
+    is done, so upload threads use it like a function call.
+    """
+
+    def __init__(self, max_processes: int):
+        self._memory_budget = int(psutil.virtual_memory().available * _MEMORY_BUDGET_SHARE)
+        self._reserved_memory = 0
+        self._memory_condition = Condition()
+        # Spawn on every platform: forking a process with running upload threads isn't safe
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_processes, mp_context=multiprocessing.get_context("spawn")
+        )
+        log.info(
+            f"🧵 PNG optimizer pool started with {max_processes} processes "
+            f"and a {self._memory_budget // (1024 * 1024)} MB memory budget."
+        )
+
+    def optimize(self, path: Path, palette_key: str | None = None) -> None:
+        """
+        Optimizes the image in a worker process, once its memory share is available.
+        A single image larger than the whole budget still runs, but alone.
+        """
+        needed_memory = _estimate_optimize_memory_in_bytes(path)
+        with self._memory_condition:
+            self._memory_condition.wait_for(
+                lambda: self._reserved_memory == 0
+                or self._reserved_memory + needed_memory <= self._memory_budget
+            )
+            self._reserved_memory += needed_memory
+        try:
+            self._executor.submit(optimize_png, path, palette_key).result()
+        finally:
+            with self._memory_condition:
+                self._reserved_memory -= needed_memory
+                self._memory_condition.notify_all()
+
+    def close(self) -> None:
+        """
+        Stops the worker processes. Queued jobs are dropped.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+_pool: PngOptimizerPool | None = None
+_pool_lock = Lock()
+
+
+def optimize_png_for_upload(path: Path) -> None:
+    """
+    Optimizes a preview before upload. Runs in the calling thread if png_optimize_processes is 1,
+    otherwise in the shared optimizer pool, which is started on first use.
+    Uses the terrain palette of the rendering Factorio version if png_palette is 'terrain'.
+    """
+    global _pool
+    palette_key = None
+    if Config.get().png_palette == "terrain":
+        palette_key = load_preview_palette_key()
+
+    max_processes = get_png_optimize_process_count()
+    with trace_span(f"🗜️ Optimizing {path.name}", palette=palette_key or "adaptive"):
+        if max_processes == 1:
+            optimize_png(path, palette_key)
+            return
+        with _pool_lock:
+            if _pool is None:
+                _pool = PngOptimizerPool(max_processes)
+            pool = _pool
+        pool.optimize(path, palette_key)
+
+
+def shutdown_png_optimizer() -> None:
+    """
+    Stops the optimizer pool if it was started.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
@@ -0,0 +1,350 @@
+import base64
+import http.client
+import json
+import os
+import secrets
+import socket
+import subprocess
+import time
+from pathlib import Path
+from threading import Lock, local
+from typing import Any, cast
+
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
+from src.FactorioPreviewToolkit.uploader.base_uploader import BaseUploader, FolderUploadMixin
+from src.FactorioPreviewToolkit.uploader.rclone_uploader import (
+    open_rclone_config,
+    to_direct_download_url,
+)
+from src.FactorioPreviewToolkit.uploader.share_link_cache import (
+    lookup_share_link,
+    store_share_link,
+)
+from src.FactorioPreviewToolkit.uploader.tile_pyramid import PYRAMID_INFO_FILENAME
+
+_DAEMON_STARTUP_TIMEOUT_IN_SECONDS = 15
+_DAEMON_SHUTDOWN_TIMEOUT_IN_SECONDS = 5
+# Longest time a single call may take, including the transfer of a file or tile folder
+_CALL_TIMEOUT_IN_SECONDS = 300
+
+
+def _find_free_port() -> int:
+    """
+    Asks the OS for a free TCP port on the loopback interface.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+        probe.bind(("127.0.0.1", 0))
+        return cast(int, probe.getsockname()[1])
+
+
+class RcloneDaemonUploader(FolderUploadMixin, BaseUploader):
+    """
+    Rclone-based uploader that drives a single long-lived `rclone rcd` process over its
+    remote-control HTTP API, instead of starting rclone twice for every file.
+
+    The daemon is started on the first upload, listens on localhost only with random
+    credentials, and keeps its connections to the remote open between uploads. A daemon that
+    doesn't answer a call in time is killed and replaced. close() shuts it down.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = Lock()
+        self._process: subprocess.Popen[bytes] | None = None
+        self._port = 0
+        self._authorization = ""
+        self._connections = local()
+        self._remote_root = ""
+        self._supports_public_links = False
+
+    def _get_connection(self) -> http.client.HTTPConnection:
+        """
+        Returns the keep-alive connection to the daemon of the calling thread.
+        """
+        connection: http.client.HTTPConnection | None = getattr(
+            self._connections, "connection", None
+        )
+        if connection is None or connection.port != self._port:
+            connection = http.client.HTTPConnection(
+                "127.0.0.1", self._port, timeout=_CALL_TIMEOUT_IN_SECONDS
+            )
+            self._connections.connection = connection
+        return connection
+
+    def _call(self, method: str, params: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Calls a remote-control method of the daemon and returns its JSON result.
+        A connection the daemon closed in the meantime is reopened once.
+        Raises TimeoutError if the daemon doesn't answer within _CALL_TIMEOUT_IN_SECONDS.
+        """
+        body = json.dumps(params or {}).encode("utf-8")
+        headers = {"Authorization": self._authorization, "Content-Type": "application/json"}
+        for attempt in range(2):
+            connection = self._get_connection()
+            try:
+                connection.request("POST", f"/{method}", body=body, headers=headers)
+                response = connection.getresponse()
+                payload = response.read()
+                break
+            except TimeoutError:
+                connection.close()
+                self._connections.connection = None
+                raise
+            except (http.client.HTTPException, ConnectionError):
+                connection.close()
+                self._connections.connection = None
+                if attempt == 1:
+                    raise
+
+        try:
+            result = cast(dict[str, Any], json.loads(payload or b"{}"))
+        except json.JSONDecodeError:
+            result = {"error": payload.decode("utf-8", errors="replace")}
+        if response.status != 200:
+            raise RuntimeError(f"rclone {method} failed ({response.status}): {result.get('error')}")
+        return result
+
+    def _ensure_daemon(self) -> None:
+        """
+        Starts the daemon and checks the remote on first use.
+        """
+        with self._lock:
+            if self._process is not None:
+                if self._process.poll() is None:
+                    return
+                raise RuntimeError(
+                    f"rclone daemon exited with code {self._process.returncode}. "
+                    f"See {constants.RCLONE_DAEMON_LOG_FILEPATH}"
+                )
+            self._start_daemon()
+            self._check_remote()
+
+    def _call_with_restart(
+        self, method: str, params: dict[str, Any] | None = None
+    ) -> dict[str, Any]:
+        """
+        Calls a remote-control method like _call(). If the daemon doesn't answer in time, it is
+        restarted and the call is repeated once; all calls used with this are safe to repeat.
+        """
+        self._ensure_daemon()
+        process = self._process
+        try:
+            return self._call(method, params)
+        except TimeoutError:
+            log.warning(
+                f"⚠️ rclone daemon didn't answer {method} within "
+                f"{_CALL_TIMEOUT_IN_SECONDS}s, restarting it."
+            )
+            self._restart_daemon(process)
+            return self._call(method, params)
+
+    def _restart_daemon(self, hung_process: subprocess.Popen[bytes] | None) -> None:
+        """
+        Kills the given daemon process and starts a new one, unless another thread has already
+        replaced it.
+        """
+        with self._lock:
+            if self._process is hung_process and hung_process is not None:
+                hung_process.kill()
+                hung_process.wait()
+                self._process = None
+            if self._process is None:
+                self._start_daemon()
+                self._check_remote()
+
+    def _start_daemon(self) -> None:
+        """
+        Launches `rclone rcd` and waits until its API answers. Must be called with the lock held.
+        """
+        config = Config.get()
+        user = secrets.token_hex(8)
+        password = secrets.token_urlsafe(24)
+        credentials = base64.b64encode(f"{user}:{password}".encode("utf-8")).decode("ascii")
+        self._authorization = f"Basic {credentials}"
+        self._port = _find_free_port()
+        # Passed through the environment, so the credentials don't show up in process listings
+        environment = {**os.environ, "RCLONE_RC_USER": user, "RCLONE_RC_PASS": password}
+
+        with log_section(f"🛰️ Starting rclone daemon on port {self._port}..."):
+            start_time = time.perf_counter()
+            process = subprocess.Popen(
+                [
+                    str(config.rclone_executable),
+                    "rcd",
+                    f"--rc-addr=127.0.0.1:{self._port}",
+                    f"--log-file={constants.RCLONE_DAEMON_LOG_FILEPATH}",
+                ],
+                env=environment,
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            self._process = process
+
+            deadline = time.monotonic() + _DAEMON_STARTUP_TIMEOUT_IN_SECONDS
+            while True:
+                try:
+                    self._call("rc/noop")
+                    break
+                except OSError:
+                    if process.poll() is not None:
+                        raise RuntimeError(
+                            f"rclone daemon exited with code {process.returncode}. "
+                            f"See {constants.RCLONE_DAEMON_LOG_FILEPATH}"
+                        )
+                    if time.monotonic() > deadline:
+                        process.kill()
+                        raise TimeoutError("rclone daemon did not start in time.")
+                    time.sleep(0.05)
+            log.info(
+                f"✅ rclone daemon ready in {time.perf_counter() - start_time:.2f}s "
+                f"(PID {process.pid})."
+            )
+
+    def _check_remote(self) -> None:
+        """
+        Verifies that the remote is configured and detects whether it supports public links.
+        """
+        config = Config.get()
+        remote_name = config.rclone_remote_service
+
+        # Remotes starting with ':' are defined on the fly, e.g. ':local:', and need no config
+        if not remote_name.startswith(":"):
+            remotes = self._call("config/listremotes").get("remotes") or []
+            if remote_name not in remotes:
+                log.warning(f"⚠️ Rclone remote '{remote_name}' is not configured.")
+                open_rclone_config()
+                raise RuntimeError(
+                    f"Rclone remote '{remote_name}' was not configured. Run 'rclone config' and restart the application"
+                )
+
+        fs_info = self._call("operations/fsinfo", {"fs": self._get_remote_target()})
+        self._remote_root = fs_info.get("Root", "")
+        self._supports_public_links = bool(fs_info.get("Features", {}).get("PublicLink"))
+        if not self._supports_public_links:
+            log.warning(f"⚠️ Remote '{remote_name}' can't create public links.")
+
+    @staticmethod
+    def _get_remote_target() -> str:
+        """
+        Returns the rclone path of the upload folder, e.g. 'dropbox:FactorioPreviews'.
+        """
+        config = Config.get()
+        return f"{config.rclone_remote_service}:{config.rclone_remote_upload_dir.as_posix()}"
+
+    def upload_single(self, local_path: Path, remote_filename: str) -> str:
+        """
+        Uploads a single file through the rclone daemon and returns a shareable link.
+        Prompts the user to configure the remote if it's missing.
+        """
+        self._ensure_daemon()
+        remote_target = self._get_remote_target()
+
+        with log_section(
+            f"☁️ Uploading {local_path.name} to {remote_target}...",
+            file=remote_filename,
+            size_in_bytes=local_path.stat().st_size,
+        ):
+            try:
+                self._call_with_restart(
+                    "operations/copyfile",
+                    {
+                        "srcFs": str(local_path.parent.resolve()),
+                        "srcRemote": local_path.name,
+                        "dstFs": remote_target,
+                        "dstRemote": remote_filename,
+                    },
+                )
+                log.info("✅ Upload complete.")
+            except Exception:
+                log.error("❌ Upload failed.")
+                raise
+
+        return self._get_share_link(remote_filename)
+
+    def sync_folder(self, local_dir: Path, remote_dirname: str) -> None:
+        """
+        Syncs a local folder to the remote in a single daemon call, which only uploads changed
+        files and deletes remote files that no longer exist locally.
+        """
+        self._ensure_daemon()
+        full_remote_path = f"{self._get_remote_target()}/{remote_dirname}"
+
+        with log_section(f"☁️ Syncing {local_dir.name} folder to {full_remote_path}..."):
+            try:
+                self._call_with_restart(
+                    "sync/sync",
+                    {
+                        "srcFs": str(local_dir.resolve()),
+                        "dstFs": full_remote_path,
+                        "_filter": {"ExcludeRule": [f"/{PYRAMID_INFO_FILENAME}"]},
+                    },
+                )
+                log.info("✅ Sync complete.")
+            except Exception:
+                log.error("❌ Sync failed.")
+                raise
+
+    def _create_folder_link(self, remote_dirname: str) -> str:
+        """
+        Creates a shareable link of an uploaded folder.
+        """
+        self._ensure_daemon()
+        return self._get_share_link(remote_dirname)
+
+    def _get_share_link(self, remote_filename: str) -> str:
+        """
+        Returns a shareable link of an uploaded file or folder. Links are taken from the share
+        link cache if it is enabled.
+        """
+        if not self._supports_public_links:
+            # Local remotes have no public links; link the file itself
+            share_url = (Path(self._remote_root) / remote_filename).absolute().as_uri()
+            log.info(f"🔗 File URL: {share_url}")
+            return share_url
+
+        config = Config.get()
+        remote_name = config.rclone_remote_service
+        remote_folder = config.rclone_remote_upload_dir
+        if config.cache_share_links:
+            cached_url = lookup_share_link(remote_name, remote_folder, remote_filename)
+            if cached_url is not None:
+                return cached_url
+
+        with log_section("🌐 Generating shareable link..."):
+            try:
+                result = self._call_with_restart(
+                    "operations/publiclink",
+                    {"fs": self._get_remote_target(), "remote": remote_filename},
+                )
+                share_url = to_direct_download_url(str(result["url"]))
+                log.info(f"🔗 Shareable URL: {share_url}")
+                if config.cache_share_links:
+                    store_share_link(remote_name, remote_folder, remote_filename, share_url)
+                return share_url
+            except Exception:
+                log.error("❌ Failed to generate shareable link.")
+                raise
+
+    def close(self) -> None:
+        """
+        Shuts the rclone daemon down. Kills it if it doesn't exit in time.
+        """
+        super().close()
+        with self._lock:
+            if self._process is None:
+                return
+            if self._process.poll() is None:
+                try:
+                    self._call("core/quit")
+                except (OSError, RuntimeError, http.client.HTTPException):
+                    pass
+                try:
+                    self._process.wait(timeout=_DAEMON_SHUTDOWN_TIMEOUT_IN_SECONDS)
+                except subprocess.TimeoutExpired:
+                    self._process.kill()
+                    self._process.wait()
+            self._process = None
+            log.info("✅ rclone daemon stopped.")
@@ -1,9 +1,15 @@
 import subprocess
 from pathlib import Path
+from threading import Lock
 
 from src.FactorioPreviewToolkit.shared.config import Config
 from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section
-from src.FactorioPreviewToolkit.uploader.base_uploader import BaseUploader
+from src.FactorioPreviewToolkit.uploader.base_uploader import BaseUploader, FolderUploadMixin
+from src.FactorioPreviewToolkit.uploader.share_link_cache import (
+    lookup_share_link,
+    store_share_link,
+)
+from src.FactorioPreviewToolkit.uploader.tile_pyramid import PYRAMID_INFO_FILENAME
 
 
 def _is_rclone_configured(remote_name: str) -> bool:
@@ -16,7 +22,20 @@ def _is_rclone_configured(remote_name: str) -> bool:
     return any(remote_name + ":" == remote for remote in remotes)
 
 
-def _open_rclone_config() -> None:
+def to_direct_download_url(share_url: str) -> str:
+    """
+    Turns a share link into a link that serves the raw file, where the service needs that.
+    """
+    # Handle Dropbox
+    if "dropbox.com" in share_url:
+        # Force raw preview link
+        share_url = share_url.replace("www.dropbox.com", "dl.dropboxusercontent.com")
+        share_url = share_url.replace("&dl=0", "")
+        share_url = share_url.replace("&dl=1", "")
+    return share_url
+
+
+def open_rclone_config() -> None:
     """
     Launches the interactive rclone config tool.
     """
@@ -32,11 +51,33 @@ def _open_rclone_config() -> None:
         raise
 
 
-class RcloneUploader(BaseUploader):
+class RcloneUploader(FolderUploadMixin, BaseUploader):
     """
     Rclone-based uploader implementation that copies images to a remote and returns shareable links.
     """
 
+    def __init__(self) -> None:
+        super().__init__()
+        self._remote_check_lock = Lock()
+        self._is_remote_checked = False
+
+    def _ensure_remote_configured(self, remote_name: str) -> None:
+        """
+        Checks once per upload session that the remote is configured.
+        Prompts the user to configure it if it's missing.
+        """
+        with self._remote_check_lock:
+            if self._is_remote_checked:
+                return
+            # Remotes starting with ':' are defined on the fly, e.g. ':local:', and need no config
+            if not remote_name.startswith(":") and not _is_rclone_configured(remote_name):
+                log.warning(f"⚠️ Rclone remote '{remote_name}' is not configured.")
+                open_rclone_config()
+                raise RuntimeError(
+                    f"Rclone remote '{remote_name}' was not configured. Run 'rclone config' and restart the application"
+                )
+            self._is_remote_checked = True
+
     def upload_single(self, local_path: Path, remote_filename: str) -> str:
         """
         Uploads a single file using rclone and returns a shareable link.
@@ -49,17 +90,16 @@ class RcloneUploader(BaseUploader):
         remote_target = f"{remote_name}:{remote_folder}"
         full_remote_path = f"{remote_target}/{remote_filename}"
 
-        if not _is_rclone_configured(remote_name):
-            log.warning(f"⚠️ Rclone remote '{remote_name}' is not configured.")
-            _open_rclone_config()
-            raise RuntimeError(
-                f"Rclone remote '{remote_name}' was not configured. Run 'rclone config' and restart the application"
-            )
+        self._ensure_remote_configured(remote_name)
 
-        with log_section(f"☁️ Uploading {local_path.name} to {remote_target}..."):
+        with log_section(
+            f"☁️ Uploading {local_path.name} to {remote_target}...",
+            file=remote_filename,
+            size_in_bytes=local_path.stat().st_size,
+        ):
             try:
                 result = subprocess.run(
-                    [rclone_executable, "copy", str(local_path), remote_target],
+                    [rclone_executable, "copyto", str(local_path), full_remote_path],
                     check=True,
                     capture_output=True,
                     text=True,
@@ -77,24 +117,74 @@ class RcloneUploader(BaseUploader):
                 log.error(f"stderr:\n{e.stderr}")
                 raise
 
-        with log_section("🌐 Generating shareable link..."):
+        return self._get_share_link(remote_filename)
+
+    def sync_folder(self, local_dir: Path, remote_dirname: str) -> None:
+        """
+        Syncs a local folder to the remote with a single rclone call, which only uploads changed
+        files and deletes remote files that no longer exist locally.
+        """
+        config = Config.get()
+        remote_target = f"{config.rclone_remote_service}:{config.rclone_remote_upload_dir}"
+        full_remote_path = f"{remote_target}/{remote_dirname}"
+
+        self._ensure_remote_configured(config.rclone_remote_service)
+
+        with log_section(f"☁️ Syncing {local_dir.name} folder to {full_remote_path}..."):
             try:
                 result = subprocess.run(
-                    [rclone_executable, "link", full_remote_path],
+                    [
+                        config.rclone_executable,
+                        "sync",
+                        str(local_dir),
+                        full_remote_path,
+                        f"--exclude=/{PYRAMID_INFO_FILENAME}",
+                    ],
+                    check=True,
                     capture_output=True,
                     text=True,
-                    check=True,
                 )
-                share_url = result.stdout.strip()
+                for line in result.stderr.splitlines():
+                    log.info(line)
+                log.info("✅ Sync complete.")
+            except subprocess.CalledProcessError as e:
+                log.error("❌ Sync failed.")
+                log.error(f"stdout:\n{e.stdout}")
+                log.error(f"stderr:\n{e.stderr}")
+                raise
 
-                # Handle Dropbox
-                if "dropbox.com" in share_url:
-                    # Force raw preview link
-                    share_url = share_url.replace("www.dropbox.com", "dl.dropboxusercontent.com")
-                    share_url = share_url.replace("&dl=0", "")
-                    share_url = share_url.replace("&dl=1", "")
+    def _create_folder_link(self, remote_dirname: str) -> str:
+        """
+        Creates a shareable link of an uploaded folder.
+        """
+        return self._get_share_link(remote_dirname)
 
+    def _get_share_link(self, remote_filename: str) -> str:
+        """
+        Returns a shareable link of an uploaded file or folder. Links are taken from the share
+        link cache if it is enabled.
+        """
+        config = Config.get()
+        remote_name = config.rclone_remote_service
+        remote_folder = config.rclone_remote_upload_dir
+        full_remote_path = f"{remote_name}:{remote_folder}/{remote_filename}"
+        if config.cache_share_links:
+            cached_url = lookup_share_link(remote_name, remote_folder, remote_filename)
+            if cached_url is not None:
+                return cached_url
+
+        with log_section("🌐 Generating shareable link..."):
+            try:
+                result = subprocess.run(
+                    [config.rclone_executable, "link", full_remote_path],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                share_url = to_direct_download_url(result.stdout.strip())
                 log.info(f"🔗 Shareable URL: {share_url}")
+                if config.cache_share_links:
+                    store_share_link(remote_name, remote_folder, remote_filename, share_url)
                 return share_url
             except subprocess.CalledProcessError as e:
                 log.error("❌ Failed to generate shareable link.")
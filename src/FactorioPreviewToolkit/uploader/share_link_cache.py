@@ -0,0 +1,66 @@
+"""
+Persistent map of the share links created for uploaded files.
+
+Every upload overwrites the same remote path, and services like Dropbox keep the share link of a
+path when its file is replaced. Once a link was created, it is stored here, keyed by the remote
+service and the remote path, and later uploads to that path only copy the file.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.structured_logger import log
+
+_lock = threading.Lock()
+
+
+def _load_links() -> dict[str, str]:
+    """
+    Loads the share link map. Returns an empty map if it is missing or broken.
+    """
+    try:
+        with constants.SHARE_LINK_CACHE_FILEPATH.open("r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {path: url for path, url in data.items() if isinstance(url, str)}
+
+
+def _build_key(remote_service: str, remote_folder: Path, remote_filename: str) -> str:
+    """
+    Builds the map key of a remote file, e.g. 'dropbox:FactorioPreviews/nauvis.png'.
+    """
+    return f"{remote_service}:{(remote_folder / remote_filename).as_posix()}"
+
+
+def lookup_share_link(remote_service: str, remote_folder: Path, remote_filename: str) -> str | None:
+    """
+    Returns the stored share link of a remote file, or None if no link was created for it yet.
+    """
+    with _lock:
+        share_url = _load_links().get(_build_key(remote_service, remote_folder, remote_filename))
+    if share_url is not None:
+        log.info(f"🔗 Reusing stored shareable URL: {share_url}")
+    return share_url
+
+
+def store_share_link(
+    remote_service: str, remote_folder: Path, remote_filename: str, share_url: str
+) -> None:
+    """
+    Stores the share link of a remote file. Safe to call from several upload threads at once.
+    """
+    with _lock:
+        links = _load_links()
+        links[_build_key(remote_service, remote_folder, remote_filename)] = share_url
+
+        cache_path = constants.SHARE_LINK_CACHE_FILEPATH
+        temp_path = cache_path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(links, f, indent=2)
+        os.replace(temp_path, cache_path)
@@ -0,0 +1,124 @@
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from threading import BoundedSemaphore, Lock
+
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.structured_logger import (
+    get_logging_indent_level,
+    log,
+    log_section,
+    set_logging_indent,
+)
+from src.FactorioPreviewToolkit.uploader.base_uploader import write_viewer_config_js
+from src.FactorioPreviewToolkit.uploader.factory import get_uploader
+from src.FactorioPreviewToolkit.uploader.png_optimizer import get_png_optimize_process_count
+from src.FactorioPreviewToolkit.uploader.terrain_palette import record_preview_palette_key
+from src.FactorioPreviewToolkit.uploader.upload_manifest import get_published_asset
+
+
+class StreamingUploadSession:
+    """
+    Uploads planet previews while the remaining planets are still being rendered.
+
+    The preview generator submits each planet as soon as its image is in the output folder.
+    Up to upload_max_concurrency uploads run in background threads, while previews are
+    optimized in parallel by the PNG optimizer. The viewer config is
+    rewritten after every upload, so it always lists the links of all planets uploaded so far.
+
+    With skip_unchanged_uploads, the planet names file carries a version derived from the
+    uploaded images, so it is uploaded last. Until then, its previously published link is used.
+    The tile manifest lists the tiles of all planets, so it is uploaded once all of them are done.
+    """
+
+    def __init__(self, factorio_path: Path, planet_names: list[str]):
+        if Config.get().png_palette == "terrain":
+            record_preview_palette_key(factorio_path)
+        self._uploader = get_uploader()
+        self._planet_names = planet_names
+        self._planet_names_link: str | None = None
+        self._tile_manifest_link: str | None = None
+        self._planet_image_links: dict[str, str] = {}
+        self._links_lock = Lock()
+        self._indent_level = get_logging_indent_level()
+        max_concurrency = Config.get().upload_max_concurrency
+        self._upload_slots = BoundedSemaphore(max_concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(max_concurrency, get_png_optimize_process_count()),
+            thread_name_prefix="Upload",
+        )
+        self._futures: list[Future[None]] = []
+        self._is_tiled = self._uploader.prepare_tiles()
+        self._upload_planet_names_last = Config.get().skip_unchanged_uploads
+        if self._upload_planet_names_last:
+            published = get_published_asset(constants.PLANET_NAMES_REMOTE_FILENAME)
+            self._planet_names_link = published[1] if published else None
+        else:
+            self._futures.append(self._executor.submit(self._upload_planet_names))
+
+    def submit(self, planet: str) -> None:
+        """
+        Queues the preview of a planet for upload. Returns immediately.
+        """
+        self._futures.append(self._executor.submit(self._upload_planet, planet))
+
+    def _upload_planet_names(self) -> None:
+        """
+        Uploads the planet names file, which the viewer config links to.
+        """
+        set_logging_indent(self._indent_level)
+        link = self._uploader.upload_planet_names_file()
+        with self._links_lock:
+            self._planet_names_link = link
+            self._write_viewer_config()
+
+    def _upload_planet(self, planet: str) -> None:
+        """
+        Uploads a single planet preview and publishes its link.
+        """
+        set_logging_indent(self._indent_level)
+        link = self._uploader.upload_planet_image(planet, self._upload_slots)
+        with self._links_lock:
+            self._planet_image_links[planet] = link
+            self._write_viewer_config()
+
+    def _write_viewer_config(self) -> None:
+        """
+        Writes the viewer config with the links uploaded so far, in planet list order.
+        Must be called with the links lock held.
+        """
+        if self._planet_names_link is None:
+            return
+        ordered_links = {
+            planet: self._planet_image_links[planet]
+            for planet in self._planet_names
+            if planet in self._planet_image_links
+        }
+        write_viewer_config_js(ordered_links, self._planet_names_link, self._tile_manifest_link)
+
+    def finish(self) -> None:
+        """
+        Waits for all queued uploads. Raises the first upload error, if any.
+        """
+        with log_section("⏳ Waiting for remaining uploads..."):
+            try:
+                for future in self._futures:
+                    future.result()
+                if self._upload_planet_names_last:
+                    self._upload_planet_names()
+                if self._is_tiled:
+                    link = self._uploader.upload_tile_manifest_file()
+                    with self._links_lock:
+                        self._tile_manifest_link = link
+                        self._write_viewer_config()
+            finally:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._uploader.close()
+            log.info(f"✅ All {len(self._planet_image_links)} previews uploaded.")
+
+    def cancel(self) -> None:
+        """
+        Drops queued uploads and waits for the running one, e.g. after rendering failed.
+        """
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._uploader.close()
@@ -0,0 +1,229 @@
+"""
+Fixed palettes for Factorio map previews, built from earlier renders.
+
+Map previews are drawn from a small set of map colors for tiles, resources, water and cliffs,
+which only changes with the Factorio version, the mods and the planet. Instead of a median-cut
+palette per image, every preview is mapped onto the palette of its Factorio version, mod set and
+planet:
+- The first preview of a planet builds the palette from its colors and stores it. If it has more
+  than 256 colors, a median-cut palette of them is stored instead.
+- Every pixel is mapped onto the nearest palette color through a lookup table over all 2^24
+  colors, filled only for the colors the preview contains.
+
+A stored palette never changes, so the same map always encodes to the same bytes.
+Several optimizer processes may build the same palette, so its file is locked while they do.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.FactorioPreviewToolkit.preview_generator.factorio_fingerprint import (
+    get_mod_set_fingerprint,
+)
+from src.FactorioPreviewToolkit.preview_generator.factorio_interface import (
+    get_factorio_version_string,
+)
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.utils import lock_file
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import NDArray
+    from PIL import Image
+
+MAX_PALETTE_COLORS = 256
+
+# Colors whose nearest palette entry is computed at once; bounds the distance matrix
+_NEAREST_COLOR_CHUNK_SIZE = 4096
+
+# Palette key of the previews in the output folder, set by record_preview_palette_key()
+_preview_palette_key: str | None = None
+
+
+def build_palette_key(factorio_version: str | None, mod_set_fingerprint: str) -> str:
+    """
+    Builds the key of the palette used for previews of a Factorio version and mod set.
+    """
+    return f"{factorio_version or 'unknown'}-{mod_set_fingerprint[:12]}"
+
+
+def record_preview_palette_key(factorio_path: Path) -> None:
+    """
+    Records the palette key of the Factorio installation that rendered the previews in the
+    output folder. Previews optimized by this process afterwards use its palette.
+    """
+    global _preview_palette_key
+    _preview_palette_key = build_palette_key(
+        get_factorio_version_string(factorio_path), get_mod_set_fingerprint()
+    )
+
+
+def load_preview_palette_key() -> str | None:
+    """
+    Returns the palette key of the previews in the output folder, or None if it is unknown.
+    """
+    return _preview_palette_key
+
+
+def _get_palette_path(palette_key: str, planet: str) -> Path:
+    """
+    Returns the file that stores the palette of a planet for the given key.
+    Planets are drawn in different colors, so they don't share a palette.
+    """
+    return constants.TERRAIN_PALETTE_DIR / f"{palette_key}-{planet}.json"
+
+
+def _load_palette(palette_path: Path) -> list[int]:
+    """
+    Loads a palette as packed colors. Returns an empty palette if none is stored yet.
+    """
+    try:
+        with palette_path.open("r", encoding="utf-8") as f:
+            colors = json.load(f).get("colors", [])
+        return [_parse_hex_color(color) for color in colors[:MAX_PALETTE_COLORS]]
+    except (OSError, ValueError, AttributeError, TypeError):
+        return []
+
+
+def _save_palette(palette_path: Path, palette: list[int]) -> None:
+    """
+    Stores a palette atomically, as readable '#rrggbb' colors.
+    """
+    temp_path = palette_path.with_suffix(f".{os.getpid()}.tmp")
+    with temp_path.open("w", encoding="utf-8") as f:
+        json.dump({"colors": [_format_hex_color(color) for color in palette]}, f)
+    os.replace(temp_path, palette_path)
+
+
+# Colors are packed like the bytes of an RGBX pixel read as a little-endian uint32: 0x00BBGGRR.
+# That way a whole image is packed by reinterpreting its buffer, without any arithmetic.
+
+
+def _parse_hex_color(color: str) -> int:
+    """
+    Packs a '#rrggbb' color.
+    """
+    red, green, blue = bytes.fromhex(color.removeprefix("#"))
+    return red | green << 8 | blue << 16
+
+
+def _format_hex_color(color: int) -> str:
+    """
+    Formats a packed color as '#rrggbb'.
+    """
+    return f"#{color & 0xFF:02x}{color >> 8 & 0xFF:02x}{color >> 16 & 0xFF:02x}"
+
+
+def _pack_image(image: "Image.Image") -> "NDArray[np.uint32]":
+    """
+    Returns the packed color of every pixel of the image, row by row.
+    """
+    import numpy as np
+
+    packed: NDArray[np.uint32] = np.array(image.convert("RGBX")).view("<u4").reshape(-1)
+    packed &= np.uint32(0x00FFFFFF)
+    return packed
+
+
+def _unpack_colors(packed: "NDArray[np.uint32]") -> "NDArray[np.int32]":
+    """
+    Unpacks packed colors into an (N, 3) array of signed RGB values.
+    """
+    import numpy as np
+
+    channels = packed.astype(np.int32)
+    return np.stack([channels & 0xFF, (channels >> 8) & 0xFF, (channels >> 16) & 0xFF], axis=1)
+
+
+def _get_distinct_colors(packed: "NDArray[np.uint32]") -> "NDArray[np.uint32]":
+    """
+    Returns the distinct packed colors, sorted. Marks them in a table over all 2^24 colors,
+    which is faster than sorting all pixels.
+    """
+    import numpy as np
+
+    seen = np.zeros(1 << 24, dtype=bool)
+    seen[packed] = True
+    distinct: NDArray[np.uint32] = np.flatnonzero(seen).astype(np.uint32)
+    return distinct
+
+
+def build_palette(packed: "NDArray[np.uint32]") -> list[int]:
+    """
+    Builds a palette from packed pixel colors: all of them if they fit, otherwise a median-cut
+    palette of them.
+    """
+    import numpy as np
+    from PIL import Image
+
+    distinct = _get_distinct_colors(packed)
+    if len(distinct) <= MAX_PALETTE_COLORS:
+        return [int(color) for color in distinct]
+
+    rgb = _unpack_colors(packed).astype(np.uint8)
+    image = Image.frombytes("RGB", (len(rgb), 1), rgb.tobytes())
+    quantized = image.quantize(MAX_PALETTE_COLORS, method=Image.Quantize.MEDIANCUT)
+    channels = (quantized.getpalette() or [])[: MAX_PALETTE_COLORS * 3]
+    return sorted(
+        {red | green << 8 | blue << 16 for red, green, blue in zip(*[iter(channels)] * 3)}
+    )
+
+
+def map_to_palette(packed: "NDArray[np.uint32]", palette: list[int]) -> "NDArray[np.uint8]":
+    """
+    Maps packed pixel colors onto the nearest palette colors and returns the palette index of
+    every pixel. The palette must not be empty.
+    """
+    import numpy as np
+
+    distinct = _get_distinct_colors(packed)
+    palette_rgb = _unpack_colors(np.array(palette, dtype=np.uint32))
+    # A lookup table over all 2^24 colors turns the mapping into a single gather
+    lookup_table = np.zeros(1 << 24, dtype=np.uint8)
+    for start in range(0, len(distinct), _NEAREST_COLOR_CHUNK_SIZE):
+        colors = distinct[start : start + _NEAREST_COLOR_CHUNK_SIZE]
+        differences = _unpack_colors(colors)[:, None, :] - palette_rgb[None, :, :]
+        distances = (differences * differences).sum(axis=2)
+        lookup_table[colors] = distances.argmin(axis=1).astype(np.uint8)
+    indices: NDArray[np.uint8] = lookup_table[packed]
+    return indices
+
+
+def _load_or_build_palette(palette_path: Path, packed: "NDArray[np.uint32]") -> list[int]:
+    """
+    Returns the stored palette, or builds it from the preview's colors and stores it.
+    """
+    with lock_file(palette_path.with_suffix(".lock")):
+        palette = _load_palette(palette_path)
+        if not palette:
+            palette = build_palette(packed)
+            _save_palette(palette_path, palette)
+    return palette
+
+
+def quantize_with_terrain_palette(path: Path, palette_key: str) -> None:
+    """
+    Re-encodes a preview as a palette PNG with the fixed palette of its Factorio version, mod set
+    and planet, with maximum lossless compression. The first preview of a planet builds the
+    palette.
+    """
+    from PIL import Image
+
+    with Image.open(path) as img:
+        width, height = img.size
+        packed = _pack_image(img)
+
+    palette = _load_or_build_palette(_get_palette_path(palette_key, path.stem), packed)
+    indices = map_to_palette(packed, palette)
+
+    quantized = Image.frombytes("P", (width, height), indices.tobytes())
+    quantized.putpalette(
+        bytes(
+            channel
+            for color in palette
+            for channel in (color & 0xFF, (color >> 8) & 0xFF, (color >> 16) & 0xFF)
+        )
+    )
+    quantized.save(path, optimize=True, compress_level=9)
@@ -0,0 +1,251 @@
+"""
+Slices previews into tile pyramids, so the viewer only loads what is visible.
+
+Level 0 of a pyramid fits into a single tile; every further level doubles the resolution, up to
+the full preview at the last level. Tiles are written to previews/tiles/<planet>/<level>/ and
+listed in tile manifests. A manifest holds the URL of the tiles folder and maps every planet to
+its levels and tile paths inside that folder:
+- local_tile_manifest.js points to the tiles on disk, for the local viewer.
+- remote_tile_manifest.json points to the uploaded tiles folder and is uploaded for the shared viewer.
+"""
+
+import json
+import math
+import os
+import shutil
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from threading import Lock
+from typing import Any
+
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+
+# Marks a tile folder as complete and records what it was built from
+PYRAMID_INFO_FILENAME = "pyramid.json"
+
+# URL of the tiles folder as seen from the local viewer
+_LOCAL_TILES_BASE_URL = "../previews/tiles"
+
+_manifest_lock = Lock()
+
+
+@dataclass(frozen=True)
+class TileLevel:
+    """
+    Size of one pyramid level in pixels and in tiles.
+    """
+
+    width: int
+    height: int
+    columns: int
+    rows: int
+
+
+@dataclass(frozen=True)
+class TilePyramid:
+    """
+    Layout of the tiles of a planet preview. Level 0 is the smallest level.
+    """
+
+    planet: str
+    tile_size: int
+    levels: tuple[TileLevel, ...]
+
+    def iter_tiles(self) -> Iterator[tuple[int, int, int]]:
+        """
+        Yields (level, column, row) of every tile, level by level and row by row.
+        """
+        for level_index, level in enumerate(self.levels):
+            for row in range(level.rows):
+                for column in range(level.columns):
+                    yield level_index, column, row
+
+    def get_directory(self) -> Path:
+        """
+        Returns the local folder holding the tiles of the planet.
+        """
+        return constants.PREVIEW_TILES_DIR / self.planet
+
+    def get_tile_path(self, level: int, column: int, row: int) -> Path:
+        """
+        Returns the local path of a tile.
+        """
+        return self.get_directory() / str(level) / f"{column}_{row}.png"
+
+    def get_tile_folder_path(self, level: int, column: int, row: int) -> str:
+        """
+        Returns the path of a tile relative to the tiles folder, as listed in tile manifests.
+        """
+        return f"{self.planet}/{level}/{column}_{row}.png"
+
+    def build_manifest_entry(self) -> dict[str, Any]:
+        """
+        Builds the manifest entry of the planet.
+        """
+        remaining_paths = (self.get_tile_folder_path(*tile) for tile in self.iter_tiles())
+        return {
+            "tileSize": self.tile_size,
+            "width": self.levels[-1].width,
+            "height": self.levels[-1].height,
+            "levels": [
+                {
+                    "width": level.width,
+                    "height": level.height,
+                    "columns": level.columns,
+                    "rows": level.rows,
+                    "tiles": [next(remaining_paths) for _ in range(level.columns * level.rows)],
+                }
+                for level in self.levels
+            ],
+        }
+
+
+def _build_levels(width: int, height: int, tile_size: int) -> tuple[TileLevel, ...]:
+    """
+    Computes the level sizes of a pyramid, from the single-tile level up to the full size.
+    """
+    level_count = max(0, math.ceil(math.log2(max(width, height) / tile_size))) + 1
+    levels = []
+    for level in range(level_count):
+        divisor = 2 ** (level_count - 1 - level)
+        level_width, level_height = -(-width // divisor), -(-height // divisor)
+        levels.append(
+            TileLevel(
+                width=level_width,
+                height=level_height,
+                columns=-(-level_width // tile_size),
+                rows=-(-level_height // tile_size),
+            )
+        )
+    return tuple(levels)
+
+
+def load_tile_pyramid(planet: str, tile_size: int, source_hash: str) -> TilePyramid | None:
+    """
+    Returns the tiles already on disk if they were built with the same tile size from a preview
+    with the given content hash, otherwise None.
+    """
+    info_path = constants.PREVIEW_TILES_DIR / planet / PYRAMID_INFO_FILENAME
+    try:
+        with info_path.open("r", encoding="utf-8") as f:
+            info = json.load(f)
+        if info["source_hash"] != source_hash or info["tile_size"] != tile_size:
+            return None
+        return TilePyramid(
+            planet, tile_size, _build_levels(info["width"], info["height"], tile_size)
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def build_tile_pyramid(
+    planet: str, image_path: Path, tile_size: int, source_hash: str | None = None
+) -> TilePyramid:
+    """
+    Slices a preview into a tile pyramid and replaces the planet's previous tiles.
+    Tiles of a palette image share its palette. Lower levels are box-filtered from the level
+    above and mapped back onto that palette.
+    The planet's entry in the local tile manifest is updated.
+    """
+    from PIL import Image
+
+    planet_dir = constants.PREVIEW_TILES_DIR / planet
+    temp_dir = constants.PREVIEW_TILES_DIR / f".{planet}.tmp"
+    shutil.rmtree(temp_dir, ignore_errors=True)
+
+    with Image.open(image_path) as img:
+        img.load()
+        size: tuple[int, int] = img.size
+        pyramid = TilePyramid(planet, tile_size, _build_levels(*size, tile_size))
+
+        # Full size first, then halve the size for each lower level
+        level_image = img
+        scaled_image = img.convert("RGB")
+        for level in reversed(range(len(pyramid.levels))):
+            if level != len(pyramid.levels) - 1:
+                scaled_image = scaled_image.reduce(2)
+                level_image = scaled_image
+                if img.mode == "P":
+                    level_image = scaled_image.quantize(palette=img, dither=Image.Dither.NONE)
+
+            level_dir = temp_dir / str(level)
+            level_dir.mkdir(parents=True)
+            for row in range(pyramid.levels[level].rows):
+                for column in range(pyramid.levels[level].columns):
+                    left, top = column * tile_size, row * tile_size
+                    tile = level_image.crop(
+                        (
+                            left,
+                            top,
+                            min(left + tile_size, level_image.width),
+                            min(top + tile_size, level_image.height),
+                        )
+                    )
+                    # Maximum compression takes about 20 times as long for 10 % smaller tiles
+                    tile.save(level_dir / f"{column}_{row}.png", compress_level=6)
+
+    with (temp_dir / PYRAMID_INFO_FILENAME).open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "source_hash": source_hash,
+                "tile_size": tile_size,
+                "width": size[0],
+                "height": size[1],
+            },
+            f,
+        )
+    shutil.rmtree(planet_dir, ignore_errors=True)
+    os.replace(temp_dir, planet_dir)
+
+    record_tile_manifest_entry(
+        constants.TILE_MANIFEST_LOCAL_VIEWER_FILEPATH,
+        _LOCAL_TILES_BASE_URL,
+        planet,
+        pyramid.build_manifest_entry(),
+    )
+    return pyramid
+
+
+def _load_tile_manifest(path: Path) -> dict[str, Any]:
+    """
+    Loads the planets of a JSON or JS tile manifest. Returns no planets if it is missing or broken.
+    """
+    try:
+        text = path.read_text(encoding="utf-8")
+        # The JS version wraps the JSON object in a variable declaration
+        data = json.loads(text[text.index("{") : text.rindex("}") + 1])
+    except (OSError, ValueError):
+        return {}
+    planets = data.get("planets") if isinstance(data, dict) else None
+    return planets if isinstance(planets, dict) else {}
+
+
+def record_tile_manifest_entry(
+    path: Path, base_url: str, planet: str, entry: dict[str, Any]
+) -> None:
+    """
+    Adds or replaces the entry of a planet in a tile manifest and sets the URL of the tiles
+    folder. A '.js' manifest is written as a script that defines `tileManifest`, anything else
+    as JSON. Safe to call from several upload threads at once.
+    """
+    with _manifest_lock:
+        planets = _load_tile_manifest(path)
+        planets[planet] = entry
+        content = json.dumps({"baseUrl": base_url, "planets": planets}, indent=2)
+        if path.suffix == ".js":
+            content = f"const tileManifest = {content};\n"
+
+        temp_path = path.with_suffix(".tmp")
+        temp_path.write_text(content, encoding="utf-8")
+        os.replace(temp_path, path)
+
+
+def clear_tiles() -> None:
+    """
+    Removes all tiles and tile manifests, so viewers load single previews again.
+    """
+    with _manifest_lock:
+        shutil.rmtree(constants.PREVIEW_TILES_DIR, ignore_errors=True)
+        constants.TILE_MANIFEST_LOCAL_VIEWER_FILEPATH.unlink(missing_ok=True)
+        constants.TILE_MANIFEST_REMOTE_VIEWER_FILEPATH.unlink(missing_ok=True)
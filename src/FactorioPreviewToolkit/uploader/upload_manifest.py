@@ -0,0 +1,111 @@
+"""
+Persistent manifest of the assets published to each upload target.
+
+For every uploaded file it records the content hash and the resulting link, per remote.
+With skip_unchanged_uploads enabled, a file whose content matches the manifest entry is not
+uploaded again; its recorded link is reused. The planet names file carries a version derived
+from the published image hashes, so the viewer can tell when images changed.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+
+_lock = threading.Lock()
+
+
+def _get_remote_key() -> str:
+    """
+    Identifies the upload target of the current config, e.g. 'dropbox:FactorioPreviews'.
+    Both rclone methods upload to the same target and share its entries.
+    """
+    config = Config.get()
+    if config.upload_method in ("rclone", "rclone_daemon"):
+        return f"{config.rclone_remote_service}:{config.rclone_remote_upload_dir.as_posix()}"
+    if config.upload_method == "local_sync":
+        return f"local_sync:{config.local_sync_target_dir.as_posix()}"
+    return config.upload_method
+
+
+def _load_manifest() -> dict[str, dict[str, dict[str, str]]]:
+    """
+    Loads the manifest. Returns an empty manifest if it is missing or broken.
+    """
+    try:
+        with constants.UPLOAD_MANIFEST_FILEPATH.open("r", encoding="utf-8") as f:
+            data: Any = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict):
+        return {}
+    return {
+        remote: {
+            filename: entry
+            for filename, entry in assets.items()
+            if isinstance(entry, dict) and {"sha256", "url"} <= entry.keys()
+        }
+        for remote, assets in data.items()
+        if isinstance(assets, dict)
+    }
+
+
+def hash_file(path: Path) -> str:
+    """
+    Returns the SHA-256 hex digest of a file's content.
+    """
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_published_asset(remote_filename: str) -> tuple[str, str] | None:
+    """
+    Returns the content hash and link of a file published to the current target,
+    or None if it was never uploaded there.
+    """
+    with _lock:
+        entry = _load_manifest().get(_get_remote_key(), {}).get(remote_filename)
+    if entry is None:
+        return None
+    return entry["sha256"], entry["url"]
+
+
+def record_published_asset(remote_filename: str, content_hash: str, url: str) -> None:
+    """
+    Records an uploaded file. Safe to call from several upload threads at once.
+    """
+    with _lock:
+        manifest = _load_manifest()
+        manifest.setdefault(_get_remote_key(), {})[remote_filename] = {
+            "sha256": content_hash,
+            "url": url,
+        }
+
+        manifest_path = constants.UPLOAD_MANIFEST_FILEPATH
+        temp_path = manifest_path.with_suffix(".tmp")
+        with temp_path.open("w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, manifest_path)
+
+
+def build_assets_version(remote_filenames: list[str]) -> str:
+    """
+    Derives a short version string from the published hashes of the given files.
+    It changes whenever one of them was uploaded with new content.
+    """
+    digest = hashlib.sha256()
+    for remote_filename in remote_filenames:
+        published = get_published_asset(remote_filename)
+        digest.update(remote_filename.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update((published[0] if published else "").encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:12]
@@ -0,0 +1,78 @@
+"""
+Long-lived worker process that runs preview generation and upload jobs.
+
+All modules the jobs need are imported and initialized and the config is loaded once at startup,
+before the worker reports ready, so a job doesn't pay the Python startup and import cost.
+Jobs arrive on stdin (see protocol.py).
+The worker exits when stdin is closed. A job is canceled by killing the worker's process tree;
+the controller then starts a fresh worker.
+"""
+
+import sys
+from collections.abc import Callable, Sequence
+from pathlib import Path
+
+from src.FactorioPreviewToolkit.preview_generator.__main__ import main as generator_main
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.structured_logger import log, log_section, set_trace_file
+from src.FactorioPreviewToolkit.uploader.__main__ import main as uploader_main
+from src.FactorioPreviewToolkit.worker.protocol import (
+    JOB_DONE_PREFIX,
+    JOB_FAILED,
+    JOB_SUCCEEDED,
+    READY_LINE,
+    decode_job,
+)
+
+_STAGES: dict[str, Callable[[Sequence[str]], None]] = {
+    "preview_generator": generator_main,
+    "uploader": uploader_main,
+}
+
+
+def _run_job(line: str) -> str:
+    """
+    Runs a single job and returns its status. Failures are logged by the stage itself.
+    """
+    try:
+        stage, args, trace_file = decode_job(line)
+        set_trace_file(Path(trace_file) if trace_file else None)
+        _STAGES[stage](args)
+    except (Exception, SystemExit) as e:
+        log.error(f"❌ Worker job failed: {e!r}")
+        return JOB_FAILED
+    finally:
+        set_trace_file(None)
+    return JOB_SUCCEEDED
+
+
+def _preload_modules() -> None:
+    """
+    Imports and initializes Pillow with its image plugins, which jobs otherwise load on first
+    use. The generator and uploader modules are already imported with their entry points above.
+    Sounds are only played by the controller, so the worker never starts the pygame mixer.
+    """
+    from PIL import Image
+
+    Image.init()
+
+
+def main() -> None:
+    """
+    Preloads the config and all modules jobs need, then runs jobs from stdin until it is closed.
+    """
+    with log_section("🚀 Worker started. Preloading config and modules..."):
+        Config.get()
+        _preload_modules()
+    print(READY_LINE, flush=True)
+
+    for line in sys.stdin:
+        if line.strip():
+            status = _run_job(line)
+            print(f"{JOB_DONE_PREFIX}{status}", flush=True)
+
+    log.info("👋 Worker exited.")
+
+
+if __name__ == "__main__":
+    main()
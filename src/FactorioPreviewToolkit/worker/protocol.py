@@ -0,0 +1,39 @@
+"""
+Line-based protocol between the controller and the warm worker process.
+
+Jobs are sent to the worker's stdin as one JSON object per line. The worker streams the
+regular log output of a job to stdout and ends it with a status line, so the controller
+knows when the job is done without the process having to exit.
+"""
+
+import json
+from typing import Literal
+
+Stage = Literal["preview_generator", "uploader"]
+
+READY_LINE = "@@WORKER-READY"
+JOB_DONE_PREFIX = "@@JOB-DONE "
+JOB_SUCCEEDED = "success"
+JOB_FAILED = "failed"
+
+
+def encode_job(stage: Stage, args: list[str], trace_file: str | None = None) -> str:
+    """
+    Encodes a job as a single line for the worker's stdin.
+    With a trace file, the worker records the sections of the job into it.
+    """
+    return json.dumps({"stage": stage, "args": args, "trace_file": trace_file}) + "\n"
+
+
+def decode_job(line: str) -> tuple[str, list[str], str | None]:
+    """
+    Decodes a job line into stage, args and trace file.
+    Raises ValueError if the line is not a valid job.
+    """
+    job = json.loads(line)
+    stage, args, trace_file = job.get("stage"), job.get("args"), job.get("trace_file")
+    if not isinstance(stage, str) or not isinstance(args, list):
+        raise ValueError(f"Invalid job: {line!r}")
+    if trace_file is not None and not isinstance(trace_file, str):
+        raise ValueError(f"Invalid job: {line!r}")
+    return stage, [str(arg) for arg in args], trace_file
@@ -0,0 +1,93 @@
+"""
+Benchmarks the idle cost of the clipboard monitor: X11 change events against polling.
+
+Run it inside an X11 session, or a virtual one, with xclip or xsel installed:
+    xvfb-run -a python -m toolkit_build.benchmark_clipboard_monitor
+
+Each mode monitors the clipboard for the given time while a large non-map text is on it, then a map
+exchange string is copied and the time until the monitor reports it is measured. CPU time includes
+the helper processes the poller starts. Wakeups are context switches of this process, which sleeps
+in a single call meanwhile. Both are extrapolated to one hour.
+
+Usage:
+    python -m toolkit_build.benchmark_clipboard_monitor [--duration SEC] [--interval SEC]
+        [--text-size BYTES]
+"""
+
+import argparse
+import threading
+import time
+
+import psutil
+import pyperclip
+
+from src.FactorioPreviewToolkit.map_string_provider import clipboard_provider
+from src.FactorioPreviewToolkit.map_string_provider.clipboard_provider import (
+    ClipboardMapStringProvider,
+)
+from src.FactorioPreviewToolkit.shared.config import Config
+
+_is_x11_available = clipboard_provider.is_x11_available
+
+
+def _get_cpu_time(process: psutil.Process) -> float:
+    """
+    Returns the CPU time of the process and its finished child processes in seconds.
+    """
+    times = process.cpu_times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _run(mode: str, args: argparse.Namespace) -> None:
+    """
+    Measures the idle cost and the detection latency of one mode and prints the results.
+    """
+    clipboard_provider.is_x11_available = _is_x11_available if mode == "x11" else lambda: False
+    pyperclip.copy("x" * args.text_size)
+
+    received = threading.Event()
+    provider = ClipboardMapStringProvider(lambda _: received.set())
+    provider.start()
+    time.sleep(1)
+
+    process = psutil.Process()
+    cpu_before = _get_cpu_time(process)
+    switches_before = sum(process.num_ctx_switches())
+    time.sleep(args.duration)
+    cpu_per_hour = (_get_cpu_time(process) - cpu_before) * 3600 / args.duration
+    wakeups_per_hour = (sum(process.num_ctx_switches()) - switches_before) * 3600 / args.duration
+
+    start_time = time.perf_counter()
+    pyperclip.copy(f">>>eNbenchmark{mode}<<<")
+    latency = (time.perf_counter() - start_time) * 1000 if received.wait(5) else float("nan")
+    provider.stop()
+
+    print(
+        f"  {mode:<8} {cpu_per_hour:8.2f} CPU s/h {wakeups_per_hour:10.0f} wakeups/h"
+        f" {latency:9.1f} ms to detect a copy"
+    )
+
+
+def main() -> None:
+    """
+    Runs the measurement for the X11 monitor and the poller.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--duration", type=float, default=30, help="Idle time per mode.")
+    parser.add_argument("--interval", type=float, default=0.5, help="Poll interval in seconds.")
+    parser.add_argument(
+        "--text-size", type=int, default=1024 * 1024, help="Size of the idle clipboard text."
+    )
+    args = parser.parse_args()
+
+    Config._instance = Config.get().model_copy(
+        update={"map_exchange_input_poll_interval_in_seconds": args.interval}
+    )
+    modes = ["x11", "polling"] if _is_x11_available() else ["polling"]
+    print(f"\n{args.duration}s idle with {args.text_size} bytes on the clipboard")
+    for mode in modes:
+        _run(mode, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Benchmarks how fast FileMapStringProvider reports map exchange strings written to its file.
+
+Map strings are written to a temporary file in three ways:
+- in_place – open the file, truncate it and write the string.
+- rename   – write a temporary file next to it and rename it onto the file, like editors do.
+- truncate – truncate the file, flush, then write the string with a second open.
+Each write is timed until the provider calls back. Both the inotify watcher and the polling
+fallback are measured. While idle, the number of file reads per second is counted.
+
+With --max-latency, exits with status 1 if a write is missed or reported later than that many
+milliseconds. The polling fallback gets one poll interval on top.
+
+Usage:
+    python -m toolkit_build.benchmark_file_monitor [--writes N] [--interval SEC] [--idle SEC]
+                                                   [--max-latency MS]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+from src.FactorioPreviewToolkit.map_string_provider import file_provider
+from src.FactorioPreviewToolkit.map_string_provider.file_provider import FileMapStringProvider
+from src.FactorioPreviewToolkit.shared.config import Config
+
+
+def _write_in_place(path: Path, text: str) -> None:
+    """
+    Overwrites the file with a single open.
+    """
+    path.write_text(text, encoding="utf-8")
+
+
+def _write_by_rename(path: Path, text: str) -> None:
+    """
+    Writes a temporary file and renames it onto the file.
+    """
+    temp_path = path.with_suffix(".tmp")
+    temp_path.write_text(text, encoding="utf-8")
+    os.replace(temp_path, path)
+
+
+def _write_after_truncate(path: Path, text: str) -> None:
+    """
+    Empties the file first and writes the text with a second open.
+    """
+    with path.open("w", encoding="utf-8") as f:
+        f.flush()
+    with path.open("a", encoding="utf-8") as f:
+        f.write(text)
+
+
+_is_inotify_available = file_provider.is_inotify_available
+
+_WRITERS = {
+    "in_place": _write_in_place,
+    "rename": _write_by_rename,
+    "truncate": _write_after_truncate,
+}
+
+
+def _run(mode: str, args: argparse.Namespace, path: Path) -> int:
+    """
+    Measures all writers with inotify or with polling and prints the results.
+    Returns the number of writes that were missed or exceeded --max-latency.
+    """
+    file_provider.is_inotify_available = (
+        _is_inotify_available if mode == "inotify" else lambda: False
+    )
+    path.write_text("", encoding="utf-8")
+
+    received = threading.Event()
+    provider = FileMapStringProvider(lambda _: received.set())
+    reads = [0]
+    original_check_file = provider._check_file
+
+    def counting_check_file(force_read: bool) -> Any:
+        before = provider._last_signature
+        original_check_file(force_read)
+        if force_read or provider._last_signature != before:
+            reads[0] += 1
+
+    provider._check_file = counting_check_file  # type: ignore[method-assign]
+    provider.start()
+    time.sleep(0.2)
+
+    max_latency = None
+    if args.max_latency is not None:
+        max_latency = args.max_latency + (args.interval * 1000 if mode == "polling" else 0)
+    failures = 0
+
+    try:
+        for writer_name, writer in _WRITERS.items():
+            latencies = []
+            for index in range(args.writes):
+                received.clear()
+                # Writes arrive at a random point of the poll cycle
+                time.sleep(random.uniform(0, args.interval))
+                text = f">>>eN{mode}{writer_name.replace('_', '')}{index}<<<"
+                start_time = time.perf_counter()
+                writer(path, text)
+                if not received.wait(timeout=args.interval * 4 + 1):
+                    print(f"  {mode:<8} {writer_name:<9} missed write {index}")
+                    failures += 1
+                    continue
+                latency = (time.perf_counter() - start_time) * 1000
+                if max_latency is not None and latency > max_latency:
+                    print(
+                        f"  {mode:<8} {writer_name:<9} write {index} took {latency:.2f} ms,"
+                        f" more than {max_latency:.2f} ms"
+                    )
+                    failures += 1
+                latencies.append(latency)
+            if latencies:
+                print(
+                    f"  {mode:<8} {writer_name:<9} median {statistics.median(latencies):7.2f} ms"
+                    f"   max {max(latencies):7.2f} ms   ({len(latencies)}/{args.writes})"
+                )
+
+        reads[0] = 0
+        time.sleep(args.idle)
+        print(f"  {mode:<8} idle      {reads[0] / args.idle:7.2f} file reads per second")
+    finally:
+        provider.stop()
+    return failures
+
+
+def main() -> None:
+    """
+    Runs the latency measurement for the inotify watcher and the polling fallback.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writes", type=int, default=20, help="Writes per writer and mode.")
+    parser.add_argument("--interval", type=float, default=0.5, help="Poll interval in seconds.")
+    parser.add_argument("--idle", type=float, default=3, help="Idle time in seconds.")
+    parser.add_argument(
+        "--max-latency",
+        type=float,
+        help="Fail if a write is reported later than this (ms), plus one poll interval for polling.",
+    )
+    args = parser.parse_args()
+
+    modes = ["inotify", "polling"] if _is_inotify_available() else ["polling"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "map_string.txt"
+        Config._instance = Config.get().model_copy(
+            update={
+                "file_monitor_filepath": path,
+                "map_exchange_input_poll_interval_in_seconds": args.interval,
+            }
+        )
+        print(f"\n{args.writes} writes per writer, poll interval {args.interval}s")
+        failures = sum(_run(mode, args, path) for mode in modes)
+
+    if args.max_latency is not None:
+        print(f"\n{failures} writes missed or over the latency bound.")
+        sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measures the import time of every process mode of the toolkit with `python -X importtime`.
+
+Each mode is imported in a fresh interpreter several times. The fastest run is reported,
+together with the heaviest packages the toolkit modules import directly. Run it before and
+after changes that touch imports, so startup regressions show up.
+
+Usage:
+    python -m toolkit_build.benchmark_imports [--runs N] [--top N]
+"""
+
+import argparse
+import subprocess
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+# Module that is imported at startup of each process mode
+MODES = {
+    "controller": "src.FactorioPreviewToolkit.controller.controller",
+    "preview_generator": "src.FactorioPreviewToolkit.preview_generator.__main__",
+    "uploader": "src.FactorioPreviewToolkit.uploader.__main__",
+    "worker": "src.FactorioPreviewToolkit.worker.__main__",
+}
+
+
+def _measure_import(module: str) -> tuple[int, dict[str, int]]:
+    """
+    Imports the module in a fresh interpreter. Returns the total import time of the toolkit
+    modules and the time spent in each third-party or standard library package they import
+    directly, both in microseconds.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    # Lines look like "import time:  self |  cumulative |   package.module", indented by
+    # two spaces per nesting level. They are printed after all imports they triggered.
+    total = 0
+    external_imports: dict[str, int] = {}
+    pending_children: dict[int, list[tuple[str, int]]] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_text, raw_name = line[len("import time:") :].split("|")
+        name, cumulative = raw_name.strip(), int(cumulative_text)
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+
+        for child, child_cumulative in pending_children.pop(depth + 1, []):
+            if name.startswith("src") and not child.startswith("src"):
+                package = child.split(".")[0]
+                external_imports[package] = external_imports.get(package, 0) + child_cumulative
+        pending_children.setdefault(depth, []).append((name, cumulative))
+
+        if depth == 0 and name.startswith("src"):
+            total += cumulative
+    return total, external_imports
+
+
+def main() -> None:
+    """
+    Prints the import time of each mode and its heaviest direct imports.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="Imports per mode, fastest is kept.")
+    parser.add_argument("--top", type=int, default=5, help="Heaviest imports listed per mode.")
+    args = parser.parse_args()
+
+    for mode, module in MODES.items():
+        try:
+            runs = [_measure_import(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(f"{mode:<20} FAILED: {e}")
+            continue
+
+        total, external_imports = min(runs, key=lambda run: run[0])
+        print(f"{mode:<20} {total / 1000:8.1f} ms")
+        heaviest = sorted(external_imports.items(), key=lambda item: item[1], reverse=True)
+        for package, cumulative in heaviest[: args.top]:
+            print(f"    {cumulative / 1000:8.1f} ms  {package}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmarks PNG optimization of previews, serially and in the PNG optimizer process pool.
+
+Synthetic previews with blocky, terrain-like areas are written to a temporary folder. They are
+optimized one after another in this process, then with the pool at every process count.
+Peak memory of this process and all its children is sampled while each run is in progress, and
+the pool must produce the same total output size as the serial run.
+
+Usage:
+    python -m toolkit_build.benchmark_png_optimizer [--planets N] [--size PX] [--processes 2 4 ...]
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import psutil
+from PIL import Image
+
+from src.FactorioPreviewToolkit.uploader.png_optimizer import PngOptimizerPool, optimize_png
+
+
+def _write_synthetic_previews(directory: Path, planet_names: list[str], size: int) -> None:
+    """
+    Writes previews made of randomly colored blocks, similar to terrain areas on a map preview.
+    """
+    rng = random.Random(0)
+    blocks = max(1, size // 24)
+    for planet in planet_names:
+        block_image = Image.frombytes("RGB", (blocks, blocks), rng.randbytes(blocks * blocks * 3))
+        block_image.resize((size, size), Image.Resampling.NEAREST).save(directory / f"{planet}.png")
+
+
+def _measure(run: Callable[[], None]) -> tuple[float, int]:
+    """
+    Runs the function and returns its wall time and the peak memory of this process tree.
+    """
+    process = psutil.Process()
+    peak_memory = 0
+    done = threading.Event()
+
+    def sample_memory() -> None:
+        nonlocal peak_memory
+        while not done.wait(0.02):
+            total = process.memory_info().rss
+            for child in process.children(recursive=True):
+                try:
+                    total += child.memory_info().rss
+                except psutil.Error:
+                    pass
+            peak_memory = max(peak_memory, total)
+
+    sampler = threading.Thread(target=sample_memory, daemon=True)
+    sampler.start()
+    start_time = time.perf_counter()
+    try:
+        run()
+    finally:
+        elapsed = time.perf_counter() - start_time
+        done.set()
+        sampler.join()
+    return elapsed, peak_memory
+
+
+def main() -> None:
+    """
+    Optimizes the same synthetic previews serially and with each pool size and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--planets", type=int, default=5)
+    parser.add_argument("--size", type=int, default=3072, help="Preview size in pixels.")
+    parser.add_argument("--processes", type=int, nargs="+", default=[os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    planet_names = [f"planet{index}" for index in range(args.planets)]
+    results: list[tuple[str, float, int]] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = Path(temp_dir) / "source"
+        work_dir = Path(temp_dir) / "work"
+        source_dir.mkdir()
+        work_dir.mkdir()
+        _write_synthetic_previews(source_dir, planet_names, args.size)
+        paths = [work_dir / f"{planet}.png" for planet in planet_names]
+
+        def reset_previews() -> None:
+            for planet in planet_names:
+                shutil.copyfile(source_dir / f"{planet}.png", work_dir / f"{planet}.png")
+
+        def optimize_serially() -> None:
+            for path in paths:
+                optimize_png(path)
+
+        reset_previews()
+        elapsed, peak_memory = _measure(optimize_serially)
+        results.append(("serial", elapsed, peak_memory))
+        optimized_size = sum(path.stat().st_size for path in paths)
+
+        for processes in args.processes:
+            reset_previews()
+            # Worker processes start on the first job, so their startup is measured, as in an upload
+            pool = PngOptimizerPool(processes)
+
+            def optimize_in_pool() -> None:
+                with ThreadPoolExecutor(max_workers=processes) as executor:
+                    list(executor.map(pool.optimize, paths))
+
+            try:
+                elapsed, peak_memory = _measure(optimize_in_pool)
+            finally:
+                pool.close()
+            results.append((f"pool x{processes}", elapsed, peak_memory))
+            assert sum(path.stat().st_size for path in paths) == optimized_size
+
+    print(f"\n{args.planets} previews of {args.size}px, {os.cpu_count()} CPU cores")
+    baseline = results[0][1]
+    for name, elapsed, peak_memory in results:
+        print(
+            f"  {name:<10} {elapsed:7.2f}s  ({baseline / elapsed:4.2f}x)  "
+            f"peak memory {peak_memory // (1024 * 1024):5d} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
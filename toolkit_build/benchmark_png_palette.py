@@ -0,0 +1,104 @@
+"""
+Benchmarks the adaptive palette against the fixed terrain palette for preview optimization.
+
+Synthetic previews are drawn from a fixed set of map colors: large terrain areas, water and small
+resource patches, like real map previews. Each one is optimized with Pillow's adaptive palette and
+with the terrain palette, once building each planet's palette and once reusing it. For every
+method the wall time, the output size and whether the pixels survived unchanged are printed.
+
+Usage:
+    python -m toolkit_build.benchmark_png_palette [--planets N] [--size PX] [--colors N]
+"""
+
+import argparse
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image, ImageDraw
+
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.uploader.png_optimizer import optimize_png
+
+
+def _write_synthetic_preview(path: Path, size: int, colors: list[tuple[int, int, int]]) -> None:
+    """
+    Writes a preview with terrain blocks, round lakes and speckled resource patches.
+    """
+    rng = random.Random(path.stem)
+    blocks = max(1, size // 48)
+    block_pixels = bytes(
+        channel
+        for _ in range(blocks * blocks)
+        for channel in rng.choice(colors[: len(colors) // 2])
+    )
+    image = Image.frombytes("RGB", (blocks, blocks), block_pixels).resize(
+        (size, size), Image.Resampling.NEAREST
+    )
+    draw = ImageDraw.Draw(image)
+    for _ in range(size // 64):
+        x, y, radius = rng.randrange(size), rng.randrange(size), rng.randrange(8, size // 16)
+        draw.ellipse((x - radius, y - radius, x + radius, y + radius), fill=colors[-1])
+    for _ in range(size // 32):
+        x, y = rng.randrange(size), rng.randrange(size)
+        resource_color = rng.choice(colors[len(colors) // 2 : -1])
+        for _ in range(400):
+            draw.point(
+                (x + rng.randrange(-30, 30), y + rng.randrange(-30, 30)), fill=resource_color
+            )
+    image.save(path)
+
+
+def main() -> None:
+    """
+    Optimizes the same synthetic previews with both palettes and prints the results.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--planets", type=int, default=5)
+    parser.add_argument("--size", type=int, default=3072, help="Preview size in pixels.")
+    parser.add_argument("--colors", type=int, default=120, help="Distinct map colors.")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    colors = [
+        (rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(args.colors)
+    ]
+    planet_names = [f"planet{index}" for index in range(args.planets)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = Path(temp_dir) / "source"
+        work_dir = Path(temp_dir) / "work"
+        source_dir.mkdir()
+        work_dir.mkdir()
+        constants.TERRAIN_PALETTE_DIR = Path(temp_dir) / "palettes"
+        for planet in planet_names:
+            _write_synthetic_preview(source_dir / f"{planet}.png", args.size, colors)
+
+        print(f"\n{args.planets} previews of {args.size}px with {args.colors} map colors")
+        print(f"  {'method':<24} {'time':>8} {'size':>10}  lossless")
+        for method, palette_key in (
+            ("adaptive", None),
+            ("terrain", "benchmark"),
+            ("terrain reused", "benchmark"),
+        ):
+            for planet in planet_names:
+                source_path = source_dir / f"{planet}.png"
+                path = work_dir / f"{planet}.png"
+                shutil.copyfile(source_path, path)
+
+                start_time = time.perf_counter()
+                optimize_png(path, palette_key)
+                elapsed = time.perf_counter() - start_time
+
+                with Image.open(source_path) as source, Image.open(path) as optimized:
+                    lossless = source.convert("RGB").tobytes() == optimized.convert("RGB").tobytes()
+                label = f"{method} {planet}"
+                print(
+                    f"  {label:<24} {elapsed:7.2f}s {path.stat().st_size / 1024:8.0f} KB  {lossless}"
+                )
+
+
+if __name__ == "__main__":
+    main()
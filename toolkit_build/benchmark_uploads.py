@@ -0,0 +1,135 @@
+"""
+Benchmarks the concurrent upload engine of BaseUploader at different concurrency levels.
+
+Synthetic previews are written to a temporary folder and uploaded with one of these backends:
+- rclone_local – `rclone copyto` into a local folder, using rclone's local filesystem backend.
+                 Measures the real per-file process overhead of the rclone uploader.
+- local_sync   – a plain file copy, like the local_sync upload method.
+
+Usage:
+    python -m toolkit_build.benchmark_uploads [--backend rclone_local|local_sync]
+        [--rclone PATH] [--planets N] [--size PX] [--concurrency 1 2 4 ...]
+"""
+
+import argparse
+import random
+import shutil
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.shared_constants import constants
+from src.FactorioPreviewToolkit.shared.utils import detect_os, get_supported_architecture
+from src.FactorioPreviewToolkit.uploader.base_uploader import BaseUploader
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class _RcloneLocalUploader(BaseUploader):
+    """
+    Copies files with rclone into a local folder.
+    """
+
+    def __init__(self, rclone_executable: Path, target_dir: Path):
+        self._rclone_executable = rclone_executable
+        self._target_dir = target_dir
+
+    def upload_single(self, local_path: Path, remote_filename: str) -> str:
+        subprocess.run(
+            [
+                str(self._rclone_executable),
+                "copyto",
+                str(local_path),
+                str(self._target_dir / remote_filename),
+            ],
+            check=True,
+            capture_output=True,
+        )
+        return (self._target_dir / remote_filename).as_uri()
+
+
+class _CopyUploader(BaseUploader):
+    """
+    Copies files into a local folder, like LocalSyncUploader.
+    """
+
+    def __init__(self, target_dir: Path):
+        self._target_dir = target_dir
+
+    def upload_single(self, local_path: Path, remote_filename: str) -> str:
+        shutil.copy2(local_path, self._target_dir / remote_filename)
+        return (self._target_dir / remote_filename).as_uri()
+
+
+def _get_bundled_rclone() -> Path:
+    """
+    Returns the path of the bundled rclone binary for this OS and architecture.
+    """
+    os_name = detect_os()
+    binary_name = "rclone.exe" if os_name == "windows" else "rclone"
+    arch = get_supported_architecture()
+    return PROJECT_ROOT / "third_party" / "rclone" / os_name / arch / binary_name
+
+
+def _write_synthetic_previews(directory: Path, planet_names: list[str], size: int) -> None:
+    """
+    Writes noisy RGB previews, which take a realistic effort to quantize and compress.
+    """
+    rng = random.Random(0)
+    for planet in planet_names:
+        image = Image.frombytes("RGB", (size, size), rng.randbytes(size * size * 3))
+        image.save(directory / f"{planet}.png")
+
+
+def main() -> None:
+    """
+    Uploads the same synthetic previews at every concurrency level and prints the wall time.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--backend", choices=["rclone_local", "local_sync"], default="rclone_local")
+    parser.add_argument("--rclone", type=Path, default=None, help="Defaults to the bundled rclone.")
+    parser.add_argument("--planets", type=int, default=5)
+    parser.add_argument("--size", type=int, default=1024, help="Preview size in pixels.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    planet_names = [f"planet{index}" for index in range(args.planets)]
+    results: list[tuple[int, float]] = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source_dir = Path(temp_dir) / "source"
+        preview_dir = Path(temp_dir) / "previews"
+        target_dir = Path(temp_dir) / "target"
+        for directory in (source_dir, preview_dir, target_dir):
+            directory.mkdir()
+        _write_synthetic_previews(source_dir, planet_names, args.size)
+
+        uploader: BaseUploader
+        if args.backend == "rclone_local":
+            uploader = _RcloneLocalUploader(args.rclone or _get_bundled_rclone(), target_dir)
+        else:
+            uploader = _CopyUploader(target_dir)
+
+        # The uploader reads and optimizes the previews in place, so point it at a scratch folder
+        constants.PREVIEWS_OUTPUT_DIR = preview_dir
+        # Every concurrency level must upload all previews again
+        Config._instance = Config.get().model_copy(update={"skip_unchanged_uploads": False})
+        for concurrency in args.concurrency:
+            for planet in planet_names:
+                shutil.copyfile(source_dir / f"{planet}.png", preview_dir / f"{planet}.png")
+            start_time = time.perf_counter()
+            links = uploader.upload_planet_images(planet_names, concurrency)
+            results.append((concurrency, time.perf_counter() - start_time))
+            assert list(links) == planet_names
+
+    print(f"\n{args.backend}: {args.planets} previews of {args.size}px")
+    baseline = results[0][1]
+    for concurrency, elapsed in results:
+        print(f"  concurrency {concurrency:>2}: {elapsed:7.2f}s  ({baseline / elapsed:4.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
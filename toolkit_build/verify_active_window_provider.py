@@ -0,0 +1,110 @@
+"""
+Verifies that the Linux active window provider reports focus changes over X11 right away.
+
+Run it in an X11 session without another program changing the focus, or in a virtual one:
+    xvfb-run -a python -m toolkit_build.verify_active_window_provider
+
+A copy of `sleep` named `factorio` stands in for the game. This script plays the window manager:
+it creates two dummy windows with _NET_WM_PID set to the stand-in and to itself, and switches
+_NET_ACTIVE_WINDOW between them. The poll interval is set far above the expected latency, so a
+detection within it proves that focus changes are received as events.
+
+Usage:
+    python -m toolkit_build.verify_active_window_provider [--switches N]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from src.FactorioPreviewToolkit.factorio_path_provider import linux_active_window_provider
+from src.FactorioPreviewToolkit.factorio_path_provider.linux_active_window_provider import (
+    LinuxActiveWindowProvider,
+)
+from src.FactorioPreviewToolkit.shared.config import Config
+from src.FactorioPreviewToolkit.shared.x11 import X11Connection, is_x11_available
+
+_POLL_INTERVAL_IN_SEC = 60
+
+
+def main() -> None:
+    """
+    Switches the focus between a dummy game window and another window and checks the provider.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--switches", type=int, default=20, help="Focus switches to measure.")
+    args = parser.parse_args()
+
+    if not is_x11_available():
+        print("No X11 display available. Run this script with xvfb-run.")
+        sys.exit(2)
+
+    Config._instance = Config.get().model_copy(
+        update={"factorio_locator_poll_interval_in_seconds": _POLL_INTERVAL_IN_SEC}
+    )
+    sleep_executable = shutil.which("sleep")
+    if sleep_executable is None:
+        print("`sleep` not found.")
+        sys.exit(2)
+
+    with tempfile.TemporaryDirectory() as temp_dir, X11Connection() as window_manager:
+        game_executable = Path(temp_dir) / "factorio"
+        shutil.copy2(sleep_executable, game_executable)
+        game = subprocess.Popen([str(game_executable), str(_POLL_INTERVAL_IN_SEC * 2)])
+        try:
+            active_window_atom = window_manager.intern_atom("_NET_ACTIVE_WINDOW")
+            pid_atom = window_manager.intern_atom("_NET_WM_PID")
+            other_window = window_manager.create_window()
+            game_window = window_manager.create_window()
+            window_manager.set_window_property(other_window, pid_atom, "CARDINAL", os.getpid())
+            window_manager.set_window_property(game_window, pid_atom, "CARDINAL", game.pid)
+
+            def focus(window: int) -> None:
+                window_manager.set_window_property(
+                    window_manager.root, active_window_atom, "WINDOW", window
+                )
+
+            focus(other_window)
+            detected = threading.Event()
+            detected_paths: list[Path] = []
+
+            def on_new_factorio_path(path: Path) -> None:
+                detected_paths.append(path)
+                detected.set()
+
+            provider = LinuxActiveWindowProvider(on_new_factorio_path)
+            provider.start()
+            time.sleep(0.5)
+
+            start_time = time.perf_counter()
+            focus(game_window)
+            if not detected.wait(_POLL_INTERVAL_IN_SEC / 2):
+                print("FAIL: the focus change wasn't detected before the next poll.")
+                sys.exit(1)
+            latency = (time.perf_counter() - start_time) * 1000
+
+            for index in range(args.switches):
+                focus(other_window if index % 2 == 0 else game_window)
+                time.sleep(0.05)
+            provider.stop()
+
+            cache_info = linux_active_window_provider._get_executable_path.cache_info()
+            print(f"Detected {detected_paths[0]} {latency:.1f} ms after the focus change.")
+            print(f"Executable lookups after {args.switches} more switches: {cache_info}")
+            if detected_paths[0].resolve() != game_executable.resolve():
+                print(f"FAIL: expected {game_executable}.")
+                sys.exit(1)
+            print("OK")
+        finally:
+            game.kill()
+            game.wait()
+
+
+if __name__ == "__main__":
+    main()
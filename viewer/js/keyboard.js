@@ -9,6 +9,10 @@ function initKeyboardControls(mapImage, mapContainer, zoomDisplay) {
     handleImageLoad(mapImage, mapContainer, zoomDisplay);
   });
 
+  mapImage.addEventListener("tilesready", () => {
+    handleImageLoad(mapImage, mapContainer, zoomDisplay);
+  });
+
   mapImage.addEventListener("dragstart", e => e.preventDefault());
 
   mapContainer.addEventListener("wheel", e => {
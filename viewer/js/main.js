@@ -4,6 +4,18 @@ const mapContainer = document.getElementById("mapContainer");
 const zoomDisplay = document.getElementById("zoomDisplay");
 const resetBtn = document.getElementById("resetView");
 
+// Version of the uploaded previews, set by the planet names JSON if it provides one
+let assetsVersion = null;
+
+/**
+ * Appends the assets version to an image URL, so changed previews aren't served from cache.
+ */
+function withAssetsVersion(url) {
+  if (!assetsVersion) return url;
+  const separator = url.includes("?") ? "&" : "?";
+  return `${url}${separator}v=${encodeURIComponent(assetsVersion)}`;
+}
+
 /**
  * Dynamically loads a <script> containing `planetNames` variable.
  */
@@ -25,7 +37,7 @@ function loadPlanetNamesFromScript(src) {
     });
   } else {
     // Load as JSON
-    return fetch(src)
+    return fetch(src, { cache: "no-store" })
       .then((res) => {
         if (!res.ok) throw new Error(`Failed to fetch JSON (${res.status})`);
         return res.json();
@@ -34,22 +46,86 @@ function loadPlanetNamesFromScript(src) {
         if (!Array.isArray(data.planets)) {
           throw new Error("Invalid JSON format: expected a 'planets' array.");
         }
+        if (typeof data.version === "string") {
+          assetsVersion = data.version;
+        }
         return data.planets;
       });
   }
 }
 
+/**
+ * Loads the tile manifest as a script defining `tileManifest` or as JSON.
+ * Resolves to null if there is none, so the viewer falls back to single preview images.
+ */
+function loadTileManifest(src) {
+  if (!src) return Promise.resolve(null);
+  if (location.protocol === "file:" || src.endsWith(".js")) {
+    return new Promise((resolve) => {
+      const script = document.createElement("script");
+      script.src = src;
+      script.onload = () => resolve(typeof tileManifest !== "undefined" ? tileManifest : null);
+      script.onerror = () => resolve(null);
+      document.head.appendChild(script);
+    });
+  }
+  return fetch(src, { cache: "no-store" })
+    .then((res) => (res.ok ? res.json() : null))
+    .catch((err) => {
+      console.warn("Could not load tile manifest, showing single previews:", err);
+      return null;
+    });
+}
+
+/**
+ * Appends a relative path to a folder URL, in front of its query string if it has one.
+ */
+function joinUrl(baseUrl, path) {
+  const queryStart = baseUrl.indexOf("?");
+  if (queryStart < 0) return `${baseUrl}/${path}`;
+  return `${baseUrl.slice(0, queryStart)}/${path}${baseUrl.slice(queryStart)}`;
+}
+
+/**
+ * Picks the tile pyramids of the given planets from the tile manifest.
+ * Tile paths are relative to the tiles folder the manifest's base URL points to.
+ */
+function getTilePyramids(manifest, planetNames) {
+  if (!manifest || typeof manifest.baseUrl !== "string" || typeof manifest.planets !== "object") {
+    return {};
+  }
+  return Object.fromEntries(
+    Object.entries(manifest.planets)
+      .filter(([planet]) => planetNames.includes(planet))
+      .map(([planet, pyramid]) => [
+        planet,
+        {
+          ...pyramid,
+          levels: pyramid.levels.map((level) => ({
+            ...level,
+            tiles: level.tiles.map((path) => withAssetsVersion(joinUrl(manifest.baseUrl, path))),
+          })),
+        },
+      ])
+  );
+}
+
 // Main startup logic
-loadPlanetNamesFromScript(viewerConfig.planetNamesSource)
-  .then((planetNames) => {
+Promise.all([
+  loadPlanetNamesFromScript(viewerConfig.planetNamesSource),
+  loadTileManifest(viewerConfig.tileManifestSource),
+])
+  .then(([planetNames, manifest]) => {
     const filteredSources = Object.fromEntries(
-      Object.entries(viewerConfig.planetPreviewSources).filter(([planet]) =>
-        planetNames.includes(planet)
-      )
+      Object.entries(viewerConfig.planetPreviewSources)
+        .filter(([planet]) => planetNames.includes(planet))
+        .map(([planet, url]) => [planet, withAssetsVersion(url)])
     );
 
-    setupTabs(filteredSources, tabButtonsContainer, mapImage);
+    setTilePyramids(getTilePyramids(manifest, planetNames));
+    // Controls first: a tiled planet is shown right away and announces its size synchronously
     initKeyboardControls(mapImage, mapContainer, zoomDisplay);
+    setupTabs(filteredSources, tabButtonsContainer, mapImage);
 
     resetBtn.addEventListener("click", () => {
       resetMapView(mapImage, mapContainer, zoomDisplay);
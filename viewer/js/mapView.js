@@ -4,6 +4,15 @@ let currentPlanet = null;
 let zoomStepIndex = 0;
 let scale = 1, offsetX = 0, offsetY = 0;
 
+// Tile pyramids of the planets from the tile manifest. Planets without one show their single preview.
+let tilePyramids = {};
+const tileLayer = document.getElementById("tileLayer");
+const shownTiles = new Map();
+
+function setTilePyramids(pyramids) {
+  tilePyramids = pyramids;
+}
+
 function setupTabs(previewSources, tabContainer, mapImage) {
   Object.entries(previewSources).forEach(([planet, url], index) => {
     const tab = document.createElement("div");
@@ -32,7 +41,7 @@ function setupTabs(previewSources, tabContainer, mapImage) {
         fallback.style.display = "none";
       };
 
-      mapImage.src = url;
+      showPlanetMap(planet, url, mapImage);
     }
 
     tab.addEventListener("click", () => switchPlanet(planet, previewSources, mapImage));
@@ -50,14 +59,42 @@ function switchPlanet(planet, previewSources, mapImage) {
   if (newTab) newTab.classList.add("active");
 
   currentPlanet = planet;
-  mapImage.src = previewSources[planet];
   mapImage.onerror = () => console.error("Failed to load map image:", mapImage.src);
+  showPlanetMap(planet, previewSources[planet], mapImage);
+}
+
+/**
+ * Shows the tiles of a planet if it has a tile pyramid, otherwise its single preview image.
+ * Tiled planets announce that their size is known with a "tilesready" event on the map image.
+ */
+function showPlanetMap(planet, url, mapImage) {
+  shownTiles.forEach(tile => tile.remove());
+  shownTiles.clear();
+
+  const pyramid = tilePyramids[planet];
+  if (!pyramid) {
+    tileLayer.style.display = "none";
+    mapImage.src = url;
+    return;
+  }
+
+  mapImage.removeAttribute("src");
+  mapImage.style.display = "none";
+  tileLayer.style.display = "block";
+  tileLayer.style.width = `${pyramid.width}px`;
+  tileLayer.style.height = `${pyramid.height}px`;
+  mapImage.dispatchEvent(new Event("tilesready"));
+}
+
+function getMapSize(mapImage) {
+  const pyramid = tilePyramids[currentPlanet];
+  if (pyramid) return { imgW: pyramid.width, imgH: pyramid.height };
+  return { imgW: mapImage.naturalWidth, imgH: mapImage.naturalHeight };
 }
 
 function handleImageLoad(mapImage, container, zoomDisplay) {
   const rect = container.getBoundingClientRect();
-  const imgW = mapImage.naturalWidth;
-  const imgH = mapImage.naturalHeight;
+  const { imgW, imgH } = getMapSize(mapImage);
 
   if (statePerPlanet[currentPlanet]) {
     ({ zoomStepIndex, offsetX, offsetY } = statePerPlanet[currentPlanet]);
@@ -92,8 +129,7 @@ function handleWheelZoom(e, mapImage, container, zoomDisplay) {
 
 function resetMapView(mapImage, container, zoomDisplay) {
   const rect = container.getBoundingClientRect();
-  const imgW = mapImage.naturalWidth;
-  const imgH = mapImage.naturalHeight;
+  const { imgW, imgH } = getMapSize(mapImage);
 
   zoomStepIndex = 0;
   scale = getScaleFromStep(zoomStepIndex);
@@ -109,7 +145,73 @@ function getScaleFromStep(step) {
 }
 
 function updateTransform(target) {
-  target.style.transform = `translate(${offsetX}px, ${offsetY}px) scale(${scale})`;
+  const transform = `translate(${offsetX}px, ${offsetY}px) scale(${scale})`;
+  target.style.transform = transform;
+  tileLayer.style.transform = transform;
+  updateVisibleTiles(target.parentElement);
+}
+
+/**
+ * Shows the tiles of the level that matches the current zoom, but only those inside the container.
+ * The single tile of level 0 stays underneath as a placeholder while finer tiles load.
+ */
+function updateVisibleTiles(container) {
+  const pyramid = tilePyramids[currentPlanet];
+  if (!pyramid) return;
+
+  const maxLevel = pyramid.levels.length - 1;
+  // The smallest level with at least one pixel per screen pixel
+  const level = Math.min(maxLevel, Math.max(0, maxLevel - Math.floor(Math.log2(1 / scale))));
+  const rect = container.getBoundingClientRect();
+  const wantedTiles = new Set();
+
+  [0, level].forEach(tileLevel => {
+    const { columns, rows } = pyramid.levels[tileLevel];
+    const tileExtent = pyramid.tileSize * 2 ** (maxLevel - tileLevel);
+    const firstColumn = Math.max(0, Math.floor(-offsetX / scale / tileExtent));
+    const lastColumn = Math.min(columns - 1, Math.floor((rect.width - offsetX) / scale / tileExtent));
+    const firstRow = Math.max(0, Math.floor(-offsetY / scale / tileExtent));
+    const lastRow = Math.min(rows - 1, Math.floor((rect.height - offsetY) / scale / tileExtent));
+
+    for (let row = firstRow; row <= lastRow; row++) {
+      for (let column = firstColumn; column <= lastColumn; column++) {
+        const key = `${tileLevel}/${column}/${row}`;
+        wantedTiles.add(key);
+        if (!shownTiles.has(key)) {
+          shownTiles.set(key, createTile(pyramid, tileLevel, column, row));
+        }
+      }
+    }
+  });
+
+  shownTiles.forEach((tile, key) => {
+    if (!wantedTiles.has(key)) {
+      tile.remove();
+      shownTiles.delete(key);
+    }
+  });
+}
+
+function createTile(pyramid, level, column, row) {
+  const { width, height, columns } = pyramid.levels[level];
+  const factor = 2 ** (pyramid.levels.length - 1 - level);
+  const tileWidth = Math.min(pyramid.tileSize, width - column * pyramid.tileSize);
+  const tileHeight = Math.min(pyramid.tileSize, height - row * pyramid.tileSize);
+
+  // Tiles are placed in full-size pixels, so the layer uses the same transform as a single preview
+  const tile = document.createElement("img");
+  tile.className = "tile";
+  tile.alt = "";
+  tile.draggable = false;
+  tile.style.left = `${column * pyramid.tileSize * factor}px`;
+  tile.style.top = `${row * pyramid.tileSize * factor}px`;
+  tile.style.width = `${tileWidth * factor}px`;
+  tile.style.height = `${tileHeight * factor}px`;
+  tile.style.zIndex = level;
+  tile.onerror = () => console.error("Failed to load map tile:", tile.src);
+  tile.src = pyramid.levels[level].tiles[row * columns + column];
+  tileLayer.appendChild(tile);
+  return tile;
 }
 
 function updateZoomLabel(label) {
@@ -6,5 +6,6 @@ const viewerConfig  = {
     fulgora: "../previews/fulgora.png",
     aquilo: "../previews/aquilo.png"
   },
+  tileManifestSource: "../previews/local_tile_manifest.js",
   planetNamesSource: "../previews/local_planet_names.js"
 };